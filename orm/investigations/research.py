@@ -5,78 +5,174 @@
     - Подключаются необходимые модули и библиотеки для работы и визуализации данных.
 
 Функции:
-    - setup_sandbox: Создает песочницу для тестирования.
+    - prepare_sandbox_templates: Подготавливает шаблоны песочниц из исходной базы данных.
+    - sandbox_template: Возвращает имя шаблона песочниц, при необходимости создавая шаблоны.
+    - setup_sandbox: Создает песочницу для тестирования копированием шаблона.
+    - sandbox_pool: Пул заранее созданных песочниц.
     - generate_data_for_table: Генерация данных для таблиц.
     - get_primary_key_name: Извлечение имени первичного ключа модели.
-    - perform_queries: Выполнение различных запросов для замера времени.
-    - measure_generate_time: Измерение времени генерации данных.
-    - measure_insert_time: Измерение времени вставки данных.
+    - parent_ids: Идентификаторы строк родительских таблиц для генерации данных.
+    - populate_table: Заполнение таблицы заданным количеством строк.
+    - perform_queries: Замер различных запросов (медиана, p95, p99 с доверительными интервалами).
     - measure_query_time: Измерение времени выполнения SQL-запроса.
+    - measure_hydration: Сравнение памяти и скорости гидрации строк в объекты на __slots__ и на словарях.
+    - measure_prepared_latency: Сравнение задержки запросов с подготовленными выражениями и без них.
+    - measure_delete_strategies: Сравнение построчного удаления с удалением по массиву ключей.
+    - measure_columnar_speedup: Сравнение скорости построчной и колоночной (NumPy) генерации данных.
     - measure_generation_times: Замер времени генерации данных.
     - measure_query_times: Замер времени выполнения запросов.
+    - run_benchmarks: Замер генерации и запросов с записью результатов в JSON.
+    - medians: Медианы времени операции по таблицам.
     - plot_results: Построение и сохранение графика с несколькими линиями.
     - plot_individual_query_times: Построение графиков времени выполнения запросов.
 """
 
-import re
 import sys
 import os
 
 # Добавляем путь к родительской директории для корректного импорта модулей
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-import timeit
+import itertools
+import tracemalloc
 import matplotlib.pyplot as plt
 from lib.data_generator import (
     generate_application_data, generate_user_data, generate_modification_data, generate_purchase_data, 
     generate_check_data, generate_hwid_data, generate_operation_data, generate_subscription_data, 
     generate_token_data, generate_version_data
 )
+from lib.benchmark import benchmark, write_json
+from lib.columnar_generator import COLUMN_GENERATORS, generate_batches
 from lib.db import Database
 from lib.orm import Application, Users, Modification, Purchase, Checks, HWID, Operation, Subscription, Token, Version, Model
 from lib.plot_utils import save_plot
+from lib.sandbox import SandboxPool
 
 # Настройка параметров исследования
 DATABASE_NAME = 'research_db'
+SOURCE_DATABASE = 'source_db'
+SCHEMA_TEMPLATE = 'research_schema_template'  # шаблон песочниц: схема source_db без данных
+DATA_TEMPLATE = 'research_data_template'  # шаблон песочниц: схема и данные source_db
 TABLES = [Application, Users, Modification, Purchase, Checks, HWID, Operation, Subscription, Token, Version]
-ROW_COUNTS = list(range(10, 501, 35))
-REPEAT = 3  # Количество повторов для каждого замера
+ROW_COUNTS = [100, 1_000, 10_000, 100_000, 1_000_000]
+# Параметры lib.benchmark для запросов и для длительных операций: генерации данных, массового удаления
+QUERY_BENCHMARK = {'warmup': 3, 'min_reps': 10, 'max_reps': 1000, 'max_time': 5.0, 'target_precision': 0.05}
+GENERATION_BENCHMARK = {'warmup': 1, 'min_reps': 3, 'max_reps': 30, 'max_time': 10.0, 'target_precision': 0.05}
+RESULTS_FILE = 'benchmark_results.json'
+COMPARISONS_FILE = 'comparison_results.json'  # сравнения вариантов: гидрация, PREPARE, удаление, генерация
+
+def prepare_sandbox_templates(source_db=SOURCE_DATABASE):
+    """
+    Подготавливает шаблоны песочниц из исходной базы данных: только схема и схема с данными.
+    Вызывается один раз после заполнения исходной базы (main.py); к ней не должно быть подключений.
+
+    :param source_db: Имя исходной базы данных.
+    """
+    admin = Database("postgres", user="postgres", password="secret6g2h2")
+    admin.create_template(SCHEMA_TEMPLATE, source_db, with_data=False)
+    admin.create_template(DATA_TEMPLATE, source_db, with_data=True)
 
-def setup_sandbox(db_name):
+def sandbox_template(with_data=False):
+    """
+    Имя шаблона песочниц; шаблоны создаются из исходной базы, если их ещё нет.
+
+    :param with_data: Шаблон с данными исходной базы. По умолчанию только схема.
+    :return: Имя базы-шаблона.
+    """
+    template = DATA_TEMPLATE if with_data else SCHEMA_TEMPLATE
+    with Database("postgres", user="postgres", password="secret6g2h2").get_cursor() as cur:
+        cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (template,))
+        exists = cur.fetchone() is not None
+    if not exists:
+        prepare_sandbox_templates()
+    return template
+
+def setup_sandbox(db_name, with_data=False):
     """
-    Создает песочницу для тестирования.
+    Создает песочницу для тестирования копированием шаблона (CREATE DATABASE ... TEMPLATE).
 
     :param db_name: Имя базы данных песочницы.
+    :param with_data: Копировать шаблон с данными исходной базы. По умолчанию только схема.
     :return: Объект Database с именем песочницы.
     """
-    with Database("postgres", user="postgres", password="secret6g2h2") as db:
-        db.drop_db(db_name)
-        db.create_db(db_name)
-        db.clone_schema("source_db", db_name)
+    template = sandbox_template(with_data)
+    admin = Database("postgres", user="postgres", password="secret6g2h2")
+    admin.drop_db(db_name)
+    admin.clone_db(template, db_name)
     return Database(db_name, user="postgres", password="secret6g2h2")
 
+def sandbox_pool(size=2, with_data=False):
+    """
+    Пул заранее созданных песочниц для серий замеров, которым нужна чистая база на каждый прогон.
+
+    :param size: Количество готовых песочниц.
+    :param with_data: Копировать шаблон с данными исходной базы. По умолчанию только схема.
+    :return: Объект SandboxPool (закрывается через close или блок with).
+    """
+    return SandboxPool(sandbox_template(with_data), size=size, user="postgres", password="secret6g2h2")
+
 # Функции для генерации данных
-def generate_data_for_table(table, count):
+def generate_data_for_table(table, count, ids=None):
     """
     Генерация данных для заданной таблицы.
 
     :param table: Класс модели таблицы.
     :param count: Количество записей для генерации.
+    :param ids: Словарь идентификаторов родительских строк ('app_ids', 'user_ids', ...). По умолчанию [1].
     :return: Список объектов модели.
     """
     generator_map = {
         Application: generate_application_data,
-        Users: lambda n: generate_user_data(n, [1]),
-        Modification: lambda n: generate_modification_data(n, [1]),
-        Purchase: lambda n: generate_purchase_data(n, [1], [1]),
-        Checks: lambda n: generate_check_data(n, [1]),
-        HWID: lambda n: generate_hwid_data(n, [1]),
-        Operation: lambda n: generate_operation_data(n, [1]),
-        Subscription: lambda n: generate_subscription_data(n, [1], [1]),
-        Token: lambda n: generate_token_data(n, [1], [1]),
-        Version: lambda n: generate_version_data(n, [1])
+        Users: generate_user_data,
+        Modification: generate_modification_data,
+        Purchase: generate_purchase_data,
+        Checks: generate_check_data,
+        HWID: generate_hwid_data,
+        Operation: generate_operation_data,
+        Subscription: generate_subscription_data,
+        Token: generate_token_data,
+        Version: generate_version_data
     }
-    return list(generator_map[table](count))
+    # Списки идентификаторов передаются в порядке, в котором их ожидает генератор
+    _, required = COLUMN_GENERATORS[table._plan.table]
+    ids = ids or {}
+    return list(generator_map[table](count, *(ids.get(name, [1]) for name in required)))
+
+def parent_ids(db, table, limit=10_000):
+    """
+    Идентификаторы строк таблиц, на которые ссылается таблица. Пустые родительские таблицы
+    предварительно заполняются (populate_table), чтобы внешние ключи новых строк были корректны.
+
+    :param db: Объект Database для подключения к базе данных.
+    :param table: Класс модели таблицы.
+    :param limit: Максимальное количество идентификаторов каждой родительской таблицы.
+    :return: Словарь {'app_ids': [...], 'user_ids': [...], ...} для генераторов данных.
+    """
+    ids = {}
+    for relation in table._plan.relations.values():
+        query = f"SELECT {relation.column} FROM {relation.table} LIMIT %s"
+        rows = Model.rawsql(db, query, (limit,))
+        if not rows:
+            populate_table(db, relation.model, 100)
+            rows = Model.rawsql(db, query, (limit,))
+        ids[f"{relation.column}s"] = [row[0] for row in rows]
+    return ids
+
+def populate_table(db, table, count, batch_size=100_000):
+    """
+    Заполнение таблицы ровно count строками: TRUNCATE ... CASCADE и загрузка пакетов колоночного
+    генератора через Model.bulk_load, поэтому миллионы строк загружаются за секунды.
+
+    :param db: Объект Database для подключения к базе данных.
+    :param table: Класс модели таблицы.
+    :param count: Количество строк.
+    :param batch_size: Количество строк в пакете генерации и загрузки.
+    """
+    # Родительские таблицы заполняются до очистки: их TRUNCATE ... CASCADE очищает и эту таблицу
+    ids = parent_ids(db, table)
+    Model.truncate_all(db, [table])
+    for batch in generate_batches(table, count, batch_size=batch_size, seed=count, **ids):
+        table.bulk_load(db, batch.rows(), batch_size=10_000)
 
 # Функция для извлечения имени первичного ключа
 def get_primary_key_name(model_class):
@@ -86,224 +182,319 @@ def get_primary_key_name(model_class):
     :param model_class: Класс модели.
     :return: Имя первичного ключа.
     """
-    docstring = model_class.__doc__
-    if docstring:
-        field_definitions = re.findall(
-            r'(\w+): FieldType\.(\w+)(, primary_key=True)?',
-            docstring
-        )
-        for field_name, field_type, primary_key in field_definitions:
-            if primary_key:
-                return field_name
+    # Первичный ключ уже определён в плане модели, построенном ModelMeta
+    if model_class._plan.pk:
+        return model_class._plan.pk
     raise ValueError(f"No primary key found for model {model_class.__name__}")
 
 # Функции для выполнения запросов
-def perform_queries(db, table):
+QUERY_OPERATIONS = (
+    'insert', 'select_all', 'count', 'filter_no_match', 'filter_pk', 'update', 'delete',
+    'raw_select', 'raw_update', 'raw_delete',
+)
+
+def perform_queries(db, table, **options):
     """
-    Выполнение различных SQL-запросов для оценки производительности.
+    Замер различных SQL-запросов через lib.benchmark (прогрев, адаптивное число повторов,
+    медиана и перцентили с доверительными интервалами). Операции, которые меняют количество строк
+    (вставка, удаление), получают свою строку из неизмеряемой подготовки, поэтому размер таблицы
+    во время замера не меняется.
 
     :param db: Объект Database для подключения к базе данных.
-    :param table: Класс модели таблицы.
-    :return: Список временных характеристик выполнения запросов.
+    :param table: Класс модели таблицы (должна содержать хотя бы одну строку).
+    :param options: Параметры benchmark (warmup, min_reps, max_time, ...). По умолчанию QUERY_BENCHMARK.
+    :return: Словарь {операция из QUERY_OPERATIONS: статистика benchmark}.
     """
+    options = {**QUERY_BENCHMARK, **options}
     primary_key = get_primary_key_name(table)
-    
-    data = generate_data_for_table(table, 1)[0]  # Генерировать одну запись для вставки
-    
-    results = []
-    
-    # Время на вставку (INSERT)
-    # INSERT INTO {table.__name__.lower()} ({', '.join(data.extract_field_values()[0])}) VALUES ({', '.join(['%s'] * len(data.extract_field_values()[0]))}) RETURNING *;"
-    start_time = timeit.default_timer()
-    data.save(db)
-    duration = timeit.default_timer() - start_time
-    results.append(duration)
-    
-    # Время на выборку всех записей (SELECT all)
-    # SELECT * FROM {table.__name__.lower()}
-    start_time = timeit.default_timer()
-    records = table.get_all(db)
-    duration = timeit.default_timer() - start_time
-    results.append(duration)
-    
-    # Время на подсчёт записей (SELECT COUNT(*))
-    # SELECT COUNT(*) FROM {table.__name__.lower()}
-    start_time = timeit.default_timer()
-    count = len(records)
-    duration = timeit.default_timer() - start_time
-    results.append(duration)
-    
-    # Время на выборку по условию, которое не подходит ни для одной записи
-    # SELECT * FROM {table.__name__.lower()} WHERE {primary_key} = %s"
-    start_time = timeit.default_timer()
-    no_match = table.filter(db, **{primary_key: -1})
-    duration = timeit.default_timer() - start_time
-    results.append(duration)
-    
-    # Время на выборку по определённому первичному ключу
-    if records:
-        match_id = getattr(records[0], primary_key)
-        start_time = timeit.default_timer()
-        match = table.filter(db, **{primary_key: match_id})
-        duration = timeit.default_timer() - start_time
-        results.append(duration)
-    
-        # Время на обновление (UPDATE)
-        if match and len(records[0].__dict__.keys()) > 1:
-            updated_field = {list(records[0].__dict__.keys())[1]: "temp_value"}  # обновление второго поле в объекте
-            start_time = timeit.default_timer()
-            match[0].update(db, **updated_field)
-            duration = timeit.default_timer() - start_time
-            results.append(duration)
-    
-        # Время на удаление записи (DELETE)
-        if match:
-            start_time = timeit.default_timer()
-            match[0].delete(db)
-            duration = timeit.default_timer() - start_time
-            results.append(duration)
-    
-    # Время на выборку по определённому первичному ключу при помощи rawsql
-    records = table.get_all(db)
-    if records:
-        match_id = getattr(records[0], primary_key)
-        start_time = timeit.default_timer()
-        Model.rawsql(db, f"SELECT * FROM {table.__name__.lower()} WHERE {primary_key} = %s", (match_id,))
-        duration = timeit.default_timer() - start_time
-        results.append(duration)
-        
-        # Время на обновление (UPDATE) при помощи rawsql
-        start_time = timeit.default_timer()
-        Model.rawsql(db, f"UPDATE {table.__name__.lower()} SET {list(records[0].__dict__.keys())[1]} = %s WHERE {primary_key} = %s", ("1", match_id))
-        duration = timeit.default_timer() - start_time
-        results.append(duration)
-        
-        # Время на удаление (DELETE) при помощи rawsql
-        start_time = timeit.default_timer()
-        Model.rawsql(db, f"DELETE FROM {table.__name__.lower()} WHERE {primary_key} = %s", (match_id,))
-        duration = timeit.default_timer() - start_time
-        results.append(duration)
-    
+    table_name = table._plan.table
+    ids = parent_ids(db, table)
+    # Обновляется первое поле, кроме первичного ключа, значением того же типа
+    updated_field = next(name for name in table._plan.field_names if name != primary_key)
+
+    match_id = Model.rawsql(db, f"SELECT {primary_key} FROM {table_name} LIMIT 1", ())[0][0]
+    match = table.filter(db, **{primary_key: match_id})[0]
+    current_value = getattr(match, updated_field)
+
+    def new_record():
+        return generate_data_for_table(table, 1, ids)[0]
+
+    def saved_record():
+        record = new_record()
+        record.save(db)
+        return record
+
+    def insert(record):
+        record.save(db)
+        inserted.append(getattr(record, primary_key))
+
+    inserted = []  # строки, вставленные замером вставки; удаляются после него
+    cases = {
+        # INSERT INTO ... VALUES (...) RETURNING *
+        'insert': (insert, new_record),
+        # SELECT * FROM <table>
+        'select_all': (lambda: table.get_all(db), None),
+        # SELECT COUNT(*) FROM <table> (подсчёт на сервере, без загрузки строк)
+        'count': (lambda: table.objects(db).count(), None),
+        # SELECT * FROM <table> WHERE <pk> = -1
+        'filter_no_match': (lambda: table.filter(db, **{primary_key: -1}), None),
+        # SELECT * FROM <table> WHERE <pk> = %s
+        'filter_pk': (lambda: table.filter(db, **{primary_key: match_id}), None),
+        # UPDATE ... SET <поле> = <текущее значение> WHERE <pk> = %s
+        'update': (lambda: match.update(db, **{updated_field: current_value}), None),
+        # DELETE FROM <table> WHERE <pk> = %s (строка вставляется в подготовке)
+        'delete': (lambda record: record.delete(db), saved_record),
+        'raw_select': (
+            lambda: Model.rawsql(db, f"SELECT * FROM {table_name} WHERE {primary_key} = %s", (match_id,)), None
+        ),
+        'raw_update': (
+            lambda: Model.rawsql(
+                db, f"UPDATE {table_name} SET {updated_field} = {updated_field} WHERE {primary_key} = %s", (match_id,)
+            ),
+            None,
+        ),
+        'raw_delete': (
+            lambda record: Model.rawsql(
+                db, f"DELETE FROM {table_name} WHERE {primary_key} = %s", (getattr(record, primary_key),)
+            ),
+            saved_record,
+        ),
+    }
+
+    results = {}
+    for operation in QUERY_OPERATIONS:
+        function, setup = cases[operation]
+        results[operation] = benchmark(function, setup=setup, **options)
+        if inserted:
+            table.delete_many(db, inserted)
+            inserted.clear()
     return results
 
-def measure_generate_time(model_class, n):
+def measure_query_time(db, query, **options):
     """
-    Измеряет время генерации данных для модели.
+    Измеряет время выполнения SQL-запроса через lib.benchmark.
+
+    :param db: Объект Database для подключения к базе данных.
+    :param query: SQL-запрос для выполнения.
+    :param options: Параметры benchmark. По умолчанию QUERY_BENCHMARK.
+    :return: Статистика benchmark (медиана, p95, p99 с доверительными интервалами и т.д.).
+    """
+    def execute_query():
+        with db.get_cursor() as cur:
+            cur.execute(query)
+
+    return benchmark(execute_query, **{**QUERY_BENCHMARK, **options})
+
+class _DictRecord:
+    """
+    Прежнее представление объекта модели: атрибуты в __dict__ экземпляра, построение через словарь kwargs.
+    Используется только как точка отсчёта в measure_hydration.
+    """
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+def measure_hydration(model_class, n, **options):
+    """
+    Сравнивает память и скорость гидрации n строк в объекты: прежний способ
+    (dict(zip(...)) на строку и атрибуты в __dict__) против позиционного конструктора на __slots__.
+    База данных не используется — строки собираются из сгенерированного объекта модели.
 
     :param model_class: Класс модели.
-    :param n: Количество генерируемых записей.
-    :return: Время генерации данных.
-    """
-    data_gen_map = {
-        Application: lambda n: generate_application_data(n),
-        Users: lambda n: generate_user_data(n, [1]),
-        Modification: lambda n: generate_modification_data(n, [1]),
-        Purchase: lambda n: generate_purchase_data(n, [1], [1]),
-        Checks: lambda n: generate_check_data(n, [1]),
-        HWID: lambda n: generate_hwid_data(n, [1]),
-        Operation: lambda n: generate_operation_data(n, [1]),
-        Subscription: lambda n: generate_subscription_data(n, [1], [1]),
-        Token: lambda n: generate_token_data(n, [1], [1]),
-        Version: lambda n: generate_version_data(n, [1])
-    }
+    :param n: Количество строк.
+    :param options: Параметры benchmark. По умолчанию GENERATION_BENCHMARK.
+    :return: Словарь {'dict': {...}, 'slots': {...}} со статистикой benchmark, пиковой памятью
+             (peak_bytes) и строками в секунду по медиане (rows_per_sec).
+    """
+    options = {**GENERATION_BENCHMARK, **options}
+    names = model_class._plan.field_names
+    sample = generate_data_for_table(model_class, 1)[0]
+    template = [getattr(sample, name) for name in names]
+    pk_index = names.index(model_class._plan.pk)
+    rows = []
+    for i in range(n):
+        row = list(template)
+        row[pk_index] = i + 1
+        rows.append(tuple(row))
+
+    def hydrate_dict():
+        return [_DictRecord(**dict(zip(names, row))) for row in rows]
+
+    def hydrate_slots():
+        return list(map(model_class._hydrate, rows))
 
-    def generate_data():
-        list(data_gen_map[model_class](n))
+    results = {}
+    for label, hydrate in (('dict', hydrate_dict), ('slots', hydrate_slots)):
+        tracemalloc.start()
+        objects = hydrate()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del objects
+
+        stats = benchmark(hydrate, **options)
+        results[label] = {**stats, 'peak_bytes': peak, 'rows_per_sec': n / stats['median'] if stats['median'] else float('inf')}
+    return results
 
-    time = timeit.timeit(generate_data, number=1)
-    return time
+def measure_prepared_latency(model_class, n=1000, db_name=DATABASE_NAME, **options):
+    """
+    Сравнивает задержку выборки по первичному ключу (filter) с серверными подготовленными
+    выражениями и без них. Оба варианта используют пул из одного постоянного соединения,
+    поэтому разница отражает только стоимость разбора и планирования запроса.
+    Прогревочные запуски benchmark открывают соединение и выполняют PREPARE.
 
-def measure_insert_time(db, model_class, n):
+    :param model_class: Класс модели.
+    :param n: Максимальное количество замеряемых запросов в каждом варианте.
+    :param db_name: Имя базы данных с заполненной таблицей модели.
+    :param options: Параметры benchmark. По умолчанию QUERY_BENCHMARK.
+    :return: Словарь {'unprepared': {...}, 'prepared': {...}} со статистикой benchmark (медиана, p95, p99 и т.д.).
     """
-    Измеряет время вставки данных для модели.
+    options = {**QUERY_BENCHMARK, 'max_reps': n, **options}
+    primary_key = get_primary_key_name(model_class)
+    results = {}
+    for label, use_prepared in (('unprepared', False), ('prepared', True)):
+        db = Database(db_name, pooled=True, pool_min_size=1, pool_max_size=1, use_prepared=use_prepared)
+        try:
+            ids = [getattr(record, primary_key) for record in model_class.objects(db).only(primary_key).limit(n)] or [-1]
+            keys = itertools.cycle(ids)
+            results[label] = benchmark(lambda: model_class.filter(db, **{primary_key: next(keys)}), **options)
+        finally:
+            db.close()
+    return results
+
+def measure_delete_strategies(model_class, n=1000, db_name=DATABASE_NAME, **options):
+    """
+    Сравнивает удаление n записей по одной (delete в цикле) с одним запросом delete_many.
+    Записи вставляются в неизмеряемой подготовке перед каждым запуском, замеряется только удаление.
 
-    :param db: Объект Database для подключения к базе данных.
     :param model_class: Класс модели.
-    :param n: Количество вставляемых записей.
-    :return: Время вставки данных.
-    """
-    data_gen_map = {
-        Application: lambda n: generate_application_data(n),
-        Users: lambda n: generate_user_data(n, [1]),
-        Modification: lambda n: generate_modification_data(n, [1]),
-        Purchase: lambda n: generate_purchase_data(n, [1], [1]),
-        Checks: lambda n: generate_check_data(n, [1]),
-        HWID: lambda n: generate_hwid_data(n, [1]),
-        Operation: lambda n: generate_operation_data(n, [1]),
-        Subscription: lambda n: generate_subscription_data(n, [1], [1]),
-        Token: lambda n: generate_token_data(n, [1], [1]),
-        Version: lambda n: generate_version_data(n, [1])
-    }
+    :param n: Количество удаляемых записей в каждом запуске.
+    :param db_name: Имя базы данных со схемой модели.
+    :param options: Параметры benchmark. По умолчанию GENERATION_BENCHMARK (запуск длится секунды).
+    :return: Словарь {'row_by_row': {...}, 'delete_many': {...}} со статистикой benchmark
+             и 'speedup' — отношение медиан.
+    """
+    options = {**GENERATION_BENCHMARK, **options}
+    primary_key = get_primary_key_name(model_class)
 
-    def insert_operation():
-        for item in data_gen_map[model_class](n):
-            item.save(db)
+    def delete_row_by_row(objects):
+        for obj in objects:
+            obj.delete(db)
 
-    time = timeit.timeit(insert_operation, number=1)
-    return time
+    def delete_many(objects):
+        model_class.delete_many(db, [getattr(obj, primary_key) for obj in objects])
 
-def measure_query_time(db, query):
+    results = {}
+    with Database(db_name) as db:
+        ids = parent_ids(db, model_class)
+        setup = lambda: model_class.bulk_save(db, generate_data_for_table(model_class, n, ids))
+        for label, delete in (('row_by_row', delete_row_by_row), ('delete_many', delete_many)):
+            results[label] = benchmark(delete, setup=setup, **options)
+    results['speedup'] = results['row_by_row']['median'] / results['delete_many']['median']
+    return results
+
+def measure_columnar_speedup(model_class, n=1_000_000, batch_size=100_000, **options):
     """
-    Измеряет время выполнения SQL-запроса.
+    Сравнивает скорость генерации n строк построчным генератором (объекты модели)
+    и колоночным генератором на NumPy (пакеты кортежей для массовой загрузки).
 
-    :param db: Объект Database для подключения к базе данных.
-    :param query: SQL-запрос для выполнения.
-    :return: Время выполнения запроса.
+    :param model_class: Класс модели.
+    :param n: Количество генерируемых строк.
+    :param batch_size: Размер пакета колоночного генератора.
+    :param options: Параметры benchmark. По умолчанию GENERATION_BENCHMARK.
+    :return: Словарь {'row_by_row': {...}, 'columnar': {...}} со статистикой benchmark
+             и 'speedup' — отношение медиан.
     """
-    def execute_query():
-        with db.get_cursor() as cur:
-            cur.execute(query)
+    options = {**GENERATION_BENCHMARK, **options}
+    _, required = COLUMN_GENERATORS[model_class._plan.table]
+    ids = {name: [1] for name in required}
+
+    def generate_columns():
+        for batch in generate_batches(model_class, n, batch_size=batch_size, **ids):
+            batch.rows()
 
-    time = timeit.timeit(execute_query, number=1)
-    return time
+    row_by_row = benchmark(lambda: generate_data_for_table(model_class, n, ids), **options)
+    columnar = benchmark(generate_columns, **options)
+    return {'row_by_row': row_by_row, 'columnar': columnar, 'speedup': row_by_row['median'] / columnar['median']}
 
-def measure_generation_times():
+def measure_generation_times(row_counts=ROW_COUNTS, tables=TABLES, **options):
     """
-    Замеряет время генерации данных для всех таблиц и различных размеров данных.
+    Замеряет время построчной генерации данных для всех таблиц и различных размеров данных.
 
-    :return: Словарь с результатами замеров времени генерации данных.
+    :param row_counts: Количества строк.
+    :param tables: Классы моделей.
+    :param options: Параметры benchmark. По умолчанию GENERATION_BENCHMARK.
+    :return: Список записей {'model', 'operation': 'generate', 'rows', ...статистика benchmark}.
     """
-    results = {}
-    for table in TABLES:
-        times_per_size = []
-        for count in ROW_COUNTS:
-            duration_sum = 0
-            for _ in range(REPEAT):
-                duration = measure_generate_time(table, count)
-                duration_sum += duration
-            avg_duration = duration_sum / REPEAT
-            times_per_size.append(avg_duration)
-        results[table.__name__] = times_per_size
+    options = {**GENERATION_BENCHMARK, **options}
+    results = []
+    for table in tables:
+        for count in row_counts:
+            stats = benchmark(lambda: generate_data_for_table(table, count), **options)
+            results.append({'model': table.__name__, 'operation': 'generate', 'rows': count, **stats})
     return results
 
-def measure_query_times():
+def measure_query_times(row_counts=ROW_COUNTS, tables=TABLES, **options):
     """
-    Замеряет время выполнения различных запросов для всех таблиц и различных размеров данных.
+    Замеряет время выполнения запросов perform_queries для всех таблиц и различных размеров данных.
+    Перед каждой серией таблица заполняется ровно нужным количеством строк (populate_table).
 
-    :return: Словарь с результатами замеров времени выполнения запросов.
+    :param row_counts: Количества строк.
+    :param tables: Классы моделей.
+    :param options: Параметры benchmark. По умолчанию QUERY_BENCHMARK.
+    :return: Список записей {'model', 'operation', 'rows', ...статистика benchmark}.
     """
     db = setup_sandbox(DATABASE_NAME)
-    results = {}
-    for table in TABLES:
-        times_per_size = {}
-        for count in ROW_COUNTS:
-            # Замените данные в таблице заданного количества строк
-            data = generate_data_for_table(table, count)
-            with db.get_cursor() as cur:
-                table_name = table.__name__.lower()
-                cur.execute(f'DELETE FROM {table_name}')
-                for record in data:
-                    record.save(db)
-
-            query_times = perform_queries(db, table)
-            for i, query_time in enumerate(query_times):
-                if i not in times_per_size:
-                    times_per_size[i] = []
-                times_per_size[i].append(query_time)
-        results[table.__name__] = times_per_size
+    results = []
+    try:
+        for table in tables:
+            for count in row_counts:
+                populate_table(db, table, count)
+                for operation, stats in perform_queries(db, table, **options).items():
+                    results.append({'model': table.__name__, 'operation': operation, 'rows': count, **stats})
+                    print(f"{table.__name__} {operation} [{count}]: медиана {stats['median'] * 1e6:.0f} мкс, "
+                          f"p99 {stats['p99'] * 1e6:.0f} мкс ({stats['reps']} повторов)")
+    finally:
+        db.close()
     return results
 
-def plot_results(results, plot_title, x_label, y_label, filename):
+def run_benchmarks(output=RESULTS_FILE, row_counts=ROW_COUNTS, tables=TABLES, **options):
+    """
+    Замер генерации данных и всех запросов perform_queries с записью результатов в JSON.
+
+    :param output: Путь к JSON-файлу результатов.
+    :param row_counts: Количества строк.
+    :param tables: Классы моделей.
+    :param options: Параметры benchmark, общие для генерации и запросов.
+    :return: Список записей результатов (см. measure_query_times).
+    """
+    results = measure_generation_times(row_counts, tables, **options) + measure_query_times(row_counts, tables, **options)
+    with Database("postgres", user="postgres", password="secret6g2h2").get_cursor() as cur:
+        cur.execute("SHOW server_version")
+        server_version = cur.fetchone()[0]
+    write_json(
+        results, output,
+        server_version=server_version,
+        row_counts=list(row_counts),
+        query_benchmark={**QUERY_BENCHMARK, **options},
+        generation_benchmark={**GENERATION_BENCHMARK, **options},
+    )
+    return results
+
+def medians(results, operation):
+    """
+    Медианы времени операции по таблицам в порядке количества строк.
+
+    :param results: Список записей результатов (measure_generation_times, measure_query_times).
+    :param operation: Имя операции.
+    :return: Словарь {модель: список медиан}.
+    """
+    series = {}
+    for record in sorted(results, key=lambda record: record['rows']):
+        if record['operation'] == operation:
+            series.setdefault(record['model'], []).append(record['median'])
+    return series
+
+def plot_results(results, plot_title, x_label, y_label, filename, row_counts=ROW_COUNTS):
     """
     Построение и сохранение графика с несколькими линиями.
 
@@ -312,29 +503,62 @@ def plot_results(results, plot_title, x_label, y_label, filename):
     :param x_label: Подпись оси X.
     :param y_label: Подпись оси Y.
     :param filename: Имя файла для сохранения графика (без расширения).
+    :param row_counts: Значения оси X.
     """
     labels = list(results.keys())
-    x_values = ROW_COUNTS
     y_values = [results[label] for label in labels]
     
-    save_plot(x_values, y_values, labels, plot_title, x_label, y_label, filename)
+    save_plot(row_counts, y_values, labels, plot_title, x_label, y_label, filename)
 
-def plot_individual_query_times(results):
+def plot_individual_query_times(results, row_counts=ROW_COUNTS):
     """
-    Построение графиков времени выполнения запросов для каждой таблицы.
+    Построение графиков медианного времени выполнения запросов для каждой таблицы.
     
-    :param results: Словарь результатов выполнения запросов.
+    :param results: Список записей результатов measure_query_times.
+    :param row_counts: Значения оси X.
     """
-    for table, times_per_size in results.items():
-        for query_index, times in times_per_size.items():
-            save_plot(ROW_COUNTS, [times], [f"Запрос {query_index}"], f"Время выполнения Запроса {query_index} для {table}", 'Количество строк', 'Время выполнения (с)', f"{table}_query_{query_index}_times")
+    for operation in QUERY_OPERATIONS:
+        for table, times in medians(results, operation).items():
+            save_plot(row_counts, [times], [operation], f"Время выполнения {operation} для {table}", 'Количество строк', 'Медиана времени (с)', f"{table}_{operation}_times")
 
 # Основной исполнимый код
 if __name__ == "__main__":
-    # Замер времени генерации данных
-    generation_times = measure_generation_times()
-    plot_results(generation_times, "Время генерации", "Количество строк", "Время (s)", "generation_times")
+    # Замер генерации данных и запросов с записью результатов в JSON
+    results = run_benchmarks()
+    plot_results(medians(results, 'generate'), "Время генерации", "Количество строк", "Медиана времени (s)", "generation_times")
+    plot_individual_query_times(results)
+
+    # Сравнения вариантов реализации; результаты записываются в JSON вместе со статистикой
+    comparisons = []
 
-    # Замер времени выполнения запросов
-    query_times = measure_query_times()
-    plot_individual_query_times(query_times)
\ No newline at end of file
+    # Сравнение задержки запросов с подготовленными выражениями и без них
+    for table in TABLES:
+        latency = measure_prepared_latency(table)
+        for label, stats in latency.items():
+            comparisons.append({'model': table.__name__, 'operation': f'filter_pk_{label}', 'rows': None, **stats})
+            print(f"{table.__name__} [{label}]: медиана {stats['median'] * 1e6:.0f} мкс, p95 {stats['p95'] * 1e6:.0f} мкс")
+
+    # Сравнение построчного и множественного удаления
+    for table in (Operation, Token):
+        deletes = measure_delete_strategies(table)
+        for label in ('row_by_row', 'delete_many'):
+            comparisons.append({'model': table.__name__, 'operation': f'delete_{label}', 'rows': 1000, **deletes[label]})
+        print(f"{table.__name__}: по одной {deletes['row_by_row']['median']:.3f} с, "
+              f"delete_many {deletes['delete_many']['median']:.3f} с (x{deletes['speedup']:.1f})")
+
+    # Сравнение построчной и колоночной генерации данных
+    for table in TABLES:
+        speedup = measure_columnar_speedup(table)
+        for label in ('row_by_row', 'columnar'):
+            comparisons.append({'model': table.__name__, 'operation': f'generate_{label}', 'rows': 1_000_000, **speedup[label]})
+        print(f"{table.__name__}: построчно {1_000_000 / speedup['row_by_row']['median']:.0f} строк/с, "
+              f"колоночно {1_000_000 / speedup['columnar']['median']:.0f} строк/с (x{speedup['speedup']:.1f})")
+
+    # Сравнение гидрации строк: __slots__ против словарей
+    for table in (Operation, Token):
+        hydration = measure_hydration(table, 1_000_000)
+        for label, stats in hydration.items():
+            comparisons.append({'model': table.__name__, 'operation': f'hydrate_{label}', 'rows': 1_000_000, **stats})
+            print(f"{table.__name__} [{label}]: {stats['rows_per_sec']:.0f} строк/с, пик памяти {stats['peak_bytes'] / 2**20:.1f} МиБ")
+
+    write_json(comparisons, COMPARISONS_FILE, query_benchmark=QUERY_BENCHMARK, generation_benchmark=GENERATION_BENCHMARK)
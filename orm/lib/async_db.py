@@ -0,0 +1,348 @@
+"""
+Модуль асинхронной работы с базой данных PostgreSQL.
+
+Асинхронный движок использует драйвер psycopg 3 (пакет psycopg), который поддерживает asyncio
+и тот же стиль параметров %s, что и psycopg2, поэтому модели используют одни и те же
+заранее собранные SQL-запросы (ModelPlan) в синхронном и асинхронном коде.
+
+Импорты:
+    - Импортируются необходимые модули и библиотеки.
+
+Классы:
+    - AsyncConnectionPool: Асинхронный пул постоянных соединений.
+    - AsyncDatabase: Класс для асинхронной работы с базой данных PostgreSQL.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+try:
+    import psycopg
+    from psycopg import pq
+except ImportError:  # psycopg 3 — необязательная зависимость асинхронного движка
+    psycopg = None
+
+from lib.pool import PoolError
+
+
+class AsyncConnectionPool:
+    """
+    Асинхронный пул постоянных соединений с ограничением минимального и максимального размера,
+    вытеснением простаивающих соединений и статистикой.
+
+    Атрибуты:
+    - connect (coroutine function): Функция, открывающая новое соединение.
+    - min_size (int): Количество соединений, которые не вытесняются по простою.
+    - max_size (int): Максимальное количество одновременно открытых соединений.
+    - max_idle (float): Время простоя (с), после которого лишнее соединение закрывается.
+    - timeout (float): Максимальное время ожидания свободного соединения (с).
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, max_idle=300.0, timeout=30.0):
+        """
+        Инициализация пула. Соединения открываются в open().
+
+        :param connect: Корутинная функция без аргументов, возвращающая новое соединение.
+        :param min_size: Минимальный размер пула. По умолчанию 1.
+        :param max_size: Максимальный размер пула. По умолчанию 10.
+        :param max_idle: Время простоя до вытеснения соединения (с). По умолчанию 300.
+        :param timeout: Время ожидания свободного соединения (с). По умолчанию 30.
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool size must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.timeout = timeout
+
+        self._idle = deque()  # пары (соединение, время возврата в пул)
+        self._size = 0
+        self._cond = asyncio.Condition()
+        self._closed = False
+        self._counters = {'created': 0, 'reused': 0, 'closed': 0, 'evicted': 0, 'waits': 0, 'timeouts': 0}
+
+    async def open(self):
+        """
+        Открытие min_size соединений.
+        """
+        while self._size < self.min_size:
+            self._size += 1
+            conn = await self._open_reserved()
+            self._idle.append((conn, time.monotonic()))
+
+    async def _open_reserved(self):
+        """
+        Открытие соединения, место под которое уже зарезервировано в _size.
+
+        :return: Новое соединение.
+        """
+        try:
+            conn = await self.connect()
+        except BaseException:
+            self._size -= 1
+            raise
+        self._counters['created'] += 1
+        return conn
+
+    async def _discard(self, conn):
+        """
+        Закрытие соединения и уменьшение размера пула.
+
+        :param conn: Соединение для закрытия.
+        """
+        self._size -= 1
+        self._counters['closed'] += 1
+        try:
+            if not conn.closed:
+                await conn.close()
+        finally:
+            async with self._cond:
+                self._cond.notify()
+
+    async def acquire(self):
+        """
+        Получение соединения из пула с ожиданием, если все max_size соединений заняты.
+
+        :return: Соединение с базой данных.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        while True:
+            if self._closed:
+                raise PoolError("Connection pool is closed")
+            now = time.monotonic()
+            while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.max_idle:
+                self._counters['evicted'] += 1
+                await self._discard(self._idle.popleft()[0])
+            if self._idle:
+                conn, _ = self._idle.pop()
+                if conn.closed:
+                    await self._discard(conn)
+                    continue
+                self._counters['reused'] += 1
+                return conn
+            if self._size < self.max_size:
+                self._size += 1
+                return await self._open_reserved()
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                self._counters['timeouts'] += 1
+                raise PoolError(f"Timed out after {self.timeout}s waiting for a free connection")
+            self._counters['waits'] += 1
+            async with self._cond:
+                try:
+                    await asyncio.wait_for(self._cond.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def release(self, conn, discard=False):
+        """
+        Возврат соединения в пул. Незавершённая транзакция откатывается.
+
+        :param conn: Возвращаемое соединение.
+        :param discard: Закрыть соединение вместо возврата в пул.
+        """
+        if not discard and not conn.closed:
+            try:
+                if conn.info.transaction_status != pq.TransactionStatus.IDLE:
+                    await conn.rollback()
+                if not conn.autocommit:
+                    await conn.set_autocommit(True)
+            except Exception:
+                discard = True
+        if discard or conn.closed or self._closed:
+            await self._discard(conn)
+            return
+        self._idle.append((conn, time.monotonic()))
+        async with self._cond:
+            self._cond.notify()
+
+    async def close(self):
+        """
+        Закрытие всех свободных соединений пула.
+        """
+        self._closed = True
+        while self._idle:
+            await self._discard(self._idle.popleft()[0])
+
+    def stats(self):
+        """
+        Статистика работы пула.
+
+        :return: Словарь со счётчиками и текущими размерами пула.
+        """
+        result = dict(self._counters)
+        result['size'] = self._size
+        result['idle'] = len(self._idle)
+        result['in_use'] = self._size - len(self._idle)
+        result['min_size'] = self.min_size
+        result['max_size'] = self.max_size
+        return result
+
+
+class AsyncDatabase:
+    """
+    Класс для асинхронной работы с базой данных PostgreSQL через пул соединений.
+    Используется асинхронными методами моделей (asave, aget_all, afilter, aupdate, adelete, arawsql).
+
+    Атрибуты:
+    - dbname (str): Имя базы данных.
+    - user (str): Пользователь базы данных. По умолчанию 'postgres'.
+    - password (str): Пароль пользователя базы данных.
+    - host (str): Хост базы данных. По умолчанию 'localhost'.
+    - port (int): Порт базы данных. По умолчанию 5432.
+    - pool (AsyncConnectionPool): Асинхронный пул соединений.
+    - cache (QueryCache | None): Кеш результатов синхронного Database для той же базы данных.
+      Асинхронные методы записи моделей инвалидируют его; асинхронное чтение кеш не использует.
+
+    Методы:
+    - open: Создание базы данных при отсутствии и открытие пула.
+    - close: Закрытие пула соединений.
+    - get_connection: Асинхронный контекстный менеджер для получения соединения из пула.
+    - get_cursor: Асинхронный контекстный менеджер для получения курсора.
+    - invalidate: Инвалидация общего кеша результатов для изменённых таблиц.
+    - pool_stats: Статистика пула соединений.
+    """
+
+    def __init__(self, dbname, user='postgres', password='secret6g2h2', host='localhost', port=5432,
+                 pool_min_size=1, pool_max_size=10, pool_max_idle=300.0, pool_timeout=30.0, cache=None):
+        """
+        Инициализация объекта асинхронной базы данных. Соединения открываются в open()
+        или при входе в блок async with.
+
+        :param dbname: Имя базы данных.
+        :param user: Пользователь базы данных. По умолчанию 'postgres'.
+        :param password: Пароль пользователя. По умолчанию 'secret6g2h2'.
+        :param host: Хост базы данных. По умолчанию 'localhost'.
+        :param port: Порт базы данных. По умолчанию 5432.
+        :param pool_min_size: Минимальный размер пула. По умолчанию 1.
+        :param pool_max_size: Максимальный размер пула. По умолчанию 10.
+        :param pool_max_idle: Время простоя соединения до вытеснения из пула (с). По умолчанию 300.
+        :param pool_timeout: Время ожидания свободного соединения (с). По умолчанию 30.
+        :param cache: Кеш результатов (QueryCache), общий с синхронным Database той же базы данных.
+            Асинхронные записи инвалидируют его, чтобы синхронное чтение не вернуло устаревшие строки.
+        """
+        if psycopg is None:
+            raise ImportError("AsyncDatabase requires psycopg 3: pip install 'psycopg[binary]'")
+        self.dbname = dbname
+        self.user = user
+        self.password = password
+        self.host = host
+        self.port = port
+        self.cache = cache
+        self.pool = AsyncConnectionPool(
+            self._connect,
+            min_size=pool_min_size,
+            max_size=pool_max_size,
+            max_idle=pool_max_idle,
+            timeout=pool_timeout,
+        )
+
+    async def __aenter__(self):
+        """
+        Открытие пула соединений.
+
+        :return: self
+        """
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """
+        Закрытие пула соединений.
+        """
+        await self.close()
+
+    async def _connect(self, dbname=None):
+        """
+        Открытие нового асинхронного соединения в режиме autocommit.
+
+        :param dbname: Имя базы данных. По умолчанию — база данных этого объекта.
+        :return: Соединение с базой данных.
+        """
+        return await psycopg.AsyncConnection.connect(
+            dbname=dbname or self.dbname, user=self.user, password=self.password,
+            host=self.host, port=self.port, autocommit=True,
+        )
+
+    async def _ensure_database(self):
+        """
+        Проверка существования базы данных и создание её при отсутствии.
+        """
+        conn = await self._connect('postgres')
+        try:
+            cursor = await conn.execute("SELECT 1 FROM pg_database WHERE datname = %s", (self.dbname,))
+            if not await cursor.fetchone():
+                await conn.execute(f'CREATE DATABASE "{self.dbname}"')
+        finally:
+            await conn.close()
+
+    async def open(self):
+        """
+        Создание базы данных при отсутствии и открытие минимального числа соединений пула.
+        """
+        await self._ensure_database()
+        await self.pool.open()
+
+    async def close(self):
+        """
+        Закрытие пула соединений.
+        """
+        await self.pool.close()
+
+    @asynccontextmanager
+    async def get_connection(self):
+        """
+        Асинхронный контекстный менеджер для получения соединения из пула.
+
+        :yield: Асинхронное соединение с базой данных.
+        """
+        conn = await self.pool.acquire()
+        broken = False
+        try:
+            yield conn
+        except (psycopg.InterfaceError, psycopg.OperationalError):
+            # Соединение могло быть разорвано — не возвращаем его в пул
+            broken = True
+            raise
+        finally:
+            await self.pool.release(conn, discard=broken)
+
+    @asynccontextmanager
+    async def get_cursor(self):
+        """
+        Асинхронный контекстный менеджер для получения курсора.
+
+        :yield: Асинхронный курсор для выполнения SQL-запросов.
+        """
+        async with self.get_connection() as conn:
+            async with conn.cursor() as cursor:
+                yield cursor
+
+    def invalidate(self, tables=None):
+        """
+        Инвалидация общего кеша результатов после записи в таблицы.
+
+        :param tables: Имя таблицы или набор имён. None — очистка всего кеша.
+        """
+        if self.cache is None:
+            return
+        if isinstance(tables, str):
+            tables = (tables,)
+        if tables is None or None in tables:
+            self.cache.clear()
+            return
+        for table in tables:
+            self.cache.invalidate(table)
+
+    def pool_stats(self):
+        """
+        Статистика пула соединений.
+
+        :return: Словарь со счётчиками пула.
+        """
+        return self.pool.stats()
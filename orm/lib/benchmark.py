@@ -0,0 +1,157 @@
+"""
+Модуль замеров производительности со статистической обработкой результатов.
+
+Каждый замер начинается с прогревочных запусков (не учитываются), затем операция повторяется,
+пока доверительный интервал медианы не станет достаточно узким относительно самой медианы
+или не будет исчерпан лимит повторов или времени. Для выборки считаются медиана, p95 и p99
+с непараметрическими доверительными интервалами по порядковым статистикам.
+
+Импорты:
+    - Импортируются необходимые модули и библиотеки.
+
+Функции:
+    - percentile: Перцентиль выборки с линейной интерполяцией.
+    - quantile_ci: Доверительный интервал квантиля по порядковым статистикам.
+    - summarize: Сводная статистика выборки времён.
+    - benchmark: Замер операции с прогревом и адаптивным числом повторов.
+    - write_json: Запись результатов замеров в JSON.
+"""
+
+import json
+import math
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+
+# Квантили нормального распределения для двусторонних доверительных интервалов
+_Z_SCORES = {0.90: 1.6449, 0.95: 1.9600, 0.99: 2.5758}
+
+def percentile(ordered, q):
+    """
+    Перцентиль выборки с линейной интерполяцией между соседними значениями.
+
+    :param ordered: Отсортированная выборка.
+    :param q: Уровень квантиля от 0 до 1.
+    :return: Значение перцентиля.
+    """
+    if not ordered:
+        raise ValueError("percentile of an empty sample")
+    position = (len(ordered) - 1) * q
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def quantile_ci(ordered, q, confidence=0.95):
+    """
+    Непараметрический доверительный интервал квантиля: границы — порядковые статистики
+    с номерами n*q -/+ z*sqrt(n*q*(1-q)) (нормальное приближение биномиального распределения).
+    Не предполагает нормальности времён, которые обычно скошены вправо.
+
+    :param ordered: Отсортированная выборка.
+    :param q: Уровень квантиля от 0 до 1.
+    :param confidence: Доверительная вероятность (0.90, 0.95 или 0.99).
+    :return: Пара (нижняя граница, верхняя граница).
+    """
+    if confidence not in _Z_SCORES:
+        raise ValueError(f"confidence must be one of {', '.join(map(str, sorted(_Z_SCORES)))}")
+    n = len(ordered)
+    spread = _Z_SCORES[confidence] * math.sqrt(n * q * (1 - q))
+    lower = max(0, math.floor(n * q - spread) - 1)
+    upper = min(n - 1, math.ceil(n * q + spread) - 1)
+    return ordered[lower], ordered[upper]
+
+def summarize(samples, confidence=0.95):
+    """
+    Сводная статистика выборки времён.
+
+    :param samples: Времена выполнения (с).
+    :param confidence: Доверительная вероятность интервалов.
+    :return: Словарь: n, mean, stdev, min, max, median, p95, p99 и интервалы median_ci, p95_ci, p99_ci.
+    """
+    ordered = sorted(samples)
+    result = {
+        'n': len(ordered),
+        'mean': statistics.fmean(ordered),
+        'stdev': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        'min': ordered[0],
+        'max': ordered[-1],
+    }
+    for name, q in (('median', 0.5), ('p95', 0.95), ('p99', 0.99)):
+        result[name] = percentile(ordered, q)
+        result[f'{name}_ci'] = list(quantile_ci(ordered, q, confidence))
+    return result
+
+def benchmark(operation, setup=None, warmup=3, min_reps=10, max_reps=10000, max_time=5.0,
+              target_precision=0.05, confidence=0.95, timer=time.perf_counter):
+    """
+    Замер операции: warmup прогревочных запусков, затем повторы, пока относительная полуширина
+    доверительного интервала медианы не станет не больше target_precision (но не меньше min_reps
+    повторов), либо пока не будет достигнуто max_reps повторов или max_time секунд замера.
+
+    :param operation: Замеряемая функция. Если задан setup, получает его результат аргументом.
+    :param setup: Подготовка перед каждым запуском (не замеряется), например вставка удаляемой строки.
+    :param warmup: Количество прогревочных запусков. По умолчанию 3.
+    :param min_reps: Минимальное количество замеряемых повторов. По умолчанию 10.
+    :param max_reps: Максимальное количество замеряемых повторов. По умолчанию 10000.
+    :param max_time: Ограничение суммарного времени замеряемых повторов (с). По умолчанию 5.
+    :param target_precision: Целевая относительная полуширина интервала медианы. По умолчанию 5%.
+    :param confidence: Доверительная вероятность интервалов. По умолчанию 0.95.
+    :param timer: Функция текущего времени. По умолчанию time.perf_counter.
+    :return: Словарь summarize(...) с полями reps, warmup, precision и converged.
+    """
+    if min_reps < 2 or max_reps < min_reps:
+        raise ValueError("Repetitions must satisfy 2 <= min_reps <= max_reps")
+
+    def run_once():
+        argument = setup() if setup is not None else None
+        start_time = timer()
+        if setup is not None:
+            operation(argument)
+        else:
+            operation()
+        return timer() - start_time
+
+    for _ in range(warmup):
+        run_once()
+
+    samples = []
+    spent = 0.0
+    precision = math.inf
+    while len(samples) < max_reps:
+        duration = run_once()
+        samples.append(duration)
+        spent += duration
+        if len(samples) >= min_reps:
+            ordered = sorted(samples)
+            median = percentile(ordered, 0.5)
+            lower, upper = quantile_ci(ordered, 0.5, confidence)
+            precision = (upper - lower) / 2 / median if median > 0 else 0.0
+            if precision <= target_precision or spent >= max_time:
+                break
+
+    result = summarize(samples, confidence)
+    result.update({'reps': len(samples), 'warmup': warmup, 'precision': precision,
+                   'converged': precision <= target_precision})
+    return result
+
+def write_json(results, path, **metadata):
+    """
+    Запись результатов замеров в JSON вместе со сведениями об окружении.
+
+    :param results: Список словарей с результатами (например, model, operation, rows и статистика benchmark).
+    :param path: Путь к файлу.
+    :param metadata: Дополнительные сведения для раздела meta (версия сервера, параметры замеров и т.п.).
+    """
+    document = {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'unit': 'seconds',
+            **metadata,
+        },
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(document, file, ensure_ascii=False, indent=2)
@@ -0,0 +1,215 @@
+"""
+Модуль кеша результатов запросов чтения ORM.
+
+Импорты:
+    - Импортируются необходимые модули и библиотеки.
+
+Классы:
+    - QueryCache: Потокобезопасный LRU-кеш результатов запросов с TTL и инвалидацией по таблицам.
+
+Функции:
+    - written_tables: Определение таблиц, изменяемых произвольным SQL-запросом.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Операторы, изменяющие данные или структуру таблицы, и имя таблицы после них
+_WRITE_RE = re.compile(
+    r'\b(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?|ALTER\s+TABLE|DROP\s+TABLE(?:\s+IF\s+EXISTS)?)'
+    r'\s+(?:ONLY\s+)?"?([A-Za-z_][\w.]*)"?',
+    re.IGNORECASE,
+)
+_READ_RE = re.compile(r'^\s*(?:SELECT|WITH|SHOW|EXPLAIN)\b', re.IGNORECASE)
+
+def written_tables(query):
+    """
+    Определение таблиц, которые изменяет произвольный SQL-запрос.
+
+    :param query: SQL-запрос.
+    :return: Множество имён таблиц (пустое для запросов чтения) или None,
+             если запрос что-то изменяет, но таблицы определить не удалось.
+    """
+    tables = {name.rsplit('.', 1)[-1].lower() for name in _WRITE_RE.findall(query)}
+    if tables or _READ_RE.match(query):
+        return tables
+    return None
+
+def _freeze(value):
+    """
+    Приведение параметров запроса к хешируемому виду (списки и словари — в кортежи).
+
+    :param value: Параметры запроса.
+    :return: Хешируемое значение.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+def _as_tables(table):
+    """
+    Приведение имени таблицы или набора имён к кортежу.
+
+    :param table: Имя таблицы или набор имён (для запросов с JOIN).
+    :return: Кортеж имён таблиц.
+    """
+    return (table,) if isinstance(table, str) else tuple(table)
+
+class QueryCache:
+    """
+    Потокобезопасный кеш результатов запросов чтения. Ключ — скомпилированный SQL-запрос
+    и его параметры, значение — строки результата. Кеш ограничен по числу записей (LRU)
+    и, при необходимости, по времени жизни записи. Запись в таблицу через ORM инвалидирует
+    все записи кеша для этой таблицы. Асинхронные записи (asave, aupdate, adelete, arawsql)
+    инвалидируют кеш, только если тот же объект кеша передан в AsyncDatabase(cache=...).
+
+    Атрибуты:
+    - max_size (int): Максимальное количество записей кеша.
+    - ttl (float | None): Время жизни записи (с). None — без ограничения.
+    - tables (frozenset | None): Таблицы, результаты чтения которых кешируются. None — все таблицы.
+    """
+
+    def __init__(self, max_size=1024, ttl=None, tables=None):
+        """
+        Инициализация кеша.
+
+        :param max_size: Максимальное количество записей. По умолчанию 1024.
+        :param ttl: Время жизни записи (с). По умолчанию без ограничения.
+        :param tables: Имена таблиц или классы моделей, чтение которых кешируется. По умолчанию все.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.tables = None if tables is None else frozenset(
+            table if isinstance(table, str) else table._plan.table for table in tables
+        )
+
+        self._entries = OrderedDict()  # ключ -> (таблицы, время истечения, строки)
+        self._keys_by_table = {}
+        self._generations = {}  # таблица -> номер поколения, увеличивается при инвалидации
+        self._epoch = 0  # увеличивается при полной очистке кеша
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    def caches(self, table):
+        """
+        Признак того, что результаты чтения таблицы кешируются.
+
+        :param table: Имя таблицы или набор имён (кешируется, только если кешируются все).
+        :return: True, если таблица кешируется.
+        """
+        return self.tables is None or all(name in self.tables for name in _as_tables(table))
+
+    def generation(self, table):
+        """
+        Текущее поколение таблицы. Результат, прочитанный до инвалидации, не попадёт в кеш.
+
+        :param table: Имя таблицы или набор имён.
+        :return: Пара (эпоха кеша, кортеж номеров поколений таблиц).
+        """
+        with self._lock:
+            return self._epoch, tuple(self._generations.get(name, 0) for name in _as_tables(table))
+
+    def _remove(self, key):
+        """
+        Удаление записи из кеша. Вызывается под блокировкой.
+
+        :param key: Ключ записи.
+        """
+        tables, _, _ = self._entries.pop(key)
+        for table in tables:
+            keys = self._keys_by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+    def get(self, query, params=None):
+        """
+        Получение результата запроса из кеша.
+
+        :param query: SQL-запрос.
+        :param params: Параметры запроса.
+        :return: Пара (найден ли результат, строки результата).
+        """
+        key = (query, _freeze(params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return False, None
+            _, expires_at, rows = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._remove(key)
+                self._counters['expirations'] += 1
+                self._counters['misses'] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return True, rows
+
+    def set(self, table, query, params, rows, generation=None):
+        """
+        Сохранение результата запроса в кеше.
+
+        :param table: Таблица (или набор таблиц), из которой прочитан результат.
+        :param query: SQL-запрос.
+        :param params: Параметры запроса.
+        :param rows: Строки результата.
+        :param generation: Поколение таблицы до выполнения запроса; если таблица с тех пор
+                           инвалидирована, результат не сохраняется.
+        """
+        key = (query, _freeze(params))
+        tables = _as_tables(table)
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            current = (self._epoch, tuple(self._generations.get(name, 0) for name in tables))
+            if generation is not None and current != generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (tables, expires_at, rows)
+            for name in tables:
+                self._keys_by_table.setdefault(name, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self._counters['evictions'] += 1
+
+    def invalidate(self, table):
+        """
+        Удаление всех записей кеша для таблицы.
+
+        :param table: Имя таблицы.
+        """
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            for key in list(self._keys_by_table.get(table, ())):
+                if key in self._entries:
+                    self._remove(key)
+            self._keys_by_table.pop(table, None)
+            self._counters['invalidations'] += 1
+
+    def clear(self):
+        """
+        Удаление всех записей кеша.
+        """
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._keys_by_table.clear()
+            self._counters['invalidations'] += 1
+
+    def stats(self):
+        """
+        Статистика работы кеша.
+
+        :return: Словарь со счётчиками и текущим размером кеша.
+        """
+        with self._lock:
+            result = dict(self._counters)
+            result['size'] = len(self._entries)
+            result['max_size'] = self.max_size
+        return result
@@ -0,0 +1,381 @@
+"""
+Модуль векторизованной (колоночной) генерации данных для моделей на NumPy.
+
+В отличие от lib/data_generator.py, где каждая строка собирается из отдельных вызовов random
+и превращается в объект Model, здесь каждый столбец генерируется целиком одним массивом NumPy:
+строки — выборкой символов алфавита сразу для всех строк, даты — смещениями datetime64,
+внешние ключи — выборкой из переданных списков идентификаторов. Результат выдаётся пакетами
+строк в порядке столбцов INSERT модели, готовыми для массовой загрузки.
+
+Генераторы столбцов отдельных таблиц собраны в словаре COLUMN_GENERATORS: имя таблицы ->
+(функция, имена нужных ей списков идентификаторов родительских строк), например
+'users': (..., ('app_ids',)). По этим именам generate_columns проверяет переданные списки.
+
+Импорты:
+    - Импортируются необходимые модули и библиотеки (NumPy — необязательная зависимость).
+
+Классы:
+    - ColumnBatch: Пакет сгенерированных данных в виде столбцов.
+
+Функции:
+    - random_strings: Массив случайных строк фиксированной длины.
+    - choose: Случайная выборка значений из списка.
+    - random_datetimes: Массив случайных моментов времени в диапазоне дней до now.
+    - generate_columns: Генерация пакета столбцов для модели.
+    - generate_batches: Потоковая генерация пакетов для модели.
+"""
+
+import string
+from datetime import datetime, timedelta
+from itertools import product
+
+try:
+    import numpy as np
+except ImportError:  # NumPy — необязательная зависимость колоночного генератора
+    np = None
+
+from lib import data_generator
+
+ALPHANUMERIC = string.ascii_letters + string.digits
+LOWER_ALPHANUMERIC = string.ascii_lowercase + string.digits
+
+def _require_numpy():
+    """
+    Проверка наличия NumPy.
+    """
+    if np is None:
+        raise ImportError("Columnar data generation requires NumPy: pip install numpy")
+
+def random_strings(rng, n, length, alphabet=ALPHANUMERIC):
+    """
+    Массив случайных строк фиксированной длины: коды символов для всех строк выбираются
+    одним вызовом, затем матрица символов склеивается в строки без цикла по строкам.
+
+    :param rng: Генератор numpy.random.Generator.
+    :param n: Количество строк.
+    :param length: Длина строки.
+    :param alphabet: Алфавит. По умолчанию латинские буквы и цифры.
+    :return: Массив строк (dtype U<length>).
+    """
+    symbols = np.frombuffer(alphabet.encode('ascii'), dtype='S1')
+    codes = rng.integers(0, len(symbols), size=(n, length))
+    return symbols[codes].view(f'S{length}').ravel().astype(f'U{length}')
+
+def choose(rng, options, n):
+    """
+    Случайная выборка n значений из списка (с повторениями).
+
+    :param rng: Генератор numpy.random.Generator.
+    :param options: Список значений.
+    :param n: Количество значений.
+    :return: Массив выбранных значений.
+    """
+    options = np.asarray(options)
+    return options[rng.integers(0, len(options), size=n)]
+
+def random_datetimes(rng, n, now, days, unit='us'):
+    """
+    Массив случайных моментов времени: начало диапазона плюс случайное целое число дней,
+    как random_date(now - timedelta(days=days), now) в построчном генераторе.
+
+    :param rng: Генератор numpy.random.Generator.
+    :param n: Количество значений.
+    :param now: Конец диапазона.
+    :param days: Длина диапазона в днях.
+    :param unit: Единица datetime64 ('us' для TIMESTAMP, 'D' для DATE).
+    :return: Массив datetime64.
+    """
+    start = np.datetime64(now - timedelta(days=days), unit)
+    offsets = rng.integers(0, days + 1, size=n).astype('timedelta64[D]')
+    return start + offsets
+
+def _combinations(template, *parts):
+    """
+    Все комбинации фрагментов, собранные по шаблону (для составных значений вроде ФИО).
+
+    :param template: Строка формата.
+    :param parts: Списки фрагментов.
+    :return: Список строк.
+    """
+    return [template.format(*combination) for combination in product(*parts)]
+
+# Справочники берутся из построчного генератора, чтобы распределения значений совпадали
+_FULL_NAMES = _combinations("{} {} {}", data_generator.LAST_NAMES, data_generator.FIRST_NAMES, data_generator.MIDDLE_NAMES)
+_EMAIL_DOMAINS = ["@" + domain for domain in data_generator.EMAIL_DOMAINS]
+_APP_NAMES = _combinations("{}{}", data_generator.APP_PREFIXES, data_generator.APP_SUFFIXES)
+_MOD_NAMES = _combinations("{} {}", data_generator.MOD_PREFIXES, data_generator.MOD_SUFFIXES)
+_VERSION_NAMES = _combinations("{}.{} {}", data_generator.VERSION_PREFIXES, range(10), data_generator.VERSION_SUFFIXES)
+_PC_PARAMETERS = {
+    'processor': data_generator.PROCESSORS,
+    'videocard': data_generator.VIDEOCARDS,
+    'os_version': data_generator.OS_VERSIONS,
+    'os_type': data_generator.OS_TYPES,
+    'disks': data_generator.DISKS,
+    'network_card': data_generator.NETWORK_CARDS,
+}
+
+def _application(rng, n, now, ids):
+    """
+    Столбцы таблицы application: названия приложений из справочника.
+
+    :param rng: Генератор numpy.random.Generator.
+    :param n: Количество строк.
+    :param now: Конец диапазона дат.
+    :param ids: Не используется: у таблицы нет внешних ключей.
+    :return: Словарь {столбец: массив значений}.
+    """
+    return {'app_name': choose(rng, _APP_NAMES, n)}
+
+def _users(rng, n, now, ids):
+    """
+    Столбцы таблицы users: ФИО, email, пароль, дата регистрации за два года и приложение.
+
+    :param rng: Генератор numpy.random.Generator.
+    :param n: Количество строк.
+    :param now: Конец диапазона дат.
+    :param ids: Списки идентификаторов родительских строк: {'app_ids': [...]}.
+    :return: Словарь {столбец: массив значений}.
+    """
+    return {
+        'full_name': choose(rng, _FULL_NAMES, n),
+        'email': np.char.add(random_strings(rng, n, 5, LOWER_ALPHANUMERIC), choose(rng, _EMAIL_DOMAINS, n)),
+        'password': random_strings(rng, n, 12),
+        'registration_date': random_datetimes(rng, n, now, 730, unit='D'),
+        'app_availability': choose(rng, ids['app_ids'], n),
+    }
+
+def _modification(rng, n, now, ids):
+    """
+    Столбцы таблицы modification: название, описание и приложение модификации.
+
+    :param rng: Генератор numpy.random.Generator.
+    :param n: Количество строк.
+    :param now: Конец диапазона дат.
+    :param ids: Списки идентификаторов родительских строк: {'app_ids': [...]}.
+    :return: Словарь {столбец: массив значений}.
+    """
+    return {
+        'mod_name': choose(rng, _MOD_NAMES, n),
+        'mod_desc': choose(rng, data_generator.MOD_DESCRIPTIONS, n),
+        'app_id': choose(rng, ids['app_ids'], n),
+    }
+
+def _purchase(rng, n, now, ids):
+    """
+    Столбцы таблицы purchase: покупатель, модификация и дата покупки за год.
+
+    :param rng: Генератор numpy.random.Generator.
+    :param n: Количество строк.
+    :param now: Конец диапазона дат.
+    :param ids: Списки идентификаторов родительских строк: {'user_ids': [...], 'mod_ids': [...]}.
+    :return: Словарь {столбец: массив значений}.
+    """
+    return {
+        'user_id': choose(rng, ids['user_ids'], n),
+        'mod_id': choose(rng, ids['mod_ids'], n),
+        'purchase_date': random_datetimes(rng, n, now, 365, unit='D'),
+    }
+
+def _checks(rng, n, now, ids):
+    """
+    Столбцы таблицы checks: покупка, сумма от 1 до 100 с копейками и способ оплаты.
+
+    :param rng: Генератор numpy.random.Generator.
+    :param n: Количество строк.
+    :param now: Конец диапазона дат.
+    :param ids: Списки идентификаторов родительских строк: {'purchase_ids': [...]}.
+    :return: Словарь {столбец: массив значений}.
+    """
+    return {
+        'purchase_id': choose(rng, ids['purchase_ids'], n),
+        'amount': np.round(rng.uniform(1, 100, size=n), 2),
+        'payment_method': choose(rng, data_generator.PAYMENT_METHODS, n),
+    }
+
+def _hwid(rng, n, now, ids):
+    """
+    Столбцы таблицы hwid: пользователь и параметры компьютера из справочников.
+
+    :param rng: Генератор numpy.random.Generator.
+    :param n: Количество строк.
+    :param now: Конец диапазона дат.
+    :param ids: Списки идентификаторов родительских строк: {'user_ids': [...]}.
+    :return: Словарь {столбец: массив значений}.
+    """
+    columns = {'user_id': choose(rng, ids['user_ids'], n)}
+    for name, options in _PC_PARAMETERS.items():
+        columns[name] = choose(rng, options, n)
+    return columns
+
+def _operation(rng, n, now, ids):
+    """
+    Столбцы таблицы operation: пользователь, тип операции (случайная строка) и время за год.
+
+    :param rng: Генератор numpy.random.Generator.
+    :param n: Количество строк.
+    :param now: Конец диапазона дат.
+    :param ids: Списки идентификаторов родительских строк: {'user_ids': [...]}.
+    :return: Словарь {столбец: массив значений}.
+    """
+    return {
+        'user_id': choose(rng, ids['user_ids'], n),
+        'operation_type': random_strings(rng, n, 15),
+        'operation_date': random_datetimes(rng, n, now, 365),
+    }
+
+def _subscription(rng, n, now, ids):
+    """
+    Столбцы таблицы subscription: пользователь, модификация и время подписки за год.
+
+    :param rng: Генератор numpy.random.Generator.
+    :param n: Количество строк.
+    :param now: Конец диапазона дат.
+    :param ids: Списки идентификаторов родительских строк: {'user_ids': [...], 'mod_ids': [...]}.
+    :return: Словарь {столбец: массив значений}.
+    """
+    return {
+        'user_id': choose(rng, ids['user_ids'], n),
+        'mod_id': choose(rng, ids['mod_ids'], n),
+        'subscription_time': random_datetimes(rng, n, now, 365),
+    }
+
+def _token(rng, n, now, ids):
+    """
+    Столбцы таблицы token: пользователь, компьютер (hwid) и время последнего входа за год.
+
+    :param rng: Генератор numpy.random.Generator.
+    :param n: Количество строк.
+    :param now: Конец диапазона дат.
+    :param ids: Списки идентификаторов родительских строк: {'user_ids': [...], 'hwid_ids': [...]}.
+    :return: Словарь {столбец: массив значений}.
+    """
+    return {
+        'user_id': choose(rng, ids['user_ids'], n),
+        'hwid_id': choose(rng, ids['hwid_ids'], n),
+        'last_login': random_datetimes(rng, n, now, 365),
+    }
+
+def _version(rng, n, now, ids):
+    """
+    Столбцы таблицы version: модификация, номер, название, описание и ссылка на версию.
+
+    :param rng: Генератор numpy.random.Generator.
+    :param n: Количество строк.
+    :param now: Конец диапазона дат.
+    :param ids: Списки идентификаторов родительских строк: {'mod_ids': [...]}.
+    :return: Словарь {столбец: массив значений}.
+    """
+    links = np.char.add(np.char.add("http://new-version-", random_strings(rng, n, 10)), ".com")
+    return {
+        'mod_id': choose(rng, ids['mod_ids'], n),
+        'version_number': rng.integers(1, 201, size=n),
+        'version_name': choose(rng, _VERSION_NAMES, n),
+        'version_description': choose(rng, data_generator.VERSION_DESCRIPTIONS, n),
+        'version_link': links,
+    }
+
+# Генераторы столбцов по таблицам и имена списков идентификаторов, которые им нужны
+COLUMN_GENERATORS = {
+    'application': (_application, ()),
+    'users': (_users, ('app_ids',)),
+    'modification': (_modification, ('app_ids',)),
+    'purchase': (_purchase, ('user_ids', 'mod_ids')),
+    'checks': (_checks, ('purchase_ids',)),
+    'hwid': (_hwid, ('user_ids',)),
+    'operation': (_operation, ('user_ids',)),
+    'subscription': (_subscription, ('user_ids', 'mod_ids')),
+    'token': (_token, ('user_ids', 'hwid_ids')),
+    'version': (_version, ('mod_ids',)),
+}
+
+class ColumnBatch:
+    """
+    Пакет сгенерированных данных модели в виде столбцов.
+
+    Атрибуты:
+        - model: Класс модели.
+        - columns: Словарь {имя столбца: массив NumPy}.
+        - size: Количество строк в пакете.
+    """
+    def __init__(self, model, columns, size):
+        self.model = model
+        self.columns = columns
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def column_names(self):
+        """
+        Столбцы пакета в порядке INSERT модели (без первичного ключа).
+
+        :return: Кортеж имён столбцов.
+        """
+        return self.model._plan.insert_columns
+
+    def rows(self):
+        """
+        Строки пакета в порядке column_names (значения — объекты Python, пригодные для psycopg2).
+        Столбцы, для которых генератор не задан, заполняются None.
+
+        :return: Список кортежей.
+        """
+        values = [
+            self.columns[name].tolist() if name in self.columns else [None] * self.size
+            for name in self.column_names
+        ]
+        return list(zip(*values))
+
+    def to_models(self):
+        """
+        Объекты модели для пакета (для совместимости с Model.bulk_save).
+
+        :return: Список объектов модели.
+        """
+        names = self.column_names
+        return [self.model(**dict(zip(names, row))) for row in self.rows()]
+
+def generate_columns(model, n, rng=None, now=None, **ids):
+    """
+    Генерация пакета столбцов для модели.
+
+    :param model: Класс модели.
+    :param n: Количество строк.
+    :param rng: Генератор numpy.random.Generator. По умолчанию — новый без seed.
+    :param now: Момент, от которого отсчитываются даты. По умолчанию текущее время.
+    :param ids: Списки идентификаторов для внешних ключей (app_ids, user_ids, mod_ids, purchase_ids, hwid_ids).
+    :return: Объект ColumnBatch.
+    """
+    _require_numpy()
+    table = model._plan.table
+    if table not in COLUMN_GENERATORS:
+        raise ValueError(f"No columnar generator for table '{table}'")
+    generator, required = COLUMN_GENERATORS[table]
+    missing = [name for name in required if not len(ids.get(name, ()))]
+    if missing:
+        raise ValueError(f"Columnar generator for '{table}' requires non-empty {', '.join(missing)}")
+    rng = rng if rng is not None else np.random.default_rng()
+    return ColumnBatch(model, generator(rng, n, now or datetime.now(), ids), n)
+
+def generate_batches(model, n, batch_size=100000, seed=0, now=None, **ids):
+    """
+    Потоковая генерация n строк пакетами по batch_size. Каждый пакет генерируется
+    собственным генератором с seed, производным от seed и номера пакета (как в generate_parallel),
+    поэтому результат воспроизводим и не зависит от размера потребляющей стороны.
+
+    :param model: Класс модели.
+    :param n: Количество строк.
+    :param batch_size: Количество строк в пакете. По умолчанию 100000.
+    :param seed: Общий seed генерации. По умолчанию 0.
+    :param now: Момент, от которого отсчитываются даты. По умолчанию фиксируется при вызове.
+    :param ids: Списки идентификаторов для внешних ключей.
+    :yield: Объекты ColumnBatch.
+    """
+    _require_numpy()
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    now = now or datetime.now()
+    for index, start in enumerate(range(0, n, batch_size)):
+        rng = np.random.default_rng([seed, index])
+        yield generate_columns(model, min(batch_size, n - start), rng=rng, now=now, **ids)
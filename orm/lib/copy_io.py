@@ -0,0 +1,75 @@
+"""
+Модуль потоковой загрузки строк через COPY ... FROM STDIN.
+
+Строки кодируются в текстовый формат COPY (разделитель — табуляция, NULL — \\N) по мере чтения,
+поэтому в памяти находится только небольшой буфер, а не весь набор данных.
+
+Импорты:
+    - Импортируются необходимые модули и библиотеки.
+
+Классы:
+    - CopyReader: Файлоподобный объект, отдающий строки в текстовом формате COPY.
+
+Функции:
+    - encode_text: Кодирование значения в текстовый формат COPY.
+"""
+
+from datetime import date, datetime, time
+
+# Символы, которые в текстовом формате COPY записываются escape-последовательностями
+_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+def encode_text(value):
+    """
+    Кодирование значения в текстовый формат COPY.
+
+    :param value: Значение столбца.
+    :return: Строка поля (\\N для None).
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value).translate(_ESCAPES)
+
+class CopyReader:
+    """
+    Файлоподобный объект для cursor.copy_expert: по запросу read(size) кодирует
+    очередные строки итератора в текстовый формат COPY.
+
+    Атрибуты:
+    - rows (int): Количество строк, отданных на данный момент.
+    """
+
+    def __init__(self, rows):
+        """
+        :param rows: Итерируемый набор строк (кортежей значений).
+        """
+        self._rows = iter(rows)
+        self._buffer = ''
+        self.rows = 0
+
+    def read(self, size=-1):
+        """
+        Чтение очередной порции данных.
+
+        :param size: Желаемый размер порции (в символах). Отрицательное значение — всё оставшееся.
+        :return: Строка данных COPY (пустая по окончании строк).
+        """
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        for row in self._rows:
+            line = '\t'.join(map(encode_text, row)) + '\n'
+            chunks.append(line)
+            length += len(line)
+            self.rows += 1
+            if 0 <= size <= length:
+                break
+        data = ''.join(chunks)
+        if size < 0:
+            self._buffer = ''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
@@ -7,235 +7,271 @@
 Функции:
     - Генерация случайных строк, email, дат, целых чисел.
     - Генерация данных для каждой модели (Application, Users, Modification и т.д.)
+    - chunk_seed: Seed порции данных, производный от общего seed.
+    - generate_parallel: Параллельная воспроизводимая генерация данных в пуле процессов.
+
+Все функции принимают необязательный источник случайности rng (по умолчанию — глобальное
+состояние модуля random), а функции с датами — момент времени now, от которого отсчитываются даты.
+Передача random.Random с фиксированным seed и фиксированного now делает результат воспроизводимым.
 """
 
+import inspect
 import random
 import string
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 
-def random_string(length):
+# Справочники значений (используются построчным и колоночным генераторами)
+EMAIL_DOMAINS = ["example.com", "test.com", "mydomain.com", "economic-crisis.com", "baka.com", "gmail.com", "ya.ru", "mail.ru", "yandex.ru", "yahoo.com", "outlook.com", "hotmail.com", "protonmail.com", "tutanota.com", "aol.com", "icloud.com", "inbox.lv", "zoho.com", "gmx.com", "yopmail.com", "mailinator.com", "guerrillamail.com", "10minutemail.com", "temp-mail.org", "maildrop.cc", "dispostable.com", "throwawaymail.com", "tempmailaddress.com", "mailnesia.com", "trashmail.com", "mailsac.com", "getnada.com", "anonaddy.com", "burnermail.io", "simplelogin.io", "scryptmail.com", "mailbox.org", "posteo.de", "tutanota.com", "mailbox.org", "disroot.org", "riseup.net", "autistici.org"]
+FIRST_NAMES = ["Иван", "Темур", "Николай", "Петр", "Алексей", "Дмитрий", "Сергей"]
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Cпиридонов", "Кукушкин", "Исмагилов"]
+MIDDLE_NAMES = ["Алексеевич", "Сергеевич", "Дмитриевич", "Владимирович", "Андреевич"]
+APP_PREFIXES = ["Super", "Mega", "Ultra", "Hyper", "Tech"]
+APP_SUFFIXES = ["App", "Tool", "Software", "Manager", "System"]
+MOD_PREFIXES = ["Pro", "Lite", "Advanced", "Basic", "Premium", "Free", "Trial", "Ultimate", "Standard", "Professional", "Community"]
+MOD_SUFFIXES = ["Edition", "Version", "Setup", "Pack", "Kit", "Release", "Update", "Patch", "Build"]
+MOD_DESCRIPTIONS = [
+    "Эта модификация включает в себя улучшения производительности",
+    "Версия с новыми функциями и исправлениями",
+    "Обновление, которое повышает стабильность работы",
+    "Новое издание со всеми доступными дополнениями",
+    "Более легкая версия с оптимизированными ресурсами",
+    "Бесплатная версия для тестирования",
+    "Профессиональная версия для опытных пользователей",
+    "Сообщество разработчиков представляет новую версию",
+    "Версия с расширенными возможностями",
+    "Версия для всех пользователей",
+    "Сборка с исправлениями уязвимостей и обновлениями",
+    "Новое обновление с новыми функциями и улучшениями",
+]
+PAYMENT_METHODS = ["Credit Card", "MasterCard", "Visa", "Mir", "Mir Pay", "Tinkoff Pay", "PayPal", "Bank Transfer", "Bitcoin", "Gift Card", "Apple Pay", "Google Pay", "Samsung Pay", "Cash", "Cryptocurrency", "WebMoney", "Yandex Money", "Qiwi Wallet", "Alipay", "WeChat Pay", "Venmo", "Zelle", "Cash App", "Stripe", "Square", "TransferWise", "Revolut", "Payoneer", "Skrill", "Neteller", "Paysera", "Payza", "Perfect Money", "Payeer", "AdvCash", "Paxum", "PaySera", "Epay", "Ecopayz", "WebMoney", "Yandex Money", "Qiwi Wallet", "Alipay", "WeChat Pay", "Venmo", "Zelle", "Cash App", "Stripe", "Square", "TransferWise", "Revolut", "Payoneer", "Skrill", "Neteller", "Paysera", "Payza", "Perfect Money", "Payeer", "AdvCash"]
+PROCESSORS = ["Intel Core i7", "AMD Ryzen 5", "Intel Core i5", "AMD Ryzen 7", "Intel Core i9", "AMD Ryzen 9", "Intel Xeon", "AMD Threadripper", "Intel Pentium", "AMD Athlon", "Intel Celeron", "AMD A-Series"]
+VIDEOCARDS = ["NVIDIA GTX 1650", "AMD Radeon RX 5700", "NVIDIA RTX 2060", "AMD RX 580", "NVIDIA RTX 3080", "AMD RX 6800", "NVIDIA GTX 1050", "AMD RX 560", "NVIDIA RTX 3090", "AMD RX 6900", "NVIDIA GTX 1660", "AMD RX 570", "NVIDIA RTX 3070", "AMD RX 6700", "NVIDIA GTX 1070", "AMD RX 550", "NVIDIA RTX 3060", "AMD RX 6600", "NVIDIA GTX 1080", "AMD RX 5300"]
+OS_VERSIONS = ["Windows 10", "Windows 11", "Ubuntu 20.04", "macOS Catalina", "Fedora 34", "Debian 11", "CentOS 8", "Arch Linux", "openSUSE Leap", "Linux Mint", "Kali Linux", "Manjaro", "Zorin OS", "Pop!_OS", "elementary OS", "Solus", "Deepin", "MX Linux", "EndeavourOS", "Garuda Linux", "ArcoLinux", "Parrot OS", "Slackware", "Gentoo", "Void Linux", "Alpine Linux", "LFS", "ReactOS", "FreeDOS", "Haiku", "Plan 9", "TempleOS", "RISC OS", "AmigaOS", "BeOS", "QNX", "MS-DOS", "CP/M", "OS/2", "Unix"]
+OS_TYPES = ["32-bit", "64-bit"]
+DISKS = ["HDD 1TB", "SSD 256GB", "Hybrid 1TB", "NVMe SSD 512GB", "SATA SSD 1TB", "M.2 SSD 2TB", "PCIe SSD 1TB", "SAS HDD 2TB", "SCSI HDD 1TB", "eMMC 128GB", "USB Flash 64GB", "SD Card 32GB", "CF Card 16GB", "MicroSD 8GB", "CompactFlash 4GB", "Floppy Disk 1.44MB", "Zip Disk 100MB", "Jaz Disk 1GB", "CD-ROM 700MB", "DVD-RW 4.7GB", "BD-R 25GB", "HD-DVD 15GB", "Blu-ray 50GB", "UHD Blu-ray 100GB", "VHS Tape"]
+NETWORK_CARDS = ["Realtek PCIe", "Intel Ethernet", "Qualcomm Atheros", "Broadcom Ethernet", "Killer Wireless", "Marvell AVASTAR", "Ralink Wireless", "Aquantia AQtion", "ASUS PCE-AC88", "TP-Link Archer", "D-Link DWA", "Netgear Nighthawk", "Linksys WRT", "Cisco Catalyst", "MikroTik Router", "Ubiquiti UniFi", "Zyxel Nebula", "Aruba Instant", "Fortinet FortiGate", "SonicWall TZ", "Palo Alto Networks", "Sophos XG", "Check Point", "Juniper SRX", "F5 BIG-IP", "Citrix NetScaler", "Barracuda CloudGen", "WatchGuard Firebox", "ZyXEL ZyWALL", "Huawei USG", "HPE Aruba", "Ruckus Wireless", "Meraki MR", "Open Mesh", "Mist Systems", "Aerohive HiveAP", "Aruba Instant", "Fortinet FortiAP", "SonicWall SonicPoint", "Palo Alto Networks PA", "Sophos AP", "Check Point 700", "Juniper WLA", "F5 BIG-IP", "Citrix Access Point", "Barracuda CloudGen", "WatchGuard AP", "ZyXEL NWA", "Huawei AP", "HPE Aruba AP", "Ruckus ZoneFlex", "Meraki MR", "Open Mesh AP", "Mist AP", "Aerohive AP"]
+VERSION_PREFIXES = ["1.0", "1.1", "2.0", "3.0", "4.0", "5.0", "6.0", "7.0", "8.0", "9.0", "10.0", "11.0", "12.0", "13.0", "14.0", "15.0"]
+VERSION_SUFFIXES = ["Alpha", "Beta", "Release", "Stable", "Final"]
+VERSION_DESCRIPTIONS = [
+    "Первоначальный выпуск с базовой функциональностью.",
+    "Это обновление включает исправления и улучшения производительности.",
+    "Новое крупное обновление с дополнительными функциями.",
+    "Исправлены ошибки предыдущих выпусков.",
+    "Конечный стабильный выпуск.",
+    "Это обновление содержит новые возможности и улучшения.",
+    "Сборка с исправлениями уязвимостей и обновлениями.",
+    "Новое обновление с новыми функциями и улучшениями.",
+    "Это обновление включает исправления и улучшения производительности.",
+    "Новое крупное обновление с дополнительными функциями.",
+]
+
+def random_string(length, rng=random):
     """
     Генерация случайной строки заданной длины.
 
     :param length: Длина строки.
+    :param rng: Источник случайности. По умолчанию модуль random.
     :return: Случайная строка.
     """
     letters = string.ascii_letters + string.digits
-    return ''.join(random.choice(letters) for _ in range(length))
+    return ''.join(rng.choice(letters) for _ in range(length))
 
-def random_email():
+def random_email(rng=random):
     """
     Генерация случайного email.
 
+    :param rng: Источник случайности. По умолчанию модуль random.
     :return: Случайный email.
     """
-    domains = ["example.com", "test.com", "mydomain.com", "economic-crisis.com", "baka.com", "gmail.com", "ya.ru", "mail.ru", "yandex.ru", "yahoo.com", "outlook.com", "hotmail.com", "protonmail.com", "tutanota.com", "aol.com", "icloud.com", "inbox.lv", "zoho.com", "gmx.com", "yopmail.com", "mailinator.com", "guerrillamail.com", "10minutemail.com", "temp-mail.org", "maildrop.cc", "dispostable.com", "throwawaymail.com", "tempmailaddress.com", "mailnesia.com", "trashmail.com", "mailsac.com", "getnada.com", "anonaddy.com", "burnermail.io", "simplelogin.io", "scryptmail.com", "mailbox.org", "posteo.de", "tutanota.com", "mailbox.org", "disroot.org", "riseup.net", "autistici.org"]
-    email = f"{random_string(5).lower()}@{random.choice(domains)}"
+    email = f"{random_string(5, rng).lower()}@{rng.choice(EMAIL_DOMAINS)}"
     return email
 
-def random_date(start, end):
+def random_date(start, end, rng=random):
     """
     Генерация случайной даты в заданном диапазоне.
 
     :param start: Начальная дата диапазона.
     :param end: Конечная дата диапазона.
+    :param rng: Источник случайности. По умолчанию модуль random.
     :return: Случайная дата.
     """
     delta = end - start
-    return start + timedelta(days=random.randint(0, delta.days))
+    return start + timedelta(days=rng.randint(0, delta.days))
 
-def random_int(min_val, max_val):
+def random_int(min_val, max_val, rng=random):
     """
     Генерация случайного целого числа в заданном диапазоне.
 
     :param min_val: Минимальное значение (включительно).
     :param max_val: Максимальное значение (включительно).
+    :param rng: Источник случайности. По умолчанию модуль random.
     :return: Случайное целое число.
     """
-    return random.randint(min_val, max_val)
+    return rng.randint(min_val, max_val)
 
-def generate_full_name():
+def generate_full_name(rng=random):
     """
     Генерация случайного ФИО.
 
+    :param rng: Источник случайности. По умолчанию модуль random.
     :return: Случайное ФИО.
     """
-    first_names = ["Иван", "Темур", "Николай", "Петр", "Алексей", "Дмитрий", "Сергей"]
-    last_names = ["Иванов", "Петров", "Сидоров", "Кузнецов", "Смирнов", "Cпиридонов", "Кукушкин", "Исмагилов"]
-    middle_names = ["Алексеевич", "Сергеевич", "Дмитриевич", "Владимирович", "Андреевич"]
-    
-    return f"{random.choice(last_names)} {random.choice(first_names)} {random.choice(middle_names)}"
+    return f"{rng.choice(LAST_NAMES)} {rng.choice(FIRST_NAMES)} {rng.choice(MIDDLE_NAMES)}"
 
-def generate_app_name():
+def generate_app_name(rng=random):
     """
     Генерация случайного названия приложения.
 
+    :param rng: Источник случайности. По умолчанию модуль random.
     :return: Случайное название приложения.
     """
-    app_prefixes = ["Super", "Mega", "Ultra", "Hyper", "Tech"]
-    app_suffixes = ["App", "Tool", "Software", "Manager", "System"]
-    
-    return f"{random.choice(app_prefixes)}{random.choice(app_suffixes)}"
+    return f"{rng.choice(APP_PREFIXES)}{rng.choice(APP_SUFFIXES)}"
 
-def generate_modification_name():
+def generate_modification_name(rng=random):
     """
     Генерация случайного названия модификации.
 
+    :param rng: Источник случайности. По умолчанию модуль random.
     :return: Случайное название модификации.
     """
-    mod_prefixes = ["Pro", "Lite", "Advanced", "Basic", "Premium", "Free", "Trial", "Ultimate", "Standard", "Professional", "Community"]
-    mod_suffixes = ["Edition", "Version", "Setup", "Pack", "Kit", "Release", "Update", "Patch", "Build"]
-    
-    return f"{random.choice(mod_prefixes)} {random.choice(mod_suffixes)}"
+    return f"{rng.choice(MOD_PREFIXES)} {rng.choice(MOD_SUFFIXES)}"
 
-def generate_modification_description():
+def generate_modification_description(rng=random):
     """
     Генерация случайного описания модификации.
 
+    :param rng: Источник случайности. По умолчанию модуль random.
     :return: Случайное описание модификации.
     """
-    descriptions = [
-        "Эта модификация включает в себя улучшения производительности",
-        "Версия с новыми функциями и исправлениями",
-        "Обновление, которое повышает стабильность работы",
-        "Новое издание со всеми доступными дополнениями",
-        "Более легкая версия с оптимизированными ресурсами",
-        "Бесплатная версия для тестирования",
-        "Профессиональная версия для опытных пользователей",
-        "Сообщество разработчиков представляет новую версию",
-        "Версия с расширенными возможностями",
-        "Версия для всех пользователей",
-        "Сборка с исправлениями уязвимостей и обновлениями",
-        "Новое обновление с новыми функциями и улучшениями",
-    ]
-    
-    return random.choice(descriptions)
-
-def generate_payment_method():
+    return rng.choice(MOD_DESCRIPTIONS)
+
+def generate_payment_method(rng=random):
     """
     Генерация случайного метода платежа.
 
+    :param rng: Источник случайности. По умолчанию модуль random.
     :return: Случайный метод платежа.
     """
-    methods = ["Credit Card", "MasterCard", "Visa", "Mir", "Mir Pay", "Tinkoff Pay", "PayPal", "Bank Transfer", "Bitcoin", "Gift Card", "Apple Pay", "Google Pay", "Samsung Pay", "Cash", "Cryptocurrency", "WebMoney", "Yandex Money", "Qiwi Wallet", "Alipay", "WeChat Pay", "Venmo", "Zelle", "Cash App", "Stripe", "Square", "TransferWise", "Revolut", "Payoneer", "Skrill", "Neteller", "Paysera", "Payza", "Perfect Money", "Payeer", "AdvCash", "Paxum", "PaySera", "Epay", "Ecopayz", "WebMoney", "Yandex Money", "Qiwi Wallet", "Alipay", "WeChat Pay", "Venmo", "Zelle", "Cash App", "Stripe", "Square", "TransferWise", "Revolut", "Payoneer", "Skrill", "Neteller", "Paysera", "Payza", "Perfect Money", "Payeer", "AdvCash"]
-    
-    return random.choice(methods)
+    return rng.choice(PAYMENT_METHODS)
 
-def generate_pc_parameters():
+def generate_pc_parameters(rng=random):
     """
     Генерация случайных параметров ПК.
 
+    :param rng: Источник случайности. По умолчанию модуль random.
     :return: Словарь с параметрами ПК.
     """
-    processors = ["Intel Core i7", "AMD Ryzen 5", "Intel Core i5", "AMD Ryzen 7", "Intel Core i9", "AMD Ryzen 9", "Intel Xeon", "AMD Threadripper", "Intel Pentium", "AMD Athlon", "Intel Celeron", "AMD A-Series"]
-    videocards = ["NVIDIA GTX 1650", "AMD Radeon RX 5700", "NVIDIA RTX 2060", "AMD RX 580", "NVIDIA RTX 3080", "AMD RX 6800", "NVIDIA GTX 1050", "AMD RX 560", "NVIDIA RTX 3090", "AMD RX 6900", "NVIDIA GTX 1660", "AMD RX 570", "NVIDIA RTX 3070", "AMD RX 6700", "NVIDIA GTX 1070", "AMD RX 550", "NVIDIA RTX 3060", "AMD RX 6600", "NVIDIA GTX 1080", "AMD RX 5300"]
-    os_versions = ["Windows 10", "Windows 11", "Ubuntu 20.04", "macOS Catalina", "Fedora 34", "Debian 11", "CentOS 8", "Arch Linux", "openSUSE Leap", "Linux Mint", "Kali Linux", "Manjaro", "Zorin OS", "Pop!_OS", "elementary OS", "Solus", "Deepin", "MX Linux", "EndeavourOS", "Garuda Linux", "ArcoLinux", "Parrot OS", "Slackware", "Gentoo", "Void Linux", "Alpine Linux", "LFS", "ReactOS", "FreeDOS", "Haiku", "Plan 9", "TempleOS", "RISC OS", "AmigaOS", "BeOS", "QNX", "MS-DOS", "CP/M", "OS/2", "Unix"]
-    os_types = ["32-bit", "64-bit"]
-    disks = ["HDD 1TB", "SSD 256GB", "Hybrid 1TB", "NVMe SSD 512GB", "SATA SSD 1TB", "M.2 SSD 2TB", "PCIe SSD 1TB", "SAS HDD 2TB", "SCSI HDD 1TB", "eMMC 128GB", "USB Flash 64GB", "SD Card 32GB", "CF Card 16GB", "MicroSD 8GB", "CompactFlash 4GB", "Floppy Disk 1.44MB", "Zip Disk 100MB", "Jaz Disk 1GB", "CD-ROM 700MB", "DVD-RW 4.7GB", "BD-R 25GB", "HD-DVD 15GB", "Blu-ray 50GB", "UHD Blu-ray 100GB", "VHS Tape"]
-    network_cards = ["Realtek PCIe", "Intel Ethernet", "Qualcomm Atheros", "Broadcom Ethernet", "Killer Wireless", "Marvell AVASTAR", "Ralink Wireless", "Aquantia AQtion", "ASUS PCE-AC88", "TP-Link Archer", "D-Link DWA", "Netgear Nighthawk", "Linksys WRT", "Cisco Catalyst", "MikroTik Router", "Ubiquiti UniFi", "Zyxel Nebula", "Aruba Instant", "Fortinet FortiGate", "SonicWall TZ", "Palo Alto Networks", "Sophos XG", "Check Point", "Juniper SRX", "F5 BIG-IP", "Citrix NetScaler", "Barracuda CloudGen", "WatchGuard Firebox", "ZyXEL ZyWALL", "Huawei USG", "HPE Aruba", "Ruckus Wireless", "Meraki MR", "Open Mesh", "Mist Systems", "Aerohive HiveAP", "Aruba Instant", "Fortinet FortiAP", "SonicWall SonicPoint", "Palo Alto Networks PA", "Sophos AP", "Check Point 700", "Juniper WLA", "F5 BIG-IP", "Citrix Access Point", "Barracuda CloudGen", "WatchGuard AP", "ZyXEL NWA", "Huawei AP", "HPE Aruba AP", "Ruckus ZoneFlex", "Meraki MR", "Open Mesh AP", "Mist AP", "Aerohive AP"]
-    
     return {
-        'processor': random.choice(processors),
-        'videocard': random.choice(videocards),
-        'os_version': random.choice(os_versions),
-        'os_type': random.choice(os_types),
-        'disks': random.choice(disks),
-        'network_card': random.choice(network_cards)
+        'processor': rng.choice(PROCESSORS),
+        'videocard': rng.choice(VIDEOCARDS),
+        'os_version': rng.choice(OS_VERSIONS),
+        'os_type': rng.choice(OS_TYPES),
+        'disks': rng.choice(DISKS),
+        'network_card': rng.choice(NETWORK_CARDS)
     }
 
-def generate_application_data(n):
+def generate_application_data(n, rng=random):
     """
     Генерация списка объектов Application.
 
     :param n: Количество объектов для генерации.
+    :param rng: Источник случайности. По умолчанию модуль random.
     :yield: Объект Application.
     """
     from lib.orm import Application
     for _ in range(n):
-        yield Application(app_name=generate_app_name())
+        yield Application(app_name=generate_app_name(rng))
 
-def generate_user_data(n, app_ids):
+def generate_user_data(n, app_ids, rng=random, now=None):
     """
     Генерация списка объектов Users.
 
     :param n: Количество объектов для генерации.
     :param app_ids: Список идентификаторов приложений.
+    :param rng: Источник случайности. По умолчанию модуль random.
+    :param now: Момент, от которого отсчитываются даты. По умолчанию текущее время.
     :yield: Объект Users.
     """
     from lib.orm import Users
-    now = datetime.now()
+    now = now or datetime.now()
     for _ in range(n):
         yield Users(
-            full_name=generate_full_name(),
-            email=random_email(),
-            password=random_string(12),
-            registration_date=random_date(now - timedelta(days=730), now).date(),
-            app_availability=random.choice(app_ids)
+            full_name=generate_full_name(rng),
+            email=random_email(rng),
+            password=random_string(12, rng),
+            registration_date=random_date(now - timedelta(days=730), now, rng).date(),
+            app_availability=rng.choice(app_ids)
         )
 
-def generate_modification_data(n, app_ids):
+def generate_modification_data(n, app_ids, rng=random):
     """
     Генерация списка объектов Modification.
 
     :param n: Количество объектов для генерации.
     :param app_ids: Список идентификаторов приложений.
+    :param rng: Источник случайности. По умолчанию модуль random.
     :yield: Объект Modification.
     """
     from lib.orm import Modification
     for _ in range(n):
         yield Modification(
-            mod_name=generate_modification_name(),
-            mod_desc=generate_modification_description(),
-            app_id=random.choice(app_ids)
+            mod_name=generate_modification_name(rng),
+            mod_desc=generate_modification_description(rng),
+            app_id=rng.choice(app_ids)
         )
 
-def generate_purchase_data(n, user_ids, mod_ids):
+def generate_purchase_data(n, user_ids, mod_ids, rng=random, now=None):
     """
     Генерация списка объектов Purchase.
 
     :param n: Количество объектов для генерации.
     :param user_ids: Список идентификаторов пользователей.
     :param mod_ids: Список идентификаторов модификаций.
+    :param rng: Источник случайности. По умолчанию модуль random.
+    :param now: Момент, от которого отсчитываются даты. По умолчанию текущее время.
     :yield: Объект Purchase.
     """
     from lib.orm import Purchase
-    now = datetime.now()
+    now = now or datetime.now()
     for _ in range(n):
         yield Purchase(
-            user_id=random.choice(user_ids),
-            mod_id=random.choice(mod_ids),
-            purchase_date=random_date(now - timedelta(days=365), now).date()
+            user_id=rng.choice(user_ids),
+            mod_id=rng.choice(mod_ids),
+            purchase_date=random_date(now - timedelta(days=365), now, rng).date()
         )
 
-def generate_check_data(n, purchase_ids):
+def generate_check_data(n, purchase_ids, rng=random):
     """
     Генерация списка объектов Checks.
 
     :param n: Количество объектов для генерации.
     :param purchase_ids: Список идентификаторов покупок.
+    :param rng: Источник случайности. По умолчанию модуль random.
     :yield: Объект Checks.
     """
     from lib.orm import Checks
     for _ in range(n):
         yield Checks(
-            purchase_id=random.choice(purchase_ids),
-            amount=round(random.uniform(1, 100), 2),
-            payment_method=generate_payment_method()
+            purchase_id=rng.choice(purchase_ids),
+            amount=round(rng.uniform(1, 100), 2),
+            payment_method=generate_payment_method(rng)
         )
 
-def generate_hwid_data(n, user_ids):
+def generate_hwid_data(n, user_ids, rng=random):
     """
     Генерация списка объектов HWID.
 
     :param n: Количество объектов для генерации.
     :param user_ids: Список идентификаторов пользователей.
+    :param rng: Источник случайности. По умолчанию модуль random.
     :yield: Объект HWID.
     """
     from lib.orm import HWID
     for _ in range(n):
-        pc_params = generate_pc_parameters()
+        pc_params = generate_pc_parameters(rng)
         yield HWID(
-            user_id=random.choice(user_ids),
+            user_id=rng.choice(user_ids),
             processor=pc_params['processor'],
             videocard=pc_params['videocard'],
             os_version=pc_params['os_version'],
@@ -244,91 +280,138 @@ def generate_hwid_data(n, user_ids):
             network_card=pc_params['network_card']
         )
 
-def generate_operation_data(n, user_ids):
+def generate_operation_data(n, user_ids, rng=random, now=None):
     """
     Генерация списка объектов Operation.
 
     :param n: Количество объектов для генерации.
     :param user_ids: Список идентификаторов пользователей.
+    :param rng: Источник случайности. По умолчанию модуль random.
+    :param now: Момент, от которого отсчитываются даты. По умолчанию текущее время.
     :yield: Объект Operation.
     """
     from lib.orm import Operation
-    now = datetime.now()
+    now = now or datetime.now()
     for _ in range(n):
         yield Operation(
-            user_id=random.choice(user_ids),
-            operation_type=random_string(15),  # Например, тип операции можно создавать как случайную строку длиной 15
-            operation_date=random_date(now - timedelta(days=365), now)
+            user_id=rng.choice(user_ids),
+            operation_type=random_string(15, rng),  # Например, тип операции можно создавать как случайную строку длиной 15
+            operation_date=random_date(now - timedelta(days=365), now, rng)
         )
 
-def generate_subscription_data(n, user_ids, mod_ids):
+def generate_subscription_data(n, user_ids, mod_ids, rng=random, now=None):
     """
     Генерация списка объектов Subscription.
 
     :param n: Количество объектов для генерации.
     :param user_ids: Список идентификаторов пользователей.
     :param mod_ids: Список идентификаторов модификаций.
+    :param rng: Источник случайности. По умолчанию модуль random.
+    :param now: Момент, от которого отсчитываются даты. По умолчанию текущее время.
     :yield: Объект Subscription.
     """
     from lib.orm import Subscription
-    now = datetime.now()
+    now = now or datetime.now()
     for _ in range(n):
         yield Subscription(
-            user_id=random.choice(user_ids),
-            mod_id=random.choice(mod_ids),
-            subscription_time=random_date(now - timedelta(days=365), now)
+            user_id=rng.choice(user_ids),
+            mod_id=rng.choice(mod_ids),
+            subscription_time=random_date(now - timedelta(days=365), now, rng)
         )
 
-def generate_token_data(n, user_ids, hwid_ids):
+def generate_token_data(n, user_ids, hwid_ids, rng=random, now=None):
     """
     Генерация списка объектов Token.
 
     :param n: Количество объектов для генерации.
     :param user_ids: Список идентификаторов пользователей.
     :param hwid_ids: Список идентификаторов HWID.
+    :param rng: Источник случайности. По умолчанию модуль random.
+    :param now: Момент, от которого отсчитываются даты. По умолчанию текущее время.
     :yield: Объект Token.
     """
     from lib.orm import Token
-    now = datetime.now()
+    now = now or datetime.now()
     for _ in range(n):
         yield Token(
-            user_id=random.choice(user_ids),
-            hwid_id=random.choice(hwid_ids),
-            last_login=random_date(now - timedelta(days=365), now)
+            user_id=rng.choice(user_ids),
+            hwid_id=rng.choice(hwid_ids),
+            last_login=random_date(now - timedelta(days=365), now, rng)
         )
 
-def generate_version_data(n, mod_ids):
+def generate_version_data(n, mod_ids, rng=random):
     """
     Генерация списка объектов Version.
 
     :param n: Количество объектов для генерации.
     :param mod_ids: Список идентификаторов модификаций.
+    :param rng: Источник случайности. По умолчанию модуль random.
     :yield: Объект Version.
     """ 
     from lib.orm import Version
-    version_prefixes = ["1.0", "1.1", "2.0", "3.0", "4.0", "5.0", "6.0", "7.0", "8.0", "9.0", "10.0", "11.0", "12.0", "13.0", "14.0", "15.0"]
-    version_suffixes = ["Alpha", "Beta", "Release", "Stable", "Final"]
-    descriptions = [
-        "Первоначальный выпуск с базовой функциональностью.",
-        "Это обновление включает исправления и улучшения производительности.",
-        "Новое крупное обновление с дополнительными функциями.",
-        "Исправлены ошибки предыдущих выпусков.",
-        "Конечный стабильный выпуск.",
-        "Это обновление содержит новые возможности и улучшения.",
-        "Сборка с исправлениями уязвимостей и обновлениями.",
-        "Новое обновление с новыми функциями и улучшениями.",
-        "Это обновление включает исправления и улучшения производительности.",
-        "Новое крупное обновление с дополнительными функциями.",
-    ]
-
     for _ in range(n):
-        version_number = f"{random.choice(version_prefixes)}.{random_int(0, 9)}"
-        version_name = f"{version_number} {random.choice(version_suffixes)}"
+        version_number = f"{rng.choice(VERSION_PREFIXES)}.{random_int(0, 9, rng)}"
+        version_name = f"{version_number} {rng.choice(VERSION_SUFFIXES)}"
         
         yield Version(
-            mod_id=random.choice(mod_ids),
-            version_number=random_int(1, 200),
+            mod_id=rng.choice(mod_ids),
+            version_number=random_int(1, 200, rng),
             version_name=version_name,
-            version_description=random.choice(descriptions),
-            version_link=f"http://new-version-{random_string(10)}.com"
-        )
\ No newline at end of file
+            version_description=rng.choice(VERSION_DESCRIPTIONS),
+            version_link=f"http://new-version-{random_string(10, rng)}.com"
+        )
+
+def chunk_seed(seed, index):
+    """
+    Seed порции данных, производный от общего seed и номера порции.
+
+    :param seed: Общий seed генерации.
+    :param index: Номер порции.
+    :return: Строковый seed для random.Random (строки хешируются детерминированно).
+    """
+    return f"{seed}:{index}"
+
+def _generate_chunk(generator, count, args, seed, index, now):
+    """
+    Генерация одной порции данных в процессе пула.
+
+    :param generator: Функция generate_*_data.
+    :param count: Количество объектов в порции.
+    :param args: Позиционные аргументы генератора (например, списки идентификаторов).
+    :param seed: Общий seed генерации.
+    :param index: Номер порции.
+    :param now: Момент, от которого отсчитываются даты.
+    :return: Список объектов модели.
+    """
+    kwargs = {'rng': random.Random(chunk_seed(seed, index))}
+    if 'now' in inspect.signature(generator).parameters:
+        kwargs['now'] = now
+    return list(generator(count, *args, **kwargs))
+
+def generate_parallel(generator, n, *args, seed=0, workers=None, chunk_size=10000, now=None):
+    """
+    Параллельная генерация данных: n объектов делится на порции по chunk_size, порции генерируются
+    в пуле процессов. Каждая порция получает собственный seed, производный от seed и номера порции,
+    а границы порций не зависят от числа процессов, поэтому результат одинаков при любом workers.
+
+    :param generator: Функция generate_*_data этого модуля.
+    :param n: Количество объектов.
+    :param args: Позиционные аргументы генератора после n (например, app_ids).
+    :param seed: Общий seed генерации. По умолчанию 0.
+    :param workers: Количество процессов. По умолчанию — число процессоров; 1 — без пула процессов.
+    :param chunk_size: Количество объектов в порции. По умолчанию 10000.
+    :param now: Момент, от которого отсчитываются даты. По умолчанию фиксируется при вызове.
+    :yield: Объекты модели в порядке порций.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    now = now or datetime.now()
+    counts = [min(chunk_size, n - start) for start in range(0, n, chunk_size)]
+    tasks = [(generator, count, args, seed, index, now) for index, count in enumerate(counts)]
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield from _generate_chunk(*task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in executor.map(_generate_chunk, *zip(*tasks)):
+            yield from chunk
@@ -7,28 +7,232 @@
 Классы:
     - Database: Класс для работы с базой данных PostgreSQL.
 
+Функции:
+    - statement_name: Имя подготовленного выражения для SQL-запроса.
+    - to_positional: Замена параметров %s на позиционные $1, $2, ... для PREPARE.
+
 Методы:
     - __init__: Инициализация объекта базы данных и проверка её существования.
     - __enter__: Контекстный менеджер для открытия соединения с базой данных.
-    - __exit__: Закрытие соединения с базой данных.
+    - __exit__: Закрытие соединения, открытого в __enter__ (пул не закрывается).
     - _ensure_database: Проверка существования и создание базы данных.
     - get_connection: Контекстный менеджер для получения соединения.
     - get_cursor: Контекстный менеджер для получения курсора.
+    - transaction: Контекстный менеджер явной транзакции с вложенными точками сохранения.
+    - get_atomic_cursor: Контекстный менеджер для получения курсора, работающего в одной транзакции.
+    - get_server_cursor: Контекстный менеджер для получения именованного (серверного) курсора.
+    - execute: Выполнение запроса ORM (через PREPARE/EXECUTE в режиме подготовленных выражений).
+    - fetch_all: Выполнение запроса чтения ORM через кеш результатов.
+    - invalidate: Инвалидация кеша результатов для изменённых таблиц.
+    - cache_stats: Статистика кеша результатов.
+    - prepare_statements: Подготовка выражений на всех соединениях пула и новых соединениях.
+    - pool_stats: Статистика пула соединений.
+    - close: Закрытие пула соединений; вызывается явно по окончании работы с объектом.
     - create_db: Создание новой базы данных.
-    - drop_db: Удаление базы данных.
+    - drop_db: Удаление базы данных (в том числе шаблона).
+    - clone_db: Создание базы данных копированием шаблона (CREATE DATABASE ... TEMPLATE).
+    - create_template: Подготовка базы-шаблона из существующей базы (со схемой или со схемой и данными).
     - clone_schema: Клонирование схемы из одной базы данных в другую.
-    - create_dump: Создание дампа базы данных или таблицы.
-    - restore_dump: Восстановление данных из дампа.
-    - delete_all_data: Удаление всех данных из таблицы.
-    - replace_all_data: Замена всех данных в таблице.
+    - create_dump: Создание дампа базы данных или таблицы (параллельно в формате каталога).
+    - restore_dump: Восстановление данных из дампа (параллельно при jobs > 1).
+    - export_tables: Параллельная выгрузка таблиц через COPY из одного экспортированного снимка.
+    - delete_all_data: Очистка таблиц одним TRUNCATE ... RESTART IDENTITY CASCADE.
+    - replace_all_data: Атомарная замена всех данных в таблице (COPY в промежуточную таблицу и её подмена).
 """
 
 import psycopg2
 from psycopg2 import sql
+from psycopg2 import errors, extensions
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+import hashlib
+import re
 import subprocess
 import os
+import threading
+import time
+import uuid
+from itertools import chain
+
+from lib.copy_io import CopyReader
+from lib.pool import ConnectionPool
+
+def statement_name(query):
+    """
+    Имя подготовленного выражения для SQL-запроса (одинаковое для одинаковых запросов).
+
+    :param query: SQL-запрос.
+    :return: Имя выражения.
+    """
+    return f"orm_{hashlib.sha1(query.encode()).hexdigest()[:20]}"
+
+def to_positional(query):
+    """
+    Замена параметров %s на позиционные $1, $2, ... для PREPARE.
+
+    :param query: SQL-запрос с параметрами в стиле psycopg2.
+    :return: Пара (SQL-запрос с позиционными параметрами, количество параметров).
+    """
+    counter = 0
+
+    def replace(match):
+        nonlocal counter
+        if match.group(0) == '%%':
+            return '%'
+        counter += 1
+        return f"${counter}"
+
+    return re.sub(r'%%|%s', replace, query), counter
+
+# Сообщения --verbose pg_dump/pg_restore о начале и окончании обработки данных таблицы
+_DUMP_START_RE = re.compile(
+    r'(?:dumping contents of table|processing data for table) "(?:[^"]+\.)?([^"]+)"'
+    r'|(?:launching|processing) item \d+ TABLE DATA (?:\S+ )?(\S+)$'
+)
+_DUMP_FINISH_RE = re.compile(r'finished item \d+ TABLE DATA (?:\S+ )?(\S+)$')
+
+def _run_with_progress(cmd, env, progress=None, parallel=False):
+    """
+    Запуск pg_dump/pg_restore с разбором сообщений --verbose: время обработки данных каждой
+    таблицы считается от сообщения о начале до сообщения об окончании (в однопоточном режиме,
+    где сообщений об окончании нет, — до начала следующей таблицы или завершения процесса).
+
+    :param cmd: Команда с аргументами.
+    :param env: Переменные окружения процесса.
+    :param progress: Функция progress(таблица, секунды, готово таблиц) или None.
+    :param parallel: Процесс запущен с -j (таблицы обрабатываются одновременно).
+    :return: Словарь {таблица: секунды}.
+    """
+    started = {}
+    timings = {}
+    output = []
+
+    def finish(table):
+        timings[table] = time.perf_counter() - started.pop(table)
+        if progress is not None:
+            progress(table, timings[table], len(timings))
+
+    process = subprocess.Popen(cmd, env=env, stderr=subprocess.PIPE, text=True)
+    for line in process.stderr:
+        line = line.rstrip()
+        start_match = _DUMP_START_RE.search(line)
+        finish_match = _DUMP_FINISH_RE.search(line)
+        if start_match:
+            table = start_match.group(1) or start_match.group(2)
+            if not parallel:
+                for previous in list(started):
+                    finish(previous)
+            started[table] = time.perf_counter()
+        elif finish_match and finish_match.group(1) in started:
+            finish(finish_match.group(1))
+        elif 'error' in line.lower() or 'warning' in line.lower():
+            output.append(line)
+    returncode = process.wait()
+    for table in list(started):
+        finish(table)
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd, stderr="\n".join(output))
+    return timings
+
+# Зависимости таблицы, которые определяют способ подмены данных в Database.replace_all_data
+_REPLACE_STRATEGY_SQL = """
+    SELECT
+        EXISTS (SELECT 1 FROM pg_constraint WHERE contype = 'f' AND confrelid = c.oid AND conrelid <> c.oid),
+        EXISTS (SELECT 1 FROM pg_depend d JOIN pg_rewrite r ON d.classid = 'pg_rewrite'::regclass AND d.objid = r.oid
+                WHERE d.refobjid = c.oid AND r.ev_class <> c.oid)
+        OR EXISTS (SELECT 1 FROM pg_trigger WHERE tgrelid = c.oid AND NOT tgisinternal)
+        OR EXISTS (SELECT 1 FROM pg_attribute WHERE attrelid = c.oid AND attidentity <> '')
+        OR EXISTS (SELECT 1 FROM pg_policy WHERE polrelid = c.oid)
+        OR EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = c.oid OR inhparent = c.oid)
+        OR c.relkind <> 'r' OR c.relacl IS NOT NULL OR c.relowner <> (SELECT oid FROM pg_roles WHERE rolname = current_user)
+    FROM pg_class c WHERE c.oid = %s::regclass
+"""
+
+def _replace_strategy(cursor, table_name):
+    """
+    Способ подмены данных таблицы для Database.replace_all_data.
+
+    :param cursor: Курсор.
+    :param table_name: Имя таблицы.
+    :return: 'delete', если на таблицу ссылаются внешние ключи других таблиц; 'truncate', если у неё
+             есть зависимости, которые не переносятся переименованием (представления, триггеры,
+             столбцы IDENTITY, политики, наследование, права доступа, другой владелец); иначе 'swap'.
+    """
+    cursor.execute(_REPLACE_STRATEGY_SQL, (table_name,))
+    referenced, pinned = cursor.fetchone()
+    if referenced:
+        return 'delete'
+    return 'truncate' if pinned else 'swap'
+
+def _swap_table(cursor, table_name, staging_name):
+    """
+    Подмена таблицы заполненной промежуточной таблицей (LIKE ... INCLUDING ALL) в текущей транзакции:
+    владение счётчиками SERIAL передаётся промежуточной таблице, прежняя таблица удаляется,
+    промежуточная переименовывается, её индексам возвращаются прежние имена, а внешние ключи
+    прежней таблицы (LIKE их не копирует) создаются заново.
+
+    :param cursor: Курсор внутри транзакции.
+    :param table_name: Имя таблицы.
+    :param staging_name: Имя промежуточной таблицы.
+    """
+    table, staging = sql.Identifier(table_name), sql.Identifier(staging_name)
+    cursor.execute(sql.SQL("LOCK TABLE {} IN ACCESS EXCLUSIVE MODE").format(table))
+
+    # Счётчики SERIAL принадлежат столбцам прежней таблицы и удалились бы вместе с ней
+    cursor.execute(
+        """
+        SELECT s.oid::regclass::text, a.attname FROM pg_depend d
+        JOIN pg_class s ON s.oid = d.objid AND s.relkind = 'S'
+        JOIN pg_attribute a ON a.attrelid = d.refobjid AND a.attnum = d.refobjsubid
+        WHERE d.refobjid = %s::regclass AND d.deptype = 'a'
+        """,
+        (table_name,),
+    )
+    for sequence, column in cursor.fetchall():
+        cursor.execute(sql.SQL("ALTER SEQUENCE {} OWNED BY {}.{}").format(
+            sql.SQL(sequence), staging, sql.Identifier(column)))
+
+    # Определения индексов без имени индекса и таблицы — для сопоставления индексов двух таблиц
+    indexes_sql = "SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid) FROM pg_index WHERE indrelid = %s::regclass"
+    normalize = lambda definition: re.sub(r'INDEX \S+ ON \S+', 'INDEX ON', definition)
+    cursor.execute(indexes_sql, (table_name,))
+    old_indexes = {}
+    for name, definition in cursor.fetchall():
+        old_indexes.setdefault(normalize(definition), []).append(name)
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        (table_name,),
+    )
+    foreign_keys = cursor.fetchall()
+
+    cursor.execute(sql.SQL("DROP TABLE {}").format(table))
+    cursor.execute(sql.SQL("ALTER TABLE {} RENAME TO {}").format(staging, table))
+    cursor.execute(indexes_sql, (table_name,))
+    for name, definition in cursor.fetchall():
+        old_names = old_indexes.get(normalize(definition))
+        if old_names:
+            # Переименование индекса ограничения (PRIMARY KEY, UNIQUE) переименовывает и ограничение
+            cursor.execute(sql.SQL("ALTER INDEX {} RENAME TO {}").format(sql.SQL(name), sql.Identifier(old_names.pop(0))))
+    for name, definition in foreign_keys:
+        cursor.execute(sql.SQL("ALTER TABLE {} ADD CONSTRAINT {} {}").format(table, sql.Identifier(name), sql.SQL(definition)))
+
+class _OrmConnection(extensions.connection):
+    """
+    Соединение psycopg2, хранящее имена подготовленных на нём выражений.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+
+class _TransactionState(threading.local):
+    """
+    Состояние транзакции текущего потока: соединение транзакции, глубина вложенности (SAVEPOINT)
+    и таблицы, изменённые в транзакции (для инвалидации кеша после её завершения).
+    """
+    conn = None
+    depth = 0
+    written = None
 
 class Database:
     """
@@ -40,24 +244,42 @@ class Database:
     - password (str): Пароль пользователя базы данных.
     - host (str): Хост базы данных. По умолчанию 'localhost'.
     - port (int): Порт базы данных. По умолчанию 5432.
+    - pool (ConnectionPool | None): Пул постоянных соединений, если включён режим пула.
+    - cache (QueryCache | None): Кеш результатов запросов чтения ORM, если он включён.
+    - schema_fingerprint (str | None): Отпечаток схемы, созданной последним Model.create_all.
 
     Методы:
     - __init__: Инициализация объекта базы данных и проверка её существования.
     - __enter__: Контекстный менеджер для открытия соединения с базой данных.
-    - __exit__: Закрытие соединения с базой данных.
+    - __exit__: Закрытие соединения, открытого в __enter__ (пул не закрывается).
     - _ensure_database: Проверка существования и создание базы данных.
     - get_connection: Контекстный менеджер для получения соединения.
     - get_cursor: Контекстный менеджер для получения курсора.
+    - transaction: Контекстный менеджер явной транзакции с вложенными точками сохранения.
+    - get_atomic_cursor: Контекстный менеджер для получения курсора, работающего в одной транзакции.
+    - get_server_cursor: Контекстный менеджер для получения именованного (серверного) курсора.
+    - execute: Выполнение запроса ORM (через PREPARE/EXECUTE в режиме подготовленных выражений).
+    - fetch_all: Выполнение запроса чтения ORM через кеш результатов.
+    - invalidate: Инвалидация кеша результатов для изменённых таблиц.
+    - cache_stats: Статистика кеша результатов.
+    - prepare_statements: Подготовка выражений на всех соединениях пула и новых соединениях.
+    - pool_stats: Статистика пула соединений.
+    - close: Закрытие пула соединений; вызывается явно по окончании работы с объектом.
     - create_db: Создание новой базы данных.
-    - drop_db: Удаление базы данных.
+    - drop_db: Удаление базы данных (в том числе шаблона).
+    - clone_db: Создание базы данных копированием шаблона (CREATE DATABASE ... TEMPLATE).
+    - create_template: Подготовка базы-шаблона из существующей базы (со схемой или со схемой и данными).
     - clone_schema: Клонирование схемы из одной базы данных в другую.
-    - create_dump: Создание дампа базы данных или таблицы.
-    - restore_dump: Восстановление данных из дампа.
-    - delete_all_data: Удаление всех данных из таблицы.
-    - replace_all_data: Замена всех данных в таблице.
+    - create_dump: Создание дампа базы данных или таблицы (параллельно в формате каталога).
+    - restore_dump: Восстановление данных из дампа (параллельно при jobs > 1).
+    - export_tables: Параллельная выгрузка таблиц через COPY из одного экспортированного снимка.
+    - delete_all_data: Очистка таблиц одним TRUNCATE ... RESTART IDENTITY CASCADE.
+    - replace_all_data: Атомарная замена всех данных в таблице (COPY в промежуточную таблицу и её подмена).
     """
 
-    def __init__(self, dbname, user='postgres', password='secret6g2h2', host='localhost', port=5432):
+    def __init__(self, dbname, user='postgres', password='secret6g2h2', host='localhost', port=5432,
+                 pooled=False, pool_min_size=1, pool_max_size=10, pool_max_idle=300.0,
+                 pool_health_check_interval=30.0, pool_timeout=30.0, use_prepared=False, cache=None):
         """
         Инициализация объекта базы данных.
 
@@ -66,31 +288,73 @@ class Database:
         :param password: Пароль пользователя. По умолчанию 'secret6g2h2'.
         :param host: Хост базы данных. По умолчанию 'localhost'.
         :param port: Порт базы данных. По умолчанию 5432.
+        :param pooled: Использовать пул постоянных соединений вместо нового соединения на каждый запрос.
+        :param pool_min_size: Минимальный размер пула. По умолчанию 1.
+        :param pool_max_size: Максимальный размер пула. По умолчанию 10.
+        :param pool_max_idle: Время простоя соединения до вытеснения из пула (с). По умолчанию 300.
+        :param pool_health_check_interval: Время простоя, после которого соединение проверяется перед выдачей (с). По умолчанию 30.
+        :param pool_timeout: Время ожидания свободного соединения (с). По умолчанию 30.
+        :param use_prepared: Выполнять горячие запросы ORM через серверные подготовленные выражения
+            (PREPARE/EXECUTE). Выражения живут в пределах соединения, поэтому выигрыш даёт в режиме
+            пула, внутри transaction() или блока with.
+        :param cache: Кеш результатов запросов чтения ORM (QueryCache). По умолчанию кеш отключён.
         """
         self.dbname = dbname
         self.user = user
         self.password = password
         self.host = host
         self.port = port
+        self.pool = None
+        self._local = _TransactionState()
+        self.use_prepared = use_prepared
+        self._prewarm_queries = {}  # имя выражения -> SQL-запрос, готовятся на каждом новом соединении
+        self.cache = cache
+        self.schema_fingerprint = None  # отпечаток DDL последнего Model.create_all
 
         # Проверка существования и создание базы данных
         self._ensure_database()
 
+        if pooled:
+            self.pool = ConnectionPool(
+                self._connect,
+                min_size=pool_min_size,
+                max_size=pool_max_size,
+                max_idle=pool_max_idle,
+                health_check_interval=pool_health_check_interval,
+                timeout=pool_timeout,
+            )
+
     def __enter__(self):
         """
-        Открытие соединения с базой данных.
+        Открытие соединения с базой данных. Транзакции (transaction), начатые в этом потоке
+        внутри блока with, используют это соединение.
 
         :return: self
         """
-        self.conn = psycopg2.connect(dbname=self.dbname, user=self.user, password=self.password, host=self.host, port=self.port)
-        self.conn.autocommit = True
+        self.conn = self._connect()
+        self._conn_thread = threading.get_ident()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
         """
-        Закрытие соединения с базой данных.
+        Закрытие соединения, открытого в __enter__. Пул соединений остаётся рабочим
+        и закрывается только методом close.
         """
         self.conn.close()
+        self.conn = None
+
+    def _connect(self):
+        """
+        Открытие нового соединения с базой данных в режиме autocommit.
+
+        :return: Соединение с базой данных.
+        """
+        conn = psycopg2.connect(dbname=self.dbname, user=self.user, password=self.password, host=self.host, port=self.port,
+                                connection_factory=_OrmConnection)
+        conn.autocommit = True
+        if self._prewarm_queries:
+            self._prepare_on(conn)
+        return conn
 
     def _ensure_database(self):
         """
@@ -109,26 +373,69 @@ class Database:
         conn.close()
 
     @contextmanager
-    def get_connection(self):
+    def _borrow_connection(self):
         """
-        Контекстный менеджер для получения соединения с базой данных.
+        Получение отдельного соединения: из пула (в режиме пула) или новое.
 
         :yield: Соединение с базой данных.
         """
-        conn = psycopg2.connect(dbname=self.dbname, user=self.user, password=self.password, host=self.host, port=self.port)
-        conn.autocommit = True
+        if self.pool is None:
+            conn = self._connect()
+            try:
+                yield conn
+            finally:
+                conn.close()
+            return
+
+        conn = self.pool.acquire()
+        broken = False
         try:
             yield conn
+        except (psycopg2.InterfaceError, psycopg2.OperationalError):
+            # Соединение могло быть разорвано — не возвращаем его в пул
+            broken = True
+            raise
         finally:
-            conn.close()
+            self.pool.release(conn, discard=broken)
+
+    @property
+    def in_transaction(self):
+        """
+        Признак того, что текущий поток находится внутри блока transaction().
+
+        :return: True, если открыта транзакция.
+        """
+        return getattr(self._local, 'conn', None) is not None
+
+    @contextmanager
+    def get_connection(self):
+        """
+        Контекстный менеджер для получения соединения с базой данных.
+        Внутри transaction() возвращается соединение транзакции, в режиме пула соединение
+        берётся из пула и возвращается в него после использования.
+
+        :yield: Соединение с базой данных.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+        with self._borrow_connection() as conn:
+            yield conn
 
     @contextmanager
     def get_cursor(self):
         """
         Контекстный менеджер для получения курсора.
+        Внутри transaction() курсор работает в общей транзакции и не фиксирует изменения сам.
 
         :yield: Курсор для выполнения SQL-запросов.
         """
+        if self.in_transaction:
+            with self._local.conn.cursor() as cursor:
+                yield cursor
+            return
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
             try:
@@ -140,6 +447,256 @@ class Database:
             finally:
                 cursor.close()
 
+    @contextmanager
+    def transaction(self):
+        """
+        Контекстный менеджер явной транзакции. Все вызовы get_connection/get_cursor (и, следовательно,
+        все методы Model) в этом потоке внутри блока используют одно соединение, изменения фиксируются
+        одним COMMIT при выходе или откатываются при исключении. Вложенные блоки создают SAVEPOINT
+        и при ошибке откатываются только до него.
+
+        :yield: Соединение транзакции.
+        """
+        state = self._local
+        if state.conn is not None:
+            state.depth += 1
+            savepoint = f"orm_savepoint_{state.depth}"
+            try:
+                with state.conn.cursor() as cur:
+                    cur.execute(f"SAVEPOINT {savepoint}")
+                try:
+                    yield state.conn
+                except BaseException:
+                    with state.conn.cursor() as cur:
+                        cur.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                    raise
+                with state.conn.cursor() as cur:
+                    cur.execute(f"RELEASE SAVEPOINT {savepoint}")
+            finally:
+                state.depth -= 1
+            return
+
+        held = getattr(self, 'conn', None)
+        if held is not None and not held.closed and getattr(self, '_conn_thread', None) == threading.get_ident():
+            # Соединение, открытое в __enter__, используется для транзакций этого потока
+            source = nullcontext(held)
+        else:
+            source = self._borrow_connection()
+
+        with source as conn:
+            conn.autocommit = False
+            state.conn = conn
+            state.depth = 0
+            state.written = set()
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                written, state.written = state.written, None
+                state.conn = None
+                conn.autocommit = True
+                # Другие потоки могли закешировать старые данные до COMMIT — инвалидируем повторно
+                self.invalidate(written)
+
+    @contextmanager
+    def get_atomic_cursor(self):
+        """
+        Контекстный менеджер для получения курсора, все запросы которого выполняются
+        в одной транзакции: изменения фиксируются одним COMMIT в конце блока или откатываются при ошибке.
+        Внутри transaction() блок становится вложенной транзакцией (SAVEPOINT).
+
+        :yield: Курсор для выполнения SQL-запросов.
+        """
+        with self.transaction() as conn:
+            with conn.cursor() as cursor:
+                yield cursor
+
+    @contextmanager
+    def get_server_cursor(self, name=None, chunk_size=2000):
+        """
+        Контекстный менеджер для получения именованного (серверного) курсора.
+        Результат запроса остаётся на сервере и передаётся клиенту порциями по chunk_size строк,
+        поэтому потребление памяти не зависит от размера выборки. Внутри transaction() курсор работает
+        в её транзакции. Иначе он открывается на отдельном соединении в собственной транзакции, которая
+        завершается при выходе из блока: запросы, выполненные между порциями (например, save в теле
+        цикла по iter_all), в неё не попадают и фиксируются как обычно.
+
+        :param name: Имя курсора на сервере. По умолчанию генерируется уникальное.
+        :param chunk_size: Количество строк, получаемых с сервера за один сетевой запрос.
+        :yield: Именованный курсор.
+        """
+        name = name or f"orm_cursor_{uuid.uuid4().hex}"
+        if self.in_transaction:
+            conn = self._local.conn
+            cursor = conn.cursor(name=name)
+            cursor.itersize = chunk_size
+            try:
+                yield cursor
+            finally:
+                if not cursor.closed and conn.info.transaction_status == extensions.TRANSACTION_STATUS_INTRANS:
+                    cursor.close()
+            return
+
+        # Собственная транзакция на отдельном соединении; состояние transaction() потока не затрагивается
+        with self._borrow_connection() as conn:
+            conn.autocommit = False
+            cursor = conn.cursor(name=name)
+            cursor.itersize = chunk_size
+            try:
+                yield cursor
+                cursor.close()
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                conn.autocommit = True
+
+    def execute(self, cur, query, params=None):
+        """
+        Выполнение запроса ORM. В режиме подготовленных выражений запрос один раз готовится
+        на соединении курсора (PREPARE), а затем выполняется через EXECUTE.
+
+        :param cur: Курсор (не именованный).
+        :param query: SQL-запрос с параметрами %s.
+        :param params: Параметры запроса.
+        """
+        conn = cur.connection
+        prepared = getattr(conn, 'prepared_statements', None)
+        if not self.use_prepared or prepared is None:
+            cur.execute(query, params)
+            return
+        name = statement_name(query)
+        if name not in prepared:
+            positional, _ = to_positional(query)
+            cur.execute(f"PREPARE {name} AS {positional}")
+            prepared.add(name)
+        if params:
+            cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cur.execute(f"EXECUTE {name}")
+
+    def fetch_all(self, table, query, params=None, prepared=True):
+        """
+        Выполнение запроса чтения ORM. Если кеш включён и таблица кешируется, результат берётся
+        из кеша или сохраняется в нём. Внутри transaction() кеш не используется: транзакция
+        должна видеть собственные незафиксированные изменения.
+
+        :param table: Таблица, из которой читает запрос (или набор таблиц для запросов с JOIN).
+        :param query: SQL-запрос с параметрами %s.
+        :param params: Параметры запроса.
+        :param prepared: Выполнять запрос через подготовленное выражение в режиме use_prepared.
+            Отключается для однократных запросов (например, QuerySet), чтобы не плодить выражения.
+        :return: Список строк результата.
+        """
+        run = self.execute if prepared else (lambda cur, query, params: cur.execute(query, params))
+        cache = self.cache
+        if cache is None or self.in_transaction or not cache.caches(table):
+            with self.get_cursor() as cur:
+                run(cur, query, params)
+                return cur.fetchall()
+
+        found, rows = cache.get(query, params)
+        if found:
+            return rows
+        generation = cache.generation(table)
+        with self.get_cursor() as cur:
+            run(cur, query, params)
+            rows = cur.fetchall()
+        cache.set(table, query, params, rows, generation)
+        return rows
+
+    def invalidate(self, tables=None):
+        """
+        Инвалидация кеша результатов после записи в таблицы. Внутри transaction() таблицы
+        запоминаются и инвалидируются ещё раз после завершения транзакции.
+
+        :param tables: Имя таблицы или набор имён. None — очистка всего кеша.
+        """
+        if self.cache is None:
+            return
+        if isinstance(tables, str):
+            tables = (tables,)
+        written = getattr(self._local, 'written', None)
+        if written is not None:
+            if tables is None:
+                written.add(None)
+            else:
+                written.update(tables)
+        if tables is None or None in tables:
+            self.cache.clear()
+            return
+        for table in tables:
+            self.cache.invalidate(table)
+
+    def cache_stats(self):
+        """
+        Статистика кеша результатов.
+
+        :return: Словарь со счётчиками кеша или None, если кеш не используется.
+        """
+        if self.cache is None:
+            return None
+        return self.cache.stats()
+
+    def _prepare_on(self, conn):
+        """
+        Подготовка всех зарегистрированных выражений на соединении (вне транзакции).
+        Выражения, которые не удалось подготовить (например, таблица ещё не создана),
+        пропускаются и будут подготовлены при первом использовании.
+
+        :param conn: Соединение в режиме autocommit.
+        """
+        prepared = conn.prepared_statements
+        with conn.cursor() as cur:
+            for name, query in self._prewarm_queries.items():
+                if name in prepared:
+                    continue
+                try:
+                    cur.execute(f"PREPARE {name} AS {to_positional(query)[0]}")
+                except errors.DuplicatePreparedStatement:
+                    pass
+                except psycopg2.Error:
+                    continue
+                prepared.add(name)
+
+    def prepare_statements(self, queries):
+        """
+        Регистрация и подготовка выражений на всех свободных соединениях пула, на соединении блока with
+        и на всех соединениях, которые будут открыты позже.
+
+        :param queries: Итерируемый набор SQL-запросов с параметрами %s.
+        """
+        if not self.use_prepared:
+            return
+        for query in queries:
+            self._prewarm_queries[statement_name(query)] = query
+        if self.pool is not None:
+            self.pool.for_each_idle(self._prepare_on)
+        held = getattr(self, 'conn', None)
+        if held is not None and not held.closed and not self.in_transaction:
+            self._prepare_on(held)
+
+    def pool_stats(self):
+        """
+        Статистика пула соединений.
+
+        :return: Словарь со счётчиками пула или None, если пул не используется.
+        """
+        if self.pool is None:
+            return None
+        return self.pool.stats()
+
+    def close(self):
+        """
+        Закрытие пула соединений (если он используется).
+        """
+        if self.pool is not None:
+            self.pool.close()
+
     def create_db(self, db_name):
         """
         Создание новой базы данных с заданным именем.
@@ -159,13 +716,18 @@ class Database:
 
     def drop_db(self, db_name):
         """
-        Удаление базы данных с заданным именем.
+        Удаление базы данных с заданным именем. Шаблон (create_template) перед удалением
+        снова делается обычной базой.
 
         :param db_name: Имя базы данных для удаления.
         """
         with psycopg2.connect(dbname='postgres', user=self.user, password=self.password, host=self.host, port=self.port) as conn:
             conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
             with conn.cursor() as cursor:
+                cursor.execute("SELECT datistemplate FROM pg_database WHERE datname = %s", [db_name])
+                row = cursor.fetchone()
+                if row and row[0]:
+                    cursor.execute(sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE false ALLOW_CONNECTIONS true").format(sql.Identifier(db_name)))
                 cursor.execute(
                     sql.SQL("SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE datname=%s AND pid <> pg_backend_pid()"),
                     [db_name]
@@ -182,6 +744,55 @@ class Database:
         finally:
             conn.close()
 
+    def clone_db(self, template_db, db_name):
+        """
+        Создание базы данных копированием шаблона (CREATE DATABASE ... TEMPLATE). Копия
+        делается на уровне файлов кластера и полностью повторяет шаблон: ключи, ограничения,
+        значения по умолчанию, последовательности, индексы и данные. К шаблону в этот момент
+        не должно быть подключений.
+
+        :param template_db: Имя базы-шаблона.
+        :param db_name: Имя новой базы данных.
+        """
+        conn = psycopg2.connect(dbname='postgres', user=self.user, password=self.password, host=self.host, port=self.port)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(sql.Identifier(db_name), sql.Identifier(template_db)))
+        finally:
+            conn.close()
+
+    def create_template(self, template_db, source_db, with_data=True):
+        """
+        Подготовка базы-шаблона из существующей базы данных. Без данных таблицы шаблона очищаются
+        одним TRUNCATE ... RESTART IDENTITY, поэтому схема сохраняется полностью. Шаблон помечается
+        IS_TEMPLATE и закрывается для подключений, чтобы копирование из него не блокировалось.
+
+        :param template_db: Имя создаваемой базы-шаблона (существующая пересоздаётся).
+        :param source_db: Имя исходной базы данных (к ней не должно быть подключений).
+        :param with_data: Копировать данные вместе со схемой. По умолчанию True.
+        """
+        self.drop_db(template_db)
+        self.clone_db(source_db, template_db)
+        if not with_data:
+            conn = psycopg2.connect(dbname=template_db, user=self.user, password=self.password, host=self.host, port=self.port)
+            conn.autocommit = True
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT quote_ident(tablename) FROM pg_tables WHERE schemaname = 'public'")
+                    tables = [row[0] for row in cursor.fetchall()]
+                    if tables:
+                        cursor.execute(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY")
+            finally:
+                conn.close()
+        conn = psycopg2.connect(dbname='postgres', user=self.user, password=self.password, host=self.host, port=self.port)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE true ALLOW_CONNECTIONS false").format(sql.Identifier(template_db)))
+        finally:
+            conn.close()
+
     def clone_schema(self, source_db, target_db):
         """
         Клонирование схемы из исходной базы данных в целевую базу данных.
@@ -212,12 +823,18 @@ class Database:
         source_conn.close()
         target_conn.close()
 
-    def create_dump(self, output_file, table_name=None):
+    def create_dump(self, output_file, table_name=None, jobs=1, progress=None):
         """
         Создание дампа базы данных или заданной таблицы с использованием pg_dump.
+        При jobs > 1 дамп создаётся в формате каталога (-F d), и данные таблиц выгружаются
+        параллельно jobs соединениями из одного снимка данных.
 
-        :param output_file: Имя файла для сохранения дампа.
+        :param output_file: Имя файла (при jobs > 1 — каталога) для сохранения дампа.
         :param table_name: Имя таблицы для создания дампа (если None, создается дамп всей базы данных).
+        :param jobs: Количество параллельных процессов выгрузки. По умолчанию 1.
+        :param progress: Функция progress(таблица, секунды, готово таблиц), вызываемая по окончании
+                         выгрузки каждой таблицы.
+        :return: Словарь {таблица: время выгрузки данных в секундах}.
         """
         env = os.environ.copy()
         env['PGPASSWORD'] = self.password
@@ -227,21 +844,30 @@ class Database:
             '-h', self.host,
             '-p', str(self.port),
             '-U', self.user,
-            '-F', 'c',
+            '-F', 'd' if jobs > 1 else 'c',
             '-f', output_file,
-            self.dbname
+            '--verbose',
         ]
+        if jobs > 1:
+            cmd += ['-j', str(jobs)]
         if table_name:
             cmd += ['-t', table_name]
+        cmd += [self.dbname]
 
-        subprocess.run(cmd, env=env, check=True)
+        return _run_with_progress(cmd, env, progress, parallel=jobs > 1)
 
-    def restore_dump(self, input_file, table_name=None):
+    def restore_dump(self, input_file, table_name=None, jobs=1, progress=None):
         """
         Восстановление данных в базе данных из дампа с использованием pg_restore.
+        При jobs > 1 данные таблиц и индексы восстанавливаются параллельно (для дампов
+        в формате каталога или custom).
 
-        :param input_file: Имя файла дампа.
+        :param input_file: Имя файла или каталога дампа.
         :param table_name: Имя таблицы для восстановления (если None, восстанавливается вся база данных).
+        :param jobs: Количество параллельных процессов восстановления. По умолчанию 1.
+        :param progress: Функция progress(таблица, секунды, готово таблиц), вызываемая по окончании
+                         загрузки каждой таблицы.
+        :return: Словарь {таблица: время загрузки данных в секундах}.
         """
         env = os.environ.copy()
         env['PGPASSWORD'] = self.password
@@ -253,48 +879,173 @@ class Database:
             '-U', self.user,
             '-d', self.dbname,
             '-c',  # Очищает базу данных перед восстановлением
+            '--if-exists',
+            '--verbose',
         ]
+        if jobs > 1:
+            cmd += ['-j', str(jobs)]
         if table_name:
             cmd += ['-t', table_name]
 
         cmd += [input_file]
 
-        subprocess.run(cmd, env=env, check=True)
+        return _run_with_progress(cmd, env, progress, parallel=jobs > 1)
 
-    def delete_all_data(self):
+    def export_tables(self, directory, tables=None, workers=4, progress=None):
         """
-        Удаляет все данные из всех таблиц базы данных.
+        Параллельная выгрузка таблиц внутри процесса: каждая таблица выгружается командой
+        COPY ... TO STDOUT в отдельный файл <таблица>.copy (текстовый формат COPY) своим
+        соединением. Все соединения работают в транзакциях REPEATABLE READ с одним снимком,
+        экспортированным pg_export_snapshot(), поэтому видят одинаковые согласованные данные.
+
+        :param directory: Каталог для файлов выгрузки (создаётся при отсутствии).
+        :param tables: Имена таблиц. По умолчанию — все таблицы текущей схемы.
+        :param workers: Количество параллельных соединений. По умолчанию 4.
+        :param progress: Функция progress(таблица, секунды, готово таблиц), вызываемая по окончании
+                         выгрузки каждой таблицы.
+        :return: Словарь {таблица: время выгрузки в секундах}.
         """
-        with self.get_cursor() as cursor:
-            cursor.execute("""
-                DO $$ DECLARE
-                    r RECORD;
-                BEGIN
-                    FOR r IN (SELECT tablename FROM pg_tables WHERE schemaname = current_schema()) LOOP
-                        EXECUTE 'DELETE FROM ' || quote_ident(r.tablename);
-                    END LOOP;
-                END $$;
-            """)
+        os.makedirs(directory, exist_ok=True)
+        # Транзакция, экспортировавшая снимок, должна оставаться открытой, пока его используют
+        coordinator = self._connect()
+        coordinator.autocommit = False
+        coordinator.set_session(isolation_level='REPEATABLE READ', readonly=True)
+        try:
+            with coordinator.cursor() as cursor:
+                cursor.execute("SELECT pg_export_snapshot()")
+                snapshot = cursor.fetchone()[0]
+                # Крупные таблицы — первыми, чтобы выгрузка не упиралась в одну последнюю таблицу
+                cursor.execute(
+                    "SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+                    "WHERE n.nspname = current_schema() AND c.relkind = 'r' ORDER BY c.relpages DESC, c.relname"
+                )
+                names = [row[0] for row in cursor.fetchall()]
+            if tables is not None:
+                names = [name for name in names if name in set(tables)]
+                missing = set(tables) - set(names)
+                if missing:
+                    raise ValueError(f"Unknown tables: {', '.join(sorted(missing))}")
+
+            def export(table):
+                conn = self._connect()
+                conn.autocommit = False
+                conn.set_session(isolation_level='REPEATABLE READ', readonly=True)
+                start_time = time.perf_counter()
+                try:
+                    with conn.cursor() as cursor, open(os.path.join(directory, f"{table}.copy"), 'w', encoding='utf-8') as file:
+                        cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot,))
+                        cursor.copy_expert(sql.SQL("COPY {} TO STDOUT").format(sql.Identifier(table)).as_string(cursor), file)
+                    conn.rollback()
+                finally:
+                    conn.close()
+                return time.perf_counter() - start_time
+
+            timings = {}
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(export, table): table for table in names}
+                for future in as_completed(futures):
+                    table = futures[future]
+                    timings[table] = future.result()
+                    if progress is not None:
+                        progress(table, timings[table], len(timings))
+            return timings
+        finally:
+            coordinator.rollback()
+            coordinator.close()
 
-    def delete_all_data(self, table_name):
+    def delete_all_data(self, tables=None):
         """
-        Удаление всех данных из указанной таблицы.
+        Удаление всех данных из таблиц одним запросом TRUNCATE ... RESTART IDENTITY CASCADE:
+        таблицы очищаются без построчного удаления (не остаётся мёртвых строк), счётчики SERIAL
+        сбрасываются, а таблицы, ссылающиеся на очищаемые, очищаются вместе с ними.
 
-        :param table_name: Имя таблицы.
+        :param tables: Имя таблицы или список имён. По умолчанию — все таблицы текущей схемы.
         """
+        if isinstance(tables, str):
+            tables = [tables]
         with self.get_cursor() as cursor:
-            cursor.execute(f"DELETE FROM {table_name}")
+            if tables is None:
+                cursor.execute("SELECT tablename FROM pg_tables WHERE schemaname = current_schema()")
+                tables = [row[0] for row in cursor.fetchall()]
+            tables = list(tables)
+            if tables:
+                cursor.execute(sql.SQL("TRUNCATE {} RESTART IDENTITY CASCADE").format(
+                    sql.SQL(', ').join(map(sql.Identifier, tables))
+                ))
+        self.invalidate()
 
-    def replace_all_data(self, table_name, data):
+    def replace_all_data(self, table_name, data, columns=None):
         """
-        Замена всех данных в указанной таблице.
+        Атомарная замена всех данных в указанной таблице. Новые строки потоком загружаются командой
+        COPY в промежуточную таблицу, после чего она подменяет данные таблицы в той же транзакции.
+        Частично заполненная таблица не видна никогда; при ошибке таблица не меняется.
+
+        Способ подмены выбирается по зависимостям таблицы (см. _replace_strategy):
+        - 'swap': промежуточная таблица создаётся как обычная (LIKE ... INCLUDING ALL), после загрузки
+          таблица блокируется (ACCESS EXCLUSIVE), удаляется, а промежуточная переименовывается на её
+          место. Строки пишутся один раз, мёртвых версий строк не остаётся; внешние ключи таблицы,
+          владение счётчиками SERIAL и имена индексов переносятся. Блокировка держится только
+          на время переименования, но до фиксации читатели таблицы ждут.
+        - 'truncate': если на таблицу опираются представления или у неё есть триггеры, права доступа
+          и т.п., которые не переносятся переименованием — временная промежуточная таблица,
+          затем TRUNCATE и INSERT ... SELECT. Мёртвых версий строк тоже нет, но строки пишутся дважды.
+        - 'delete': если на таблицу ссылаются внешние ключи других таблиц, TRUNCATE и удаление таблицы
+          невозможны без CASCADE, поэтому старые строки удаляются DELETE. Читатели не блокируются,
+          но прежние строки остаются мёртвыми версиями до VACUUM.
 
         :param table_name: Имя таблицы.
-        :param data: Новые данные для вставки.
+        :param data: Итерируемый набор новых строк: словари {столбец: значение} или кортежи
+                     значений в порядке columns. Пустой набор очищает таблицу.
+        :param columns: Столбцы для загрузки. По умолчанию — ключи первого словаря.
+        :return: Словарь со статистикой: rows, seconds, rows_per_sec и method (способ подмены).
         """
-        with self.get_cursor() as cursor:
-            cursor.execute(f"DELETE FROM {table_name}")
-            for row in data:
-                columns = ', '.join(row.keys())
-                values = ', '.join([f"'{str(v)}'" for v in row.values()])
-                cursor.execute(f"INSERT INTO {table_name} ({columns}) VALUES ({values})")
+        rows = iter(data)
+        first = next(rows, None)
+        if first is None and columns is None:
+            columns = []  # новых строк нет — таблица просто очищается
+        elif columns is None:
+            if not isinstance(first, dict):
+                raise ValueError("columns must be given when data rows are not dicts")
+            columns = list(first)
+        columns = list(columns)
+        if first is not None:
+            rows = chain([first], rows)
+        if isinstance(first, dict):
+            rows = (tuple(row[column] for column in columns) for row in rows)
+
+        table = sql.Identifier(table_name)
+        # Уникальное имя: несколько замен могут выполняться в одной внешней транзакции
+        staging_name = f"{table_name[:40]}_staging_{uuid.uuid4().hex[:12]}"
+        staging = sql.Identifier(staging_name)
+        column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+        reader = CopyReader(rows)
+
+        start_time = time.perf_counter()
+        with self.transaction():
+            with self.get_cursor() as cursor:
+                method = _replace_strategy(cursor, table_name)
+                if method == 'swap':
+                    cursor.execute(sql.SQL("CREATE TABLE {} (LIKE {} INCLUDING ALL)").format(staging, table))
+                else:
+                    cursor.execute(sql.SQL("CREATE TEMP TABLE {} (LIKE {} INCLUDING DEFAULTS)").format(staging, table))
+                if columns:
+                    cursor.copy_expert(
+                        sql.SQL("COPY {} ({}) FROM STDIN").format(staging, column_list).as_string(cursor), reader
+                    )
+                if method == 'swap':
+                    cursor.execute(sql.SQL("ANALYZE {}").format(staging))
+                    _swap_table(cursor, table_name, staging_name)
+                else:
+                    clear = "TRUNCATE {}" if method == 'truncate' else "DELETE FROM {}"
+                    cursor.execute(sql.SQL(clear).format(table))
+                    if columns:
+                        cursor.execute(sql.SQL("INSERT INTO {0} ({1}) SELECT {1} FROM {2}").format(table, column_list, staging))
+                    cursor.execute(sql.SQL("DROP TABLE {}").format(staging))
+            self.invalidate(table_name)
+        seconds = time.perf_counter() - start_time
+        return {
+            'rows': reader.rows,
+            'seconds': seconds,
+            'rows_per_sec': reader.rows / seconds if seconds else 0.0,
+            'method': method,
+        }
@@ -8,6 +8,10 @@
     - FieldType: Перечисление типов данных для полей.
     - OperationType: Перечисление возможных типов операций (логин, логаут и т.д.)
     - Field: Класс для определения полей модели.
+    - Index: Описание индекса таблицы (простого, составного, уникального или частичного).
+    - Relation: Связь по внешнему ключу и доступ к связанному объекту.
+    - ManyToManyManager: Операции со связью many-to-many через промежуточную таблицу.
+    - ModelPlan: Неизменяемый план модели (поля, первичный ключ, заранее собранные SQL-запросы).
     - ModelMeta: Метакласс для динамического создания моделей.
     - Model: Базовый класс модели с методами для работы с БД (CRUD операции).
 
@@ -18,9 +22,15 @@
     - Purchase, Checks, HWID, Operation, Subscription, Token, Version: Другие модели для различных данных.
 """
 
+import hashlib
 import re
 from enum import Enum
 
+from psycopg2.extras import execute_values
+
+from lib.cache import written_tables
+from lib.queryset import QuerySet
+
 class FieldType(Enum):
     """
     Перечисление типов данных для полей модели.
@@ -53,8 +63,11 @@ class Field:
         - min_value: Минимальное значение для числовых полей.
         - max_value: Максимальное значение для числовых полей.
         - many_to_many: Является ли поле отношением many-to-many.
+        - index: Создавать ли индекс по полю.
+        - unique: Создавать ли уникальный индекс по полю.
     """
-    def __init__(self, type_, primary_key=False, foreign_key=None, max_length=None, min_value=None, max_value=None, many_to_many=False):
+    def __init__(self, type_, primary_key=False, foreign_key=None, max_length=None, min_value=None, max_value=None, many_to_many=False,
+                 index=False, unique=False):
         if not isinstance(type_, FieldType):
             raise ValueError("Field type must be an instance of FieldType Enum")
         self.type = type_.value
@@ -64,76 +77,811 @@ class Field:
         self.min_value = min_value
         self.max_value = max_value
         self.many_to_many = many_to_many
+        self.index = index
+        self.unique = unique
+
+class Index:
+    """
+    Класс для описания индекса таблицы.
+    В docstring модели объявляется строкой вида Index(col1, col2, unique=True, where='условие').
+
+    Атрибуты:
+        - columns: Кортеж столбцов индекса.
+        - unique: Является ли индекс уникальным.
+        - where: Условие частичного индекса (или None).
+    """
+    def __init__(self, columns, unique=False, where=None):
+        if not columns:
+            raise ValueError("Index must have at least one column")
+        self.columns = tuple(columns)
+        self.unique = unique
+        self.where = where
+
+    def __eq__(self, other):
+        return isinstance(other, Index) and (self.columns, self.unique, self.where) == (other.columns, other.unique, other.where)
+
+    def __hash__(self):
+        return hash((self.columns, self.unique, self.where))
+
+    def name(self, table):
+        """
+        Имя индекса: таблица, столбцы и суффикс вида индекса. Имя частичного индекса содержит
+        короткий хеш условия, чтобы индексы по одним столбцам с разными условиями не совпадали по имени.
+
+        :param table: Имя таблицы.
+        :return: Имя индекса.
+        """
+        suffix = 'key' if self.unique else 'idx'
+        if self.where:
+            digest = hashlib.sha1(self.where.encode()).hexdigest()[:8]
+            suffix = f'{digest}_partial_{suffix}'
+        return f'{table}_{"_".join(self.columns)}_{suffix}'
+
+    def create_sql(self, table):
+        """
+        Идемпотентный запрос создания индекса (CREATE INDEX IF NOT EXISTS).
+
+        :param table: Имя таблицы.
+        :return: Строка SQL-запроса.
+        """
+        unique = 'UNIQUE ' if self.unique else ''
+        where = f' WHERE {self.where}' if self.where else ''
+        return f'CREATE {unique}INDEX IF NOT EXISTS {self.name(table)} ON {table} ({", ".join(self.columns)}){where}'
+
+class Relation:
+    """
+    Связь модели с другой таблицей по внешнему ключу foreign_key='таблица(столбец)'.
+    Является дескриптором: obj.<имя связи> возвращает связанный объект, загруженный через
+    select_related, prefetch_related или load_related. Присваивание объекта обновляет и внешний ключ.
+
+    Атрибуты:
+        - name: Имя связи (имя поля без суффикса _id или имя связанной таблицы).
+        - field_name: Поле внешнего ключа.
+        - table: Связанная таблица.
+        - column: Столбец связанной таблицы, на который ссылается внешний ключ.
+    """
+    def __init__(self, name, field_name, table, column):
+        self.name = name
+        self.field_name = field_name
+        self.table = table
+        self.column = column
+
+    @property
+    def model(self):
+        """
+        Класс модели связанной таблицы.
+
+        :return: Класс модели.
+        """
+        return ModelMeta.model_for_table(self.table)
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        related = getattr(obj, '_related', None)
+        if related is not None and self.name in related:
+            return related[self.name]
+        if getattr(obj, self.field_name) is None:
+            return None
+        raise AttributeError(
+            f"Related object '{self.name}' of {owner.__name__} is not loaded; "
+            f"use select_related/prefetch_related or load_related(db, '{self.name}')"
+        )
+
+    def __set__(self, obj, value):
+        obj._attach(self.name, value)
+        setattr(obj, self.field_name, None if value is None else getattr(value, self.column))
+
+class ManyToManyManager:
+    """
+    Менеджер связи many-to-many, объявленной полем many_to_many=True. Связи хранятся
+    в промежуточной таблице <таблица>_<связанная таблица> (см. Model.create_many_to_many_table).
+    Владельцы и связанные объекты передаются объектами моделей или значениями первичных ключей.
+
+    Атрибуты:
+        - model: Класс модели-владельца.
+        - name: Имя поля many-to-many.
+        - table: Промежуточная таблица.
+        - owner_column: Столбец промежуточной таблицы с ключом владельца.
+        - target_table: Связанная таблица.
+        - target_column: Столбец промежуточной таблицы с ключом связанного объекта.
+    """
+    def __init__(self, model, name, target_table):
+        self.model = model
+        self.name = name
+        self.target_table = target_table
+        self.table = f'{model._plan.table}_{target_table}'
+        self.owner_column = model._plan.pk
+        self.target_column = self.target_model._plan.pk
+
+    @property
+    def target_model(self):
+        """
+        Класс модели связанной таблицы.
+
+        :return: Класс модели.
+        """
+        return ModelMeta.model_for_table(self.target_table)
+
+    @staticmethod
+    def _key(value):
+        """
+        Значение первичного ключа объекта модели (или само значение, если передан ключ).
+
+        :param value: Объект модели или значение первичного ключа.
+        :return: Значение первичного ключа.
+        """
+        if isinstance(value, Model):
+            value = getattr(value, value._plan.pk)
+        if value is None:
+            raise ValueError("Many-to-many link requires saved objects with primary key values")
+        return value
+
+    def _forget(self, owners):
+        """
+        Сброс списков связанных объектов, прикреплённых load к владельцам, после изменения их связей.
+
+        :param owners: Итерируемый набор владельцев (значения первичных ключей пропускаются).
+        """
+        for owner in owners:
+            related = getattr(owner, '_related', None) if isinstance(owner, Model) else None
+            if related:
+                related.pop(self.name, None)
+
+    def add_pairs(self, db, pairs, batch_size=1000):
+        """
+        Добавление связей для многих владельцев многострочными INSERT ... ON CONFLICT DO NOTHING
+        в одной транзакции. Уже существующие связи пропускаются.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param pairs: Итерируемый набор пар (владелец, связанный объект).
+        :param batch_size: Количество строк в одном INSERT. По умолчанию 1000.
+        :return: Количество добавленных связей.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        pairs = list(pairs)
+        rows = list(dict.fromkeys((self._key(owner), self._key(target)) for owner, target in pairs))
+        self._forget(owner for owner, _ in pairs)
+        if not rows:
+            return 0
+        query = f'INSERT INTO {self.table} ({self.owner_column}, {self.target_column}) VALUES %s ON CONFLICT DO NOTHING'
+        added = 0
+        with db.get_atomic_cursor() as cur:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                execute_values(cur, query, batch, page_size=len(batch))
+                added += cur.rowcount
+        db.invalidate(self.table)
+        return added
+
+    def add(self, db, owner, targets):
+        """
+        Добавление связей владельца со связанными объектами одним INSERT ... ON CONFLICT DO NOTHING.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param owner: Владелец связи.
+        :param targets: Итерируемый набор связанных объектов.
+        :return: Количество добавленных связей.
+        """
+        return self.add_pairs(db, ((owner, target) for target in targets))
+
+    def remove(self, db, owner, targets=None):
+        """
+        Удаление связей владельца одним DELETE ... = ANY(%s).
+
+        :param db: Объект Database для подключения к базе данных.
+        :param owner: Владелец связи.
+        :param targets: Связанные объекты. По умолчанию — все связи владельца.
+        :return: Количество удалённых связей.
+        """
+        query = f'DELETE FROM {self.table} WHERE {self.owner_column} = %s'
+        params = [self._key(owner)]
+        if targets is not None:
+            query += f' AND {self.target_column} = ANY(%s)'
+            params.append([self._key(target) for target in targets])
+        with db.get_cursor() as cur:
+            cur.execute(query, params)
+            removed = cur.rowcount
+        db.invalidate(self.table)
+        self._forget([owner])
+        return removed
+
+    def set(self, db, owner, targets):
+        """
+        Замена набора связей владельца в одной транзакции: удаляются связи, которых нет в targets,
+        и добавляются недостающие.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param owner: Владелец связи.
+        :param targets: Итерируемый набор связанных объектов.
+        """
+        keys = [self._key(target) for target in targets]
+        with db.transaction():
+            with db.get_cursor() as cur:
+                cur.execute(
+                    f'DELETE FROM {self.table} WHERE {self.owner_column} = %s AND NOT ({self.target_column} = ANY(%s))',
+                    (self._key(owner), keys),
+                )
+            self.add(db, owner, keys)
+        db.invalidate(self.table)
+        self._forget([owner])
+
+    def load(self, db, owners):
+        """
+        Загрузка связанных объектов для многих владельцев одним запросом
+        (JOIN промежуточной и связанной таблиц по = ANY(%s)). Если переданы объекты моделей,
+        списки связанных объектов прикрепляются к ним и затем возвращаются all без запроса к базе;
+        add, add_pairs, remove и set сбрасывают прикреплённый список владельца.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param owners: Итерируемый набор владельцев.
+        :return: Словарь {ключ владельца: список связанных объектов}.
+        """
+        owners = list(owners)
+        keys = list(dict.fromkeys(self._key(owner) for owner in owners))
+        result = {key: [] for key in keys}
+        if keys:
+            target = self.target_model
+            columns = ", ".join(f"t.{name}" for name in target._plan.field_names)
+            query = (
+                f'SELECT l.{self.owner_column}, {columns} FROM {self.table} AS l '
+                f'JOIN {self.target_table} AS t ON t.{target._plan.pk} = l.{self.target_column} '
+                f'WHERE l.{self.owner_column} = ANY(%s) ORDER BY l.{self.owner_column}, l.{self.target_column}'
+            )
+            for row in db.fetch_all((self.table, self.target_table), query, (keys,)):
+                result[row[0]].append(target._hydrate(row[1:]))
+        for owner in owners:
+            if isinstance(owner, Model):
+                owner._attach(self.name, result[self._key(owner)])
+        return result
+
+    def all(self, db, owner, refresh=False):
+        """
+        Связанные объекты одного владельца: список, прикреплённый к объекту владельца через load,
+        или результат нового запроса.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param owner: Владелец связи.
+        :param refresh: Загрузить связи заново, даже если список уже прикреплён.
+        :return: Список связанных объектов.
+        """
+        related = getattr(owner, '_related', None) if isinstance(owner, Model) else None
+        if not refresh and related and self.name in related:
+            return related[self.name]
+        return self.load(db, [owner])[self._key(owner)]
+
+class ModelPlan:
+    """
+    Неизменяемый план модели, который строится один раз при создании класса модели.
+    Содержит упорядоченный набор полей, имя первичного ключа и шаблоны SQL-запросов,
+    поэтому горячие пути ORM только подставляют параметры.
+
+    Атрибуты:
+        - table: Имя таблицы.
+        - fields: Кортеж пар (имя поля, Field) в порядке объявления.
+        - field_names: Кортеж имён полей в порядке объявления.
+        - pk: Имя первичного ключа (или None).
+        - insert_columns: Столбцы INSERT без первичного ключа.
+        - insert_sql: INSERT без первичного ключа (значение генерирует база).
+        - insert_pk_sql: INSERT со всеми полями, включая первичный ключ.
+        - bulk_insert_sql, bulk_insert_pk_sql: Те же INSERT в форме VALUES %s для execute_values.
+        - bulk_load_sql: INSERT VALUES %s без первичного ключа, возвращающий только первичный ключ.
+        - select_sql: SELECT всех полей таблицы.
+        - select_by_pk_sql: SELECT всех полей по первичному ключу.
+        - delete_sql: DELETE по первичному ключу.
+        - delete_many_sql: DELETE по массиву первичных ключей (= ANY(%s)).
+        - indexes: Кортеж индексов (Index) из признаков полей index/unique и объявлений Index(...).
+        - relations: Словарь связей по внешним ключам {имя связи: Relation}.
+        - references: Кортеж таблиц, на которые ссылаются внешние ключи (включая many-to-many).
+
+    Запросы UPDATE (update_sql, bulk_update_sql) и SELECT с фильтром (filter_sql) собираются
+    при первом использовании набора полей и кешируются.
+    """
+    __slots__ = (
+        'table', 'fields', 'field_names', 'pk', 'insert_columns', 'insert_sql', 'insert_pk_sql',
+        'bulk_insert_sql', 'bulk_insert_pk_sql', 'bulk_load_sql', 'select_sql', 'select_by_pk_sql', 'delete_sql', 'delete_many_sql',
+        'indexes', 'relations', 'references', '_filter_cache', '_update_cache',
+    )
+
+    def __init__(self, table, fields, indexes=()):
+        """
+        Компиляция плана модели.
+
+        :param table: Имя таблицы.
+        :param fields: Список пар (имя поля, Field) в порядке объявления.
+        :param indexes: Объявленные составные и частичные индексы (Index).
+        """
+        set_ = lambda name, value: object.__setattr__(self, name, value)
+        field_names = tuple(name for name, _ in fields)
+        pk = next((name for name, field in fields if field.primary_key), None)
+        insert_columns = tuple(name for name in field_names if name != pk)
+        returning = ", ".join(field_names)
+
+        set_('table', table)
+        set_('fields', tuple(fields))
+        set_('field_names', field_names)
+        set_('pk', pk)
+        set_('insert_columns', insert_columns)
+        set_('insert_sql', self._insert(insert_columns, returning))
+        set_('insert_pk_sql', self._insert(field_names, returning))
+        set_('bulk_insert_sql', self._insert(insert_columns, returning, bulk=True))
+        set_('bulk_insert_pk_sql', self._insert(field_names, returning, bulk=True))
+        set_('bulk_load_sql', self._insert(insert_columns, pk, bulk=True) if pk else None)
+        set_('select_sql', f'SELECT {returning} FROM {table}')
+        set_('select_by_pk_sql', f'SELECT {returning} FROM {table} WHERE {pk} = %s' if pk else None)
+        set_('delete_sql', f'DELETE FROM {table} WHERE {pk} = %s' if pk else None)
+        set_('delete_many_sql', f'DELETE FROM {table} WHERE {pk} = ANY(%s)' if pk else None)
+        field_indexes = [Index((name,), unique=field.unique) for name, field in fields if field.index or field.unique]
+        all_indexes = tuple(dict.fromkeys(field_indexes + list(indexes)))
+        for index in all_indexes:
+            self._check_fields(index.columns)
+        set_('indexes', all_indexes)
+        set_('relations', self._relations(fields, field_names))
+        set_('references', tuple(dict.fromkeys(
+            field.foreign_key.split('(')[0] for _, field in fields
+            if field.foreign_key and field.foreign_key.split('(')[0] != table
+        )))
+        set_('_filter_cache', {})
+        set_('_update_cache', {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    @staticmethod
+    def _relations(fields, field_names):
+        """
+        Связи по внешним ключам (кроме полей many-to-many).
+
+        :param fields: Список пар (имя поля, Field).
+        :param field_names: Кортеж имён полей.
+        :return: Словарь {имя связи: Relation}.
+        """
+        relations = {}
+        for name, field in fields:
+            if not field.foreign_key or field.many_to_many:
+                continue
+            table, column = field.foreign_key[:-1].split('(')
+            relation_name = name[:-3] if name.endswith('_id') else table
+            if relation_name in field_names or relation_name in relations:
+                relation_name = f'{name}_rel'
+            relations[relation_name] = Relation(relation_name, name, table, column)
+        return relations
+
+    def _insert(self, columns, returning, bulk=False):
+        """
+        Шаблон INSERT для заданного набора столбцов.
+
+        :param columns: Столбцы для вставки.
+        :param returning: Список возвращаемых столбцов.
+        :param bulk: Шаблон для многострочной вставки (VALUES %s).
+        :return: Строка SQL-запроса или None, если столбцов нет.
+        """
+        if not columns:
+            return None
+        placeholders = "%s" if bulk else f'({", ".join(["%s"] * len(columns))})'
+        return f'INSERT INTO {self.table} ({", ".join(columns)}) VALUES {placeholders} RETURNING {returning}'
+
+    def _check_fields(self, keys):
+        """
+        Проверка, что все имена относятся к полям модели.
+
+        :param keys: Имена полей.
+        """
+        unknown = [key for key in keys if key not in self.field_names]
+        if unknown:
+            raise ValueError(f"Unknown fields for table '{self.table}': {', '.join(sorted(unknown))}")
+
+    def filter_sql(self, keys):
+        """
+        SELECT с условиями равенства по заданным полям. Запросы кешируются по набору полей.
+
+        :param keys: Имена полей из условий фильтрации.
+        :return: Пара (SQL-запрос, кортеж имён полей в порядке параметров).
+        """
+        cache_key = frozenset(keys)
+        compiled = self._filter_cache.get(cache_key)
+        if compiled is None:
+            self._check_fields(cache_key)
+            ordered = tuple(name for name in self.field_names if name in cache_key)
+            if ordered:
+                conditions = " AND ".join(f"{name} = %s" for name in ordered)
+                compiled = (f'{self.select_sql} WHERE {conditions}', ordered)
+            else:
+                compiled = (self.select_sql, ordered)
+            self._filter_cache[cache_key] = compiled
+        return compiled
+
+    def index_sql(self, index_foreign_keys=False):
+        """
+        Запросы создания индексов таблицы.
+
+        :param index_foreign_keys: Дополнительно индексировать внешние ключи, которые не являются
+                                   первым столбцом ни одного объявленного индекса.
+        :return: Список строк SQL-запросов.
+        """
+        indexes = list(self.indexes)
+        if index_foreign_keys:
+            leading = {index.columns[0] for index in indexes if not index.where}
+            indexes.extend(
+                Index((name,)) for name, field in self.fields
+                if field.foreign_key and not field.primary_key and name not in leading
+            )
+        return [index.create_sql(self.table) for index in indexes]
+
+    def select_in_sql(self, column):
+        """
+        SELECT всех полей по массиву значений столбца (= ANY(%s)). Запросы кешируются по столбцу.
+
+        :param column: Имя столбца.
+        :return: Строка SQL-запроса.
+        """
+        cache_key = ('in', column)
+        query = self._filter_cache.get(cache_key)
+        if query is None:
+            self._check_fields((column,))
+            query = f'{self.select_sql} WHERE {column} = ANY(%s)'
+            self._filter_cache[cache_key] = query
+        return query
+
+    def update_sql(self, keys):
+        """
+        UPDATE заданных полей по первичному ключу. Запросы кешируются по набору полей.
+
+        :param keys: Имена обновляемых полей.
+        :return: Пара (SQL-запрос, кортеж имён полей в порядке параметров без первичного ключа).
+        """
+        cache_key = frozenset(keys)
+        compiled = self._update_cache.get(cache_key)
+        if compiled is None:
+            self._check_fields(cache_key)
+            if not cache_key:
+                raise ValueError("No fields found to update.")
+            ordered = tuple(name for name in self.field_names if name in cache_key)
+            set_clause = ", ".join(f"{name} = %s" for name in ordered)
+            returning = ", ".join(self.field_names)
+            compiled = (f'UPDATE {self.table} SET {set_clause} WHERE {self.pk} = %s RETURNING {returning}', ordered)
+            self._update_cache[cache_key] = compiled
+        return compiled
+
+    def bulk_update_sql(self, keys):
+        """
+        UPDATE ... FROM (VALUES %s) для обновления заданных полей у многих строк одним запросом
+        с разными значениями для каждой строки. Запросы кешируются по набору полей.
+
+        :param keys: Имена обновляемых полей.
+        :return: Тройка (SQL-запрос, шаблон строки VALUES для execute_values,
+                 кортеж имён полей в порядке параметров после первичного ключа).
+        """
+        cache_key = ('bulk', frozenset(keys))
+        compiled = self._update_cache.get(cache_key)
+        if compiled is None:
+            self._check_fields(cache_key[1])
+            ordered = tuple(name for name in self.field_names if name in cache_key[1] and name != self.pk)
+            if not ordered:
+                raise ValueError("No fields found to update.")
+            types = dict(self.fields)
+            columns = (self.pk,) + ordered
+            # Явные приведения типов: в VALUES PostgreSQL не знает типы столбцов целевой таблицы
+            template = "(" + ", ".join(f"%s::{self.cast_type(types[name])}" for name in columns) + ")"
+            set_clause = ", ".join(f"{name} = v.{name}" for name in ordered)
+            query = (
+                f'UPDATE {self.table} SET {set_clause} FROM (VALUES %s) AS v({", ".join(columns)}) '
+                f'WHERE {self.table}.{self.pk} = v.{self.pk}'
+            )
+            compiled = (query, template, ordered)
+            self._update_cache[cache_key] = compiled
+        return compiled
+
+    @staticmethod
+    def cast_type(field):
+        """
+        SQL-тип для явного приведения значения поля (SERIAL не является типом и приводится к INT).
+
+        :param field: Объект Field.
+        :return: Имя SQL-типа.
+        """
+        return FieldType.INT.value if field.type == FieldType.SERIAL.value else field.type
 
 class ModelMeta(type):
     """
     Метакласс для динамической генерации моделей.
+    Поля модели описываются в docstring класса; по ним один раз строится план модели (ModelPlan),
+    компактная раскладка экземпляров на __slots__ и позиционный конструктор для строк из базы.
     """
     def __new__(cls, name, bases, dct):
-        docstring = dct.get('__doc__')
-        if docstring:
-            field_definitions = re.findall(
-                r'(\w+): FieldType\.(\w+)(, primary_key=True)?(, foreign_key=\'(.+?)\')?(, max_length=(\d+))?(, min_value=(\d+))?(, max_value=(\d+))?(, many_to_many=True)?',
-                docstring
-            )
-            for field_name, field_type, primary_key, _, foreign_key, _, max_length, _, min_value, _, max_value, many_to_many in field_definitions:
-                primary_key = bool(primary_key)
-                field_type_enum = FieldType[field_type]
-                max_length = int(max_length) if max_length else None
-                min_value = int(min_value) if min_value else None
-                max_value = int(max_value) if max_value else None
-                many_to_many = bool(many_to_many)
-                dct[field_name] = Field(field_type_enum, primary_key, foreign_key, max_length, min_value, max_value, many_to_many)
+        fields, indexes = ModelMeta.parse_docstring(dct.get('__doc__'))
+        plan = ModelPlan(name.lower(), fields, indexes)
+        dct['_plan'] = plan
+        # Значения полей хранятся в слотах экземпляра, а описания полей (Field) — в плане модели;
+        # слот _related хранит связанные объекты, загруженные select_related/prefetch_related
+        if fields:
+            dct.setdefault('__slots__', tuple(field_name for field_name, _ in fields) + ('_related',))
+        else:
+            dct.setdefault('__slots__', ())
+        for relation_name, relation in plan.relations.items():
+            dct.setdefault(relation_name, relation)
         return super().__new__(cls, name, bases, dct)
 
+    @staticmethod
+    def parse_docstring(docstring):
+        """
+        Разбор описания модели из docstring.
+        Поле: `имя: FieldType.ТИП[, primary_key=True][, foreign_key='таблица(столбец)'][, max_length=N]
+        [, min_value=N][, max_value=N][, many_to_many=True][, index=True][, unique=True]`.
+        Индекс: `Index(столбец1, столбец2[, unique=True][, where='условие'])`, именованные аргументы
+        в любом порядке; неизвестные аргументы и прочие формы записи вызывают ValueError.
+
+        :param docstring: Docstring класса модели.
+        :return: Пара (список пар (имя поля, Field), список Index).
+        """
+        fields = []
+        indexes = []
+        if not docstring:
+            return fields, indexes
+        field_definitions = re.findall(
+            r'(\w+): FieldType\.(\w+)(, primary_key=True)?(, foreign_key=\'(.+?)\')?(, max_length=(\d+))?(, min_value=(\d+))?(, max_value=(\d+))?(, many_to_many=True)?(, index=True)?(, unique=True)?',
+            docstring
+        )
+        for field_name, field_type, primary_key, _, foreign_key, _, max_length, _, min_value, _, max_value, many_to_many, index, unique in field_definitions:
+            primary_key = bool(primary_key)
+            field_type_enum = FieldType[field_type]
+            max_length = int(max_length) if max_length else None
+            min_value = int(min_value) if min_value else None
+            max_value = int(max_value) if max_value else None
+            many_to_many = bool(many_to_many)
+            fields.append((field_name, Field(field_type_enum, primary_key, foreign_key, max_length, min_value, max_value, many_to_many,
+                                             index=bool(index), unique=bool(unique))))
+        # Аргументы Index(...): условие where может содержать скобки и запятые внутри кавычек
+        for arguments in re.findall(r"\bIndex\(((?:'[^']*'|[^'()])*)\)", docstring):
+            indexes.append(ModelMeta._parse_index(arguments))
+        return fields, indexes
+
+    @staticmethod
+    def _parse_index(arguments):
+        """
+        Разбор аргументов объявления Index(...): столбцы, затем именованные unique и where в любом порядке.
+
+        :param arguments: Строка аргументов между скобками.
+        :return: Объект Index.
+        """
+        columns = []
+        options = {}
+        for argument in re.findall(r"(?:'[^']*'|[^,'])+", arguments):
+            argument = argument.strip()
+            keyword = re.fullmatch(r"(\w+)\s*=\s*(.+)", argument, re.S)
+            if keyword is None:
+                if options or not re.fullmatch(r'\w+', argument):
+                    raise ValueError(f"Invalid index declaration: Index({arguments})")
+                columns.append(argument)
+                continue
+            key, value = keyword.groups()
+            if key in options:
+                raise ValueError(f"Duplicate argument '{key}' in Index({arguments})")
+            if key == 'unique' and value in ('True', 'False'):
+                options[key] = value == 'True'
+            elif key == 'where' and re.fullmatch(r"'[^']+'", value):
+                options[key] = value[1:-1]
+            else:
+                raise ValueError(f"Invalid index argument '{argument}' in Index({arguments})")
+        return Index(columns, **options)
+
+    @staticmethod
+    def model_for_table(table):
+        """
+        Поиск класса модели по имени таблицы.
+
+        :param table: Имя таблицы.
+        :return: Класс модели.
+        """
+        for model in Model._registry.values():
+            if model._plan.table == table:
+                return model
+        raise LookupError(f"No model registered for table '{table}'")
+
+    @staticmethod
+    def dependency_graph(models=None):
+        """
+        Граф зависимостей моделей по внешним ключам: модель зависит от моделей, на таблицы
+        которых ссылаются её поля. Ссылки на таблицы вне набора моделей не учитываются.
+
+        :param models: Классы моделей. По умолчанию — все модели из ModelMeta._registry.
+        :return: Словарь {класс модели: множество классов моделей, от которых он зависит}.
+        """
+        models = list(models or Model._registry.values())
+        by_table = {model._plan.table: model for model in models}
+        return {
+            model: {by_table[table] for table in model._plan.references if table in by_table}
+            for model in models
+        }
+
+    @staticmethod
+    def sorted_models(models=None):
+        """
+        Топологическая сортировка моделей по внешним ключам: каждая модель идёт после моделей,
+        на которые она ссылается. При прочих равных сохраняется порядок объявления моделей.
+
+        :param models: Классы моделей. По умолчанию — все модели из ModelMeta._registry.
+        :return: Список классов моделей.
+        """
+        pending = ModelMeta.dependency_graph(models)
+        ordered = []
+        while pending:
+            ready = [model for model, parents in pending.items() if parents.isdisjoint(pending)]
+            if not ready:
+                raise ValueError(f"Circular foreign keys between {', '.join(model.__name__ for model in pending)}")
+            for model in ready:
+                del pending[model]
+            ordered.extend(ready)
+        return ordered
+
     def __init__(cls, name, bases, dct):
         if not hasattr(cls, '_registry'):
             cls._registry = {}
         else:
             cls._registry[name] = cls
+            if cls._plan.pk:
+                cls.primary_keys[cls._plan.table] = cls._plan.pk
+        cls._hydrate = ModelMeta._compile_hydrator(cls)
         super(ModelMeta, cls).__init__(name, bases, dct)
 
+    @staticmethod
+    def _compile_hydrator(model):
+        """
+        Генерация позиционного конструктора, который создаёт объект без вызова __init__
+        и раскладывает строку результата запроса по слотам одной операцией присваивания.
+
+        :param model: Класс модели.
+        :return: Функция record -> объект модели.
+        """
+        names = model._plan.field_names
+        if names:
+            targets = "".join(f"obj.{field_name}, " for field_name in names)
+            body = f"    {targets}= record\n"
+        else:
+            body = ""
+        source = f"def _hydrate(record, _new=object.__new__, _model=model):\n    obj = _new(_model)\n{body}    return obj\n"
+        namespace = {}
+        exec(source, {'model': model}, namespace)
+        return staticmethod(namespace['_hydrate'])
+
 class Model(metaclass=ModelMeta):
     """
     Базовый класс для моделей. Определяет методы сохранения, удаления, обновления 
     и получения данных из базы данных.
     """
+    __slots__ = ()
     primary_keys = {}  # глобальный словарь для хранения первичных ключей каждой таблицы
     many_to_many_tables = []  # глобальный список для хранения таблиц many-to-many
 
     def __init__(self, **kwargs):
-        for key, value in kwargs.items():
-            setattr(self, key, value)
-        for key, field in self.__class__.__dict__.items():
-            if isinstance(field, Field) and key not in kwargs:
-                setattr(self, key, None)
+        for key in self._plan.field_names:
+            setattr(self, key, kwargs.pop(key, None))
+        if kwargs:
+            raise TypeError(f"Unknown fields for {self.__class__.__name__}: {', '.join(sorted(kwargs))}")
 
     @classmethod
-    def create_table(cls, db):
+    def create_table(cls, db, index_foreign_keys=False):
         """
-        Создание таблицы для модели.
+        Создание таблицы для модели и её индексов (запросы идемпотентны).
 
         :param db: Объект Database для подключения к базе данных.
+        :param index_foreign_keys: Создать индексы по всем внешним ключам.
         """
-        fields = []
+        for attr, value in cls._plan.fields:
+            if value.primary_key:
+                Model.primary_keys[cls._plan.table] = attr  # сохраняем первичный ключ
+            if value.many_to_many:
+                Model.many_to_many_tables.append((cls._plan.table, attr, value.foreign_key.split('(')[0], value.foreign_key.split('(')[1][:-1]))
 
-        for attr, value in cls.__dict__.items():
-            if isinstance(value, Field):
-                field_def = f'{attr} {value.type}'
-                if value.max_length:
-                    field_def = f'{attr} VARCHAR({value.max_length})'
-                if value.primary_key:
-                    field_def += ' PRIMARY KEY'
-                    Model.primary_keys[cls.__name__.lower()] = attr  # сохраняем первичный ключ
-                if value.foreign_key:
-                    field_def += f' REFERENCES {value.foreign_key}'
-                fields.append(field_def)
-                if value.many_to_many:
-                    Model.many_to_many_tables.append((cls.__name__.lower(), attr, value.foreign_key.split('(')[0], value.foreign_key.split('(')[1][:-1]))
-
-        query = f'CREATE TABLE IF NOT EXISTS {cls.__name__.lower()} ({", ".join(fields)});'
+        query = cls._create_table_sql()
         with db.get_cursor() as cur:
             cur.execute(query)
+            for index_query in cls._plan.index_sql(index_foreign_keys):
+                cur.execute(index_query)
+
+    @classmethod
+    def _create_table_sql(cls):
+        """
+        Запрос создания таблицы модели.
+
+        :return: Строка SQL-запроса CREATE TABLE IF NOT EXISTS.
+        """
+        fields = []
+        for attr, value in cls._plan.fields:
+            field_def = f'{attr} {value.type}'
+            if value.max_length:
+                field_def = f'{attr} VARCHAR({value.max_length})'
+            if value.primary_key:
+                field_def += ' PRIMARY KEY'
+            if value.foreign_key:
+                field_def += f' REFERENCES {value.foreign_key}'
+            fields.append(field_def)
+        return f'CREATE TABLE IF NOT EXISTS {cls._plan.table} ({", ".join(fields)});'
+
+    @classmethod
+    def schema_sql(cls, models=None, index_foreign_keys=False):
+        """
+        DDL всей схемы: таблицы в порядке зависимостей по внешним ключам, их индексы
+        и промежуточные таблицы many-to-many после всех таблиц, на которые они ссылаются.
+
+        :param models: Классы моделей. По умолчанию — все модели из ModelMeta._registry.
+        :param index_foreign_keys: Создать индексы по всем внешним ключам.
+        :return: Пара (список таблиц в порядке создания, список строк SQL-запросов).
+        """
+        ordered = ModelMeta.sorted_models(models)
+        tables = [model._plan.table for model in ordered]
+        statements = []
+        for model in ordered:
+            statements.append(model._create_table_sql())
+            statements.extend(model._plan.index_sql(index_foreign_keys))
+        for model in ordered:
+            for name, field in model._plan.fields:
+                if field.many_to_many:
+                    join_table = model.m2m(name)
+                    tables.append(join_table.table)
+                    statements.append(cls._many_to_many_sql(
+                        model._plan.table, join_table.target_table,
+                        {model._plan.table: join_table.owner_column, join_table.target_table: join_table.target_column},
+                    ))
+        return tables, statements
+
+    @classmethod
+    def create_all(cls, db, models=None, index_foreign_keys=False):
+        """
+        Создание всех таблиц (включая промежуточные many-to-many) и индексов одним набором DDL
+        в одном соединении и одной транзакции. Отпечаток схемы (хеш DDL) запоминается в db;
+        если он не изменился и все таблицы на месте, DDL не выполняется.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param models: Классы моделей. По умолчанию — все модели из ModelMeta._registry.
+        :param index_foreign_keys: Создать индексы по всем внешним ключам.
+        :return: True, если DDL выполнялся, False, если схема уже актуальна.
+        """
+        tables, statements = cls.schema_sql(models, index_foreign_keys)
+        fingerprint = hashlib.sha1("\n".join(statements).encode()).hexdigest()
+        with db.transaction():
+            with db.get_cursor() as cur:
+                if db.schema_fingerprint == fingerprint:
+                    # Отпечаток совпал — проверяем одним запросом, что таблицы не удалили в обход ORM
+                    cur.execute("SELECT count(*) FROM pg_tables WHERE schemaname = current_schema() AND tablename = ANY(%s)",
+                                (tables,))
+                    if cur.fetchone()[0] == len(tables):
+                        return False
+                for query in statements:
+                    cur.execute(query)
+        db.schema_fingerprint = fingerprint
+        return True
+
+    @classmethod
+    def drop_all(cls, db, models=None):
+        """
+        Удаление всех таблиц моделей (включая промежуточные many-to-many) в порядке,
+        обратном зависимостям по внешним ключам, в одной транзакции.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param models: Классы моделей. По умолчанию — все модели из ModelMeta._registry.
+        """
+        tables, _ = cls.schema_sql(models)
+        with db.transaction():
+            with db.get_cursor() as cur:
+                for table in reversed(tables):
+                    cur.execute(f'DROP TABLE IF EXISTS {table}')
+        db.schema_fingerprint = None
+        db.invalidate()
+
+    @classmethod
+    def truncate_all(cls, db, models=None):
+        """
+        Очистка таблиц моделей, включая их промежуточные таблицы many-to-many, одним запросом
+        TRUNCATE ... RESTART IDENTITY CASCADE (см. Database.delete_all_data). Для части моделей
+        CASCADE очищает и таблицы, которые ссылаются на выбранные.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param models: Классы моделей. По умолчанию — все модели из ModelMeta._registry.
+        """
+        tables, _ = cls.schema_sql(models)
+        db.delete_all_data(tables)
 
     @classmethod
     def create_many_to_many_tables(cls, db):
@@ -155,18 +903,30 @@ class Model(metaclass=ModelMeta):
         :param table2: Вторая таблица.
         :param primary_keys: Словарь первичных ключей.
         """
+        query = Model._many_to_many_sql(table1, table2, primary_keys)
+        with db.get_cursor() as cur:
+            cur.execute(query)
+
+    @staticmethod
+    def _many_to_many_sql(table1, table2, primary_keys):
+        """
+        Запрос создания таблицы many-to-many.
+
+        :param table1: Первая таблица.
+        :param table2: Вторая таблица.
+        :param primary_keys: Словарь первичных ключей.
+        :return: Строка SQL-запроса.
+        """
         table_name = f'{table1}_{table2}'
         table1_pk = primary_keys[table1]
         table2_pk = primary_keys[table2]
-        query = f'''
+        return f'''
         CREATE TABLE IF NOT EXISTS {table_name} (
             {table1_pk} INT REFERENCES {table1}({table1_pk}),
             {table2_pk} INT REFERENCES {table2}({table2_pk}),
             PRIMARY KEY ({table1_pk}, {table2_pk})
         );
         '''
-        with db.get_cursor() as cur:
-            cur.execute(query)
 
     def extract_field_values(self):
         """
@@ -174,18 +934,154 @@ class Model(metaclass=ModelMeta):
 
         :return: Список имен полей и список значений полей.
         """
-        columns = []
+        plan = self._plan
         values = []
-        for attr, field in self.__class__.__dict__.items():
-            if isinstance(field, Field):
-                value = getattr(self, attr)
-                if isinstance(value, Enum):
-                    value = value.value
-                if value is None and field.primary_key:
-                    continue
-                columns.append(attr)
-                values.append(value)
-        return columns, values
+        for attr in plan.field_names:
+            value = getattr(self, attr)
+            if isinstance(value, Enum):
+                value = value.value
+            values.append(value)
+        if plan.pk is not None and getattr(self, plan.pk) is None:
+            # Первичный ключ не задан — его значение сгенерирует база
+            del values[plan.field_names.index(plan.pk)]
+            return list(plan.insert_columns), values
+        return list(plan.field_names), values
+
+    def _insert_sql(self, bulk=False):
+        """
+        Выбор заранее собранного INSERT в зависимости от того, задан ли первичный ключ.
+
+        :param bulk: Вернуть шаблон для многострочной вставки.
+        :return: Строка SQL-запроса.
+        """
+        plan = self._plan
+        if plan.pk is not None and getattr(self, plan.pk) is None:
+            query = plan.bulk_insert_sql if bulk else plan.insert_sql
+        else:
+            query = plan.bulk_insert_pk_sql if bulk else plan.insert_pk_sql
+        if query is None:
+            raise ValueError("No fields found to insert.")
+        return query
+
+    def _assign(self, record):
+        """
+        Запись значений строки, возвращённой базой, в поля объекта.
+
+        :param record: Кортеж значений в порядке полей плана.
+        """
+        for key, value in zip(self._plan.field_names, record):
+            setattr(self, key, value)
+
+    def _attach(self, name, value):
+        """
+        Прикрепление связанного объекта к текущему объекту.
+
+        :param name: Имя связи.
+        :param value: Связанный объект или None.
+        """
+        related = getattr(self, '_related', None)
+        if related is None:
+            related = self._related = {}
+        related[name] = value
+
+    @classmethod
+    def _relation(cls, name):
+        """
+        Связь модели по имени.
+
+        :param name: Имя связи.
+        :return: Объект Relation.
+        """
+        relation = cls._plan.relations.get(name)
+        if relation is None:
+            raise ValueError(f"Unknown relation '{name}' for model {cls.__name__}; available: {', '.join(cls._plan.relations) or 'none'}")
+        return relation
+
+    @classmethod
+    def _relation_tree(cls, paths):
+        """
+        Разбор путей связей вида 'user__application' в дерево с проверкой имён связей.
+
+        :param paths: Пути связей.
+        :return: Вложенный словарь {имя связи: поддерево}.
+        """
+        tree = {}
+        for path in paths:
+            model, node = cls, tree
+            for name in path.split('__'):
+                relation = model._relation(name)
+                node = node.setdefault(name, {})
+                model = relation.model
+        return tree
+
+    @classmethod
+    def m2m(cls, name):
+        """
+        Менеджер связи many-to-many, объявленной полем name с many_to_many=True.
+
+        :param name: Имя поля many-to-many.
+        :return: Объект ManyToManyManager.
+        """
+        field = dict(cls._plan.fields).get(name)
+        if field is None or not field.many_to_many:
+            raise ValueError(f"Field '{name}' of {cls.__name__} is not a many-to-many relation")
+        return ManyToManyManager(cls, name, field.foreign_key.split('(')[0])
+
+    def load_related(self, db, name):
+        """
+        Загрузка одного связанного объекта по внешнему ключу и прикрепление его к текущему объекту.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param name: Имя связи.
+        :return: Связанный объект или None.
+        """
+        relation = self._relation(name)
+        value = getattr(self, relation.field_name)
+        found = relation.model.filter(db, **{relation.column: value}) if value is not None else []
+        related = found[0] if found else None
+        self._attach(name, related)
+        return related
+
+    @classmethod
+    def prefetch_related(cls, db, objects, *paths):
+        """
+        Загрузка связанных объектов для набора объектов одним запросом
+        SELECT ... WHERE столбец = ANY(%s) на каждую связь (вместо запроса на каждый объект).
+        Вложенные связи задаются через '__', например 'user__application'.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param objects: Итерируемый набор объектов модели.
+        :param paths: Пути связей.
+        :return: Список объектов с прикреплёнными связанными объектами.
+        """
+        objects = list(objects)
+        cls._prefetch(db, objects, cls._relation_tree(paths))
+        return objects
+
+    @classmethod
+    def _prefetch(cls, db, objects, tree):
+        """
+        Рекурсивная пакетная загрузка связанных объектов по дереву связей.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param objects: Список объектов модели.
+        :param tree: Дерево связей из _relation_tree.
+        """
+        for name, subtree in tree.items():
+            relation = cls._plan.relations[name]
+            target = relation.model
+            keys = list(dict.fromkeys(
+                value for value in (getattr(obj, relation.field_name) for obj in objects) if value is not None
+            ))
+            related = {}
+            if keys:
+                query = target._plan.select_in_sql(relation.column)
+                for record in map(target._hydrate, db.fetch_all(target._plan.table, query, (keys,))):
+                    related[getattr(record, relation.column)] = record
+            for obj in objects:
+                obj._attach(name, related.get(getattr(obj, relation.field_name)))
+            if subtree and related:
+                target._prefetch(db, list(related.values()), subtree)
 
     def save(self, db):
         """
@@ -193,20 +1089,82 @@ class Model(metaclass=ModelMeta):
 
         :param db: Объект Database для подключения к базе данных.
         """
-        columns, values = self.extract_field_values()
+        query = self._insert_sql()
+        _, values = self.extract_field_values()
+        with db.get_cursor() as cur:
+            db.execute(cur, query, values)
+            self._assign(cur.fetchone())
+        db.invalidate(self._plan.table)
 
-        if not columns:
-            raise ValueError("No fields found to insert.")
+    @classmethod
+    def bulk_save(cls, db, objects, batch_size=1000):
+        """
+        Массовое сохранение объектов модели многострочными INSERT ... VALUES ... RETURNING
+        в одной транзакции. Значения, возвращённые базой (в том числе SERIAL первичные ключи),
+        записываются обратно в объекты в порядке входного списка.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param objects: Итерируемый набор объектов модели.
+        :param batch_size: Количество строк в одном INSERT. По умолчанию 1000.
+        :return: Список сохранённых объектов.
+        """
+        objects = list(objects)
+        if not objects:
+            return objects
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
 
-        column_names = ", ".join(columns)
-        placeholders = ", ".join(["%s"] * len(columns))
+        # Объекты с заданным и незаданным первичным ключом вставляются разными запросами
+        groups = {}
+        for obj in objects:
+            if not isinstance(obj, cls):
+                raise TypeError(f"Expected {cls.__name__} instance, got {type(obj).__name__}")
+            query = obj._insert_sql(bulk=True)
+            _, values = obj.extract_field_values()
+            group = groups.setdefault(query, ([], []))
+            group[0].append(obj)
+            group[1].append(values)
 
-        query = f'INSERT INTO {self.__class__.__name__.lower()} ({column_names}) VALUES ({placeholders}) RETURNING *;'
-        with db.get_cursor() as cur:
-            cur.execute(query, values)
-            returned_values = cur.fetchone()
-            for key, value in zip(columns, returned_values):
-                setattr(self, key, value)
+        with db.get_atomic_cursor() as cur:
+            for query, (group_objects, rows) in groups.items():
+                returned_rows = execute_values(cur, query, rows, page_size=batch_size, fetch=True)
+                for obj, record in zip(group_objects, returned_rows):
+                    obj._assign(record)
+        db.invalidate(cls._plan.table)
+        return objects
+
+    @classmethod
+    def bulk_load(cls, db, rows, batch_size=1000):
+        """
+        Массовая загрузка готовых строк (кортежей значений в порядке _plan.insert_columns)
+        без создания объектов модели, например пакетов колоночного генератора.
+        Первичные ключи генерирует база и возвращает в порядке входных строк.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param rows: Список кортежей значений.
+        :param batch_size: Количество строк в одном INSERT. По умолчанию 1000.
+        :return: Список первичных ключей загруженных строк.
+        """
+        if cls._plan.bulk_load_sql is None:
+            raise TypeError(f"{cls.__name__} has no primary key to return from bulk_load")
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        if not rows:
+            return []
+        with db.get_atomic_cursor() as cur:
+            returned_rows = execute_values(cur, cls._plan.bulk_load_sql, rows, page_size=batch_size, fetch=True)
+        db.invalidate(cls._plan.table)
+        return [record[0] for record in returned_rows]
+
+    @classmethod
+    def objects(cls, db):
+        """
+        Ленивый запрос к таблице модели с поддержкой filter/order_by/limit/offset/only/count/exists.
+
+        :param db: Объект Database для подключения к базе данных.
+        :return: QuerySet для модели.
+        """
+        return QuerySet(cls, db)
 
     @classmethod
     def get_all(cls, db):
@@ -216,15 +1174,7 @@ class Model(metaclass=ModelMeta):
         :param db: Объект Database для подключения к базе данных.
         :return: Список объектов модели.
         """
-        query = f'SELECT * FROM {cls.__name__.lower()};'
-        with db.get_cursor() as cur:
-            cur.execute(query)
-            records = cur.fetchall()
-            results = []
-            for record in records:
-                obj = cls(**dict(zip([col[0] for col in cur.description], record)))
-                results.append(obj)
-            return results
+        return list(map(cls._hydrate, db.fetch_all(cls._plan.table, cls._plan.select_sql)))
 
     @classmethod
     def filter(cls, db, **kwargs):
@@ -235,17 +1185,53 @@ class Model(metaclass=ModelMeta):
         :param kwargs: Словарь условий фильтрации.
         :return: Список объектов модели, соответствующих условиям.
         """
-        conditions = [f"{key} = %s" for key in kwargs.keys()]
-        query = f"SELECT * FROM {cls.__name__.lower()} WHERE {' AND '.join(conditions)}"
+        query, keys = cls._plan.filter_sql(kwargs)
+        return list(map(cls._hydrate, db.fetch_all(cls._plan.table, query, [kwargs[key] for key in keys])))
 
-        with db.get_cursor() as cur:
-            cur.execute(query, tuple(kwargs.values()))
-            records = cur.fetchall()
-            results = []
-            for record in records:
-                obj = cls(**dict(zip([col[0] for col in cur.description], record)))
-                results.append(obj)
-            return results
+    @classmethod
+    def _iter_query(cls, db, query, params, chunk_size, convert=None):
+        """
+        Потоковое выполнение запроса через серверный курсор с порционной гидрацией объектов.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param query: SQL-запрос, возвращающий поля модели в порядке плана.
+        :param params: Параметры запроса.
+        :param chunk_size: Количество строк в одной порции.
+        :param convert: Функция, превращающая порцию строк в объекты. По умолчанию — гидрация модели.
+        :yield: Объекты модели.
+        """
+        with db.get_server_cursor(chunk_size=chunk_size) as cur:
+            cur.execute(query, params)
+            while True:
+                records = cur.fetchmany(chunk_size)
+                if not records:
+                    break
+                yield from convert(records) if convert else map(cls._hydrate, records)
+
+    @classmethod
+    def iter_all(cls, db, chunk_size=2000):
+        """
+        Потоковое получение всех записей таблицы через серверный курсор.
+        В памяти одновременно находится не более chunk_size строк.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param chunk_size: Количество строк, получаемых с сервера за раз. По умолчанию 2000.
+        :yield: Объекты модели.
+        """
+        yield from cls._iter_query(db, cls._plan.select_sql, None, chunk_size)
+
+    @classmethod
+    def iter_filter(cls, db, chunk_size=2000, **kwargs):
+        """
+        Потоковая фильтрация записей по заданным условиям через серверный курсор.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param chunk_size: Количество строк, получаемых с сервера за раз. По умолчанию 2000.
+        :param kwargs: Словарь условий фильтрации.
+        :yield: Объекты модели, соответствующие условиям.
+        """
+        query, keys = cls._plan.filter_sql(kwargs)
+        yield from cls._iter_query(db, query, [kwargs[key] for key in keys], chunk_size)
 
     def delete(self, db):
         """
@@ -253,10 +1239,35 @@ class Model(metaclass=ModelMeta):
 
         :param db: Объект Database для подключения к базе данных.
         """
-        pk_name = Model.primary_keys[self.__class__.__name__.lower()]
-        query = f"DELETE FROM {self.__class__.__name__.lower()} WHERE {pk_name} = %s"
         with db.get_cursor() as cur:
-            cur.execute(query, (getattr(self, pk_name),))
+            db.execute(cur, self._plan.delete_sql, (getattr(self, self._plan.pk),))
+        db.invalidate(self._plan.table)
+
+    @classmethod
+    def delete_many(cls, db, pks, batch_size=10000):
+        """
+        Удаление записей по списку первичных ключей запросами DELETE ... WHERE pk = ANY(%s)
+        с передачей ключей одним массивом. Большие списки удаляются пакетами; вне явной транзакции
+        каждый пакет выполняется отдельным курсором и фиксируется сразу, чтобы не удерживать блокировки долго.
+        При ошибке пакета уже удалённые пакеты остаются удалёнными.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param pks: Итерируемый набор значений первичного ключа.
+        :param batch_size: Количество ключей в одном DELETE. По умолчанию 10000.
+        :return: Количество удалённых строк.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        pks = list(pks)
+        deleted = 0
+        try:
+            for start in range(0, len(pks), batch_size):
+                with db.get_cursor() as cur:
+                    db.execute(cur, cls._plan.delete_many_sql, (pks[start:start + batch_size],))
+                    deleted += cur.rowcount
+        finally:
+            db.invalidate(cls._plan.table)
+        return deleted
 
     def update(self, db, **kwargs):
         """
@@ -265,38 +1276,229 @@ class Model(metaclass=ModelMeta):
         :param db: Объект Database для подключения к базе данных.
         :param kwargs: Словарь полей и значений для обновления.
         """
-        pk_name = Model.primary_keys[self.__class__.__name__.lower()]
-        set_clause = ", ".join([f"{key} = %s" for key in kwargs.keys()])
-        query = f"UPDATE {self.__class__.__name__.lower()} SET {set_clause} WHERE {pk_name} = %s"
-        values = tuple(kwargs.values()) + (getattr(self, pk_name),)
+        plan = self._plan
+        query, keys = plan.update_sql(kwargs)
+        pk_value = getattr(self, plan.pk)
+        values = [kwargs[key] for key in keys]
+        values.append(pk_value)
         with db.get_cursor() as cur:
-            cur.execute(query, values)
-            for key, value in kwargs.items():
-                setattr(self, key, value)
-
-            # Для получения обновленных значений после выполнения запроса
-            query = f"SELECT * FROM {self.__class__.__name__.lower()} WHERE {pk_name} = %s"
-            cur.execute(query, (getattr(self, pk_name),))
+            # UPDATE ... RETURNING возвращает обновлённую строку за тот же запрос
+            db.execute(cur, query, values)
             updated_record = cur.fetchone()
-            if updated_record:
-                for key, value in zip([col[0] for col in cur.description], updated_record):
-                    setattr(self, key, value)
-                    
+        db.invalidate(plan.table)
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+        if updated_record:
+            self._assign(updated_record)
+
+    @classmethod
+    def bulk_update(cls, db, objects, fields, batch_size=1000):
+        """
+        Массовое обновление заданных полей у многих объектов одним запросом
+        UPDATE ... FROM (VALUES ...) на пакет, значения берутся из атрибутов объектов.
+        Все пакеты выполняются в одной транзакции.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param objects: Итерируемый набор объектов модели с заданным первичным ключом.
+        :param fields: Имена обновляемых полей.
+        :param batch_size: Количество строк в одном UPDATE. По умолчанию 1000.
+        :return: Количество обновлённых строк.
+        """
+        objects = list(objects)
+        if not objects:
+            return 0
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        plan = cls._plan
+        query, template, keys = plan.bulk_update_sql(fields)
+
+        rows = []
+        for obj in objects:
+            if not isinstance(obj, cls):
+                raise TypeError(f"Expected {cls.__name__} instance, got {type(obj).__name__}")
+            pk_value = getattr(obj, plan.pk)
+            if pk_value is None:
+                raise ValueError(f"Cannot update {cls.__name__} without primary key value")
+            row = [pk_value]
+            for key in keys:
+                value = getattr(obj, key)
+                row.append(value.value if isinstance(value, Enum) else value)
+            rows.append(row)
+
+        updated = 0
+        with db.get_atomic_cursor() as cur:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                execute_values(cur, query, batch, template=template, page_size=len(batch))
+                updated += cur.rowcount
+        db.invalidate(plan.table)
+        return updated
+
+    @classmethod
+    def export(cls, db, path, format=None, batch_size=65536):
+        """
+        Потоковая выгрузка таблицы модели в файл через COPY ... TO STDOUT без создания объектов
+        модели (см. lib/table_io.py). Parquet и Arrow требуют pyarrow.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param path: Путь к файлу.
+        :param format: 'csv', 'binary', 'parquet' или 'arrow'. По умолчанию по расширению файла.
+        :param batch_size: Примерное количество строк в пакете Arrow/Parquet.
+        :return: Количество выгруженных строк.
+        """
+        from lib.table_io import export_table  # lib.table_io импортирует lib.orm
+        return export_table(db, cls, path, format=format, batch_size=batch_size)
+
+    @classmethod
+    def import_(cls, db, path, format=None, batch_size=65536):
+        """
+        Потоковая загрузка таблицы модели из файла, созданного export, через COPY ... FROM STDIN
+        в одной транзакции.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param path: Путь к файлу.
+        :param format: 'csv', 'binary', 'parquet' или 'arrow'. По умолчанию по расширению файла.
+        :param batch_size: Количество строк в пакете при чтении Arrow/Parquet.
+        :return: Количество загруженных строк.
+        """
+        from lib.table_io import import_table  # lib.table_io импортирует lib.orm
+        return import_table(db, cls, path, format=format, batch_size=batch_size)
+
+    @classmethod
+    def prewarm_statements(cls, db, models=None):
+        """
+        Заблаговременная подготовка горячих запросов (INSERT, SELECT по первичному ключу, DELETE)
+        на всех соединениях базы данных. Работает, если Database создан с use_prepared=True.
+
+        :param db: Объект Database для подключения к базе данных.
+        :param models: Классы моделей. По умолчанию — все модели из ModelMeta._registry.
+        """
+        queries = []
+        for model in models or cls._registry.values():
+            plan = model._plan
+            queries.extend(query for query in (plan.insert_sql, plan.insert_pk_sql, plan.select_sql) if query)
+            if plan.pk:
+                # select_by_pk_sql совпадает с запросом filter(<pk>=...)
+                queries.extend((plan.select_by_pk_sql, plan.delete_sql))
+        db.prepare_statements(queries)
+
     @staticmethod
     def rawsql(db, query, params):
         """
-        Выполнение произвольного SQL-запроса.
+        Выполнение произвольного SQL-запроса. Запрос не кешируется; если он изменяет таблицы,
+        кеш результатов для них инвалидируется (для нераспознанных изменений кеш очищается целиком).
         
         :param db: Объект Database для подключения к базе данных.
         :param query: SQL-запрос.
         :param params: Параметры запроса.
         """
-        with db.get_cursor() as cur:
-            cur.execute(query, params)
-            if cur.description:
-                return cur.fetchall()
-            else:
-                return cur.rowcount
+        try:
+            with db.get_cursor() as cur:
+                cur.execute(query, params)
+                if cur.description:
+                    return cur.fetchall()
+                else:
+                    return cur.rowcount
+        finally:
+            tables = written_tables(query)
+            if tables is None or tables:
+                db.invalidate(tables)
+
+    # Асинхронные варианты методов для AsyncDatabase (lib/async_db.py).
+    # Используют те же заранее собранные запросы плана модели, что и синхронные методы;
+    # методы записи инвалидируют кеш результатов, переданный в AsyncDatabase(cache=...).
+
+    async def asave(self, adb):
+        """
+        Асинхронное сохранение текущего объекта модели в базу данных.
+
+        :param adb: Объект AsyncDatabase для подключения к базе данных.
+        """
+        query = self._insert_sql()
+        _, values = self.extract_field_values()
+        async with adb.get_cursor() as cur:
+            await cur.execute(query, values)
+            self._assign(await cur.fetchone())
+        adb.invalidate(self._plan.table)
+
+    @classmethod
+    async def aget_all(cls, adb):
+        """
+        Асинхронное получение всех записей из таблицы.
+
+        :param adb: Объект AsyncDatabase для подключения к базе данных.
+        :return: Список объектов модели.
+        """
+        async with adb.get_cursor() as cur:
+            await cur.execute(cls._plan.select_sql)
+            return list(map(cls._hydrate, await cur.fetchall()))
+
+    @classmethod
+    async def afilter(cls, adb, **kwargs):
+        """
+        Асинхронная фильтрация записей по заданным условиям.
+
+        :param adb: Объект AsyncDatabase для подключения к базе данных.
+        :param kwargs: Словарь условий фильтрации.
+        :return: Список объектов модели, соответствующих условиям.
+        """
+        query, keys = cls._plan.filter_sql(kwargs)
+        async with adb.get_cursor() as cur:
+            await cur.execute(query, [kwargs[key] for key in keys])
+            return list(map(cls._hydrate, await cur.fetchall()))
+
+    async def adelete(self, adb):
+        """
+        Асинхронное удаление текущего объекта модели из базы данных.
+
+        :param adb: Объект AsyncDatabase для подключения к базе данных.
+        """
+        async with adb.get_cursor() as cur:
+            await cur.execute(self._plan.delete_sql, (getattr(self, self._plan.pk),))
+        adb.invalidate(self._plan.table)
+
+    async def aupdate(self, adb, **kwargs):
+        """
+        Асинхронное обновление полей текущего объекта модели в базе данных.
+
+        :param adb: Объект AsyncDatabase для подключения к базе данных.
+        :param kwargs: Словарь полей и значений для обновления.
+        """
+        plan = self._plan
+        query, keys = plan.update_sql(kwargs)
+        pk_value = getattr(self, plan.pk)
+        values = [kwargs[key] for key in keys]
+        values.append(pk_value)
+        async with adb.get_cursor() as cur:
+            await cur.execute(query, values)
+            updated_record = await cur.fetchone()
+        adb.invalidate(plan.table)
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+        if updated_record:
+            self._assign(updated_record)
+
+    @staticmethod
+    async def arawsql(adb, query, params):
+        """
+        Асинхронное выполнение произвольного SQL-запроса. Если запрос изменяет таблицы,
+        общий кеш результатов (AsyncDatabase.cache) для них инвалидируется, как в rawsql.
+
+        :param adb: Объект AsyncDatabase для подключения к базе данных.
+        :param query: SQL-запрос.
+        :param params: Параметры запроса.
+        """
+        try:
+            async with adb.get_cursor() as cur:
+                await cur.execute(query, params)
+                if cur.description:
+                    return await cur.fetchall()
+                else:
+                    return cur.rowcount
+        finally:
+            tables = written_tables(query)
+            if tables is None or tables:
+                adb.invalidate(tables)
 
 # Пример моделей
 class Application(Model):
@@ -309,7 +1511,7 @@ class Users(Model):
     """
     user_id: FieldType.SERIAL, primary_key=True
     full_name: FieldType.VARCHAR, max_length=100
-    email: FieldType.VARCHAR, max_length=255
+    email: FieldType.VARCHAR, max_length=255, index=True
     password: FieldType.VARCHAR, max_length=100
     registration_date: FieldType.DATE
     app_availability: FieldType.INT, foreign_key='application(app_id)', min_value=1, max_value=100
@@ -358,6 +1560,7 @@ class Operation(Model):
     user_id: FieldType.INT, foreign_key='users(user_id)', min_value=1, max_value=100
     operation_type: FieldType.VARCHAR, max_length=100
     operation_date: FieldType.DATETIME
+    Index(user_id, operation_date)
     """
 
 class Subscription(Model):
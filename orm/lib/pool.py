@@ -0,0 +1,267 @@
+"""
+Модуль пула соединений с базой данных PostgreSQL.
+
+Импорты:
+    - Импортируются необходимые модули и библиотеки.
+
+Классы:
+    - PoolError: Ошибка пула соединений (например, истекло время ожидания свободного соединения).
+    - ConnectionPool: Потокобезопасный пул постоянных соединений.
+
+Методы ConnectionPool:
+    - acquire: Получение соединения из пула.
+    - release: Возврат соединения в пул.
+    - close: Закрытие всех соединений пула.
+    - for_each_idle: Выполнение функции для каждого свободного соединения.
+    - stats: Статистика работы пула.
+"""
+
+import threading
+import time
+from collections import deque
+
+from psycopg2 import extensions
+
+
+class PoolError(Exception):
+    """
+    Ошибка пула соединений.
+    """
+
+
+class ConnectionPool:
+    """
+    Потокобезопасный пул постоянных соединений с ограничением минимального и максимального размера,
+    вытеснением простаивающих соединений и проверкой их работоспособности.
+
+    Атрибуты:
+    - connect (callable): Функция, открывающая новое соединение.
+    - min_size (int): Количество соединений, которые не вытесняются по простою.
+    - max_size (int): Максимальное количество одновременно открытых соединений.
+    - max_idle (float): Время простоя (с), после которого лишнее соединение закрывается.
+    - health_check_interval (float): Время простоя (с), после которого соединение проверяется запросом SELECT 1.
+    - timeout (float): Максимальное время ожидания свободного соединения (с).
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, max_idle=300.0, health_check_interval=30.0, timeout=30.0):
+        """
+        Инициализация пула.
+
+        :param connect: Функция без аргументов, возвращающая новое соединение psycopg2.
+        :param min_size: Минимальный размер пула. По умолчанию 1.
+        :param max_size: Максимальный размер пула. По умолчанию 10.
+        :param max_idle: Время простоя до вытеснения соединения (с). По умолчанию 300.
+        :param health_check_interval: Время простоя, после которого соединение проверяется перед выдачей (с). По умолчанию 30.
+        :param timeout: Время ожидания свободного соединения (с). По умолчанию 30.
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool size must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self.connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+        self.timeout = timeout
+
+        self._idle = deque()  # пары (соединение, время возврата в пул)
+        self._size = 0  # количество открытых соединений (свободных и выданных)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._counters = {
+            'created': 0,
+            'reused': 0,
+            'closed': 0,
+            'evicted': 0,
+            'failed_checks': 0,
+            'waits': 0,
+            'timeouts': 0,
+        }
+
+        for _ in range(min_size):
+            self._idle.append((self._open(), time.monotonic()))
+
+    def _open(self, reserved=False):
+        """
+        Открытие нового соединения с учётом счётчиков пула.
+
+        :param reserved: Место под соединение уже зарезервировано в _size вызывающим кодом.
+        :return: Новое соединение.
+        """
+        try:
+            conn = self.connect()
+        except Exception:
+            if reserved:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+            raise
+        with self._cond:
+            if not reserved:
+                self._size += 1
+            self._counters['created'] += 1
+        return conn
+
+    def _discard(self, conn):
+        """
+        Закрытие соединения и уменьшение размера пула.
+
+        :param conn: Соединение для закрытия.
+        """
+        try:
+            if not conn.closed:
+                conn.close()
+        finally:
+            with self._cond:
+                self._size -= 1
+                self._counters['closed'] += 1
+                self._cond.notify()
+
+    def _evict_idle(self, now):
+        """
+        Вытеснение соединений, простаивающих дольше max_idle, сверх минимального размера пула.
+        Вызывается под блокировкой.
+
+        :param now: Текущее время (time.monotonic()).
+        :return: Список соединений, которые нужно закрыть.
+        """
+        expired = []
+        # Самые старые соединения находятся в начале очереди
+        while self._idle and self._size - len(expired) > self.min_size and now - self._idle[0][1] > self.max_idle:
+            expired.append(self._idle.popleft()[0])
+        self._counters['evicted'] += len(expired)
+        return expired
+
+    def _is_healthy(self, conn, idle_for):
+        """
+        Проверка работоспособности соединения.
+
+        :param conn: Проверяемое соединение.
+        :param idle_for: Время простоя соединения (с).
+        :return: True, если соединением можно пользоваться.
+        """
+        if conn.closed:
+            return False
+        if idle_for < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            return True
+        except Exception:
+            return False
+
+    def acquire(self):
+        """
+        Получение соединения из пула. При отсутствии свободных соединений открывается новое,
+        если не достигнут max_size, иначе вызывающий поток ожидает возврата соединения.
+
+        :return: Соединение с базой данных.
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn = None
+            reserved = False
+            with self._cond:
+                if self._closed:
+                    raise PoolError("Connection pool is closed")
+                now = time.monotonic()
+                expired = self._evict_idle(now)
+                if self._idle:
+                    conn, released_at = self._idle.pop()  # LIFO: самое «тёплое» соединение
+                    idle_for = now - released_at
+                elif self._size - len(expired) < self.max_size:
+                    # Резервируем место и откроем новое соединение вне блокировки
+                    self._size += 1
+                    reserved = True
+                else:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._counters['timeouts'] += 1
+                        raise PoolError(f"Timed out after {self.timeout}s waiting for a free connection")
+                    self._counters['waits'] += 1
+                    self._cond.wait(remaining)
+
+            for stale in expired:
+                self._discard(stale)
+
+            if conn is not None:
+                if self._is_healthy(conn, idle_for):
+                    with self._cond:
+                        self._counters['reused'] += 1
+                    return conn
+                with self._cond:
+                    self._counters['failed_checks'] += 1
+                self._discard(conn)
+                continue
+
+            if reserved:
+                return self._open(reserved=True)
+
+    def release(self, conn, discard=False):
+        """
+        Возврат соединения в пул. Незавершённая транзакция откатывается,
+        соединение возвращается в режим autocommit.
+
+        :param conn: Возвращаемое соединение.
+        :param discard: Закрыть соединение вместо возврата в пул (например, после сетевой ошибки).
+        """
+        if not discard and not conn.closed:
+            try:
+                if conn.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                if not conn.autocommit:
+                    conn.autocommit = True
+            except Exception:
+                discard = True
+        if discard or conn.closed or self._closed:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def for_each_idle(self, fn):
+        """
+        Выполнение функции для каждого свободного соединения пула (например, для подготовки выражений).
+        На время выполнения соединения изымаются из пула и не выдаются другим потокам.
+
+        :param fn: Функция, принимающая соединение.
+        """
+        with self._cond:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+        try:
+            for conn in idle:
+                fn(conn)
+        finally:
+            with self._cond:
+                now = time.monotonic()
+                for conn in idle:
+                    self._idle.append((conn, now))
+                self._cond.notify_all()
+
+    def close(self):
+        """
+        Закрытие всех свободных соединений пула. Выданные соединения закрываются при возврате.
+        """
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self):
+        """
+        Статистика работы пула.
+
+        :return: Словарь со счётчиками и текущими размерами пула.
+        """
+        with self._cond:
+            result = dict(self._counters)
+            result['size'] = self._size
+            result['idle'] = len(self._idle)
+            result['in_use'] = self._size - len(self._idle)
+            result['min_size'] = self.min_size
+            result['max_size'] = self.max_size
+        return result
@@ -0,0 +1,489 @@
+"""
+Модуль ленивых цепочек запросов (QuerySet) к таблицам моделей.
+
+Импорты:
+    - Импортируются необходимые модули и библиотеки.
+
+Классы:
+    - QuerySet: Ленивый запрос к таблице модели, компилируемый в один SQL-запрос при итерации.
+      Поддерживает удаление по условиям на стороне базы данных (delete) и загрузку связанных
+      объектов по внешним ключам: select_related (JOIN в том же запросе) и prefetch_related
+      (один запрос = ANY(%s) на связь).
+
+Поддерживаемые условия filter/exclude:
+    - field=value: Равенство (None превращается в IS NULL).
+    - field__ne: Неравенство.
+    - field__in: Вхождение в список (= ANY(%s)).
+    - field__gt, field__gte, field__lt, field__lte: Сравнения.
+    - field__range: Диапазон (BETWEEN, пара значений).
+    - field__like: Сравнение по шаблону LIKE.
+    - field__isnull: Проверка на NULL (True/False).
+"""
+
+from enum import Enum
+
+# Шаблоны SQL-условий для поддерживаемых lookup-суффиксов
+LOOKUPS = {
+    'exact': '{column} = %s',
+    'ne': '{column} <> %s',
+    'in': '{column} = ANY(%s)',
+    'gt': '{column} > %s',
+    'gte': '{column} >= %s',
+    'lt': '{column} < %s',
+    'lte': '{column} <= %s',
+    'range': '{column} BETWEEN %s AND %s',
+    'like': '{column} LIKE %s',
+}
+
+class QuerySet:
+    """
+    Ленивый запрос к таблице модели. Методы filter, exclude, order_by, limit, offset и only
+    возвращают новый QuerySet и не обращаются к базе данных; запрос компилируется в один
+    SQL-оператор только при итерации, а count/exists выполняются на стороне PostgreSQL.
+
+    Атрибуты:
+        - model: Класс модели.
+        - db: Объект Database для подключения к базе данных.
+    """
+
+    def __init__(self, model, db):
+        """
+        Инициализация пустого запроса ко всей таблице модели.
+
+        :param model: Класс модели.
+        :param db: Объект Database для подключения к базе данных.
+        """
+        self.model = model
+        self.db = db
+        self._where = ()  # пары (SQL-условие, параметры)
+        self._order_by = ()
+        self._limit = None
+        self._offset = None
+        self._only = None
+        self._select_related = ()
+        self._prefetch_related = ()
+        self._result_cache = None
+
+    def _clone(self, **changes):
+        """
+        Копирование запроса с изменением части состояния.
+
+        :param changes: Новые значения атрибутов состояния.
+        :return: Новый QuerySet.
+        """
+        clone = self.__class__(self.model, self.db)
+        clone._where = self._where
+        clone._order_by = self._order_by
+        clone._limit = self._limit
+        clone._offset = self._offset
+        clone._only = self._only
+        clone._select_related = self._select_related
+        clone._prefetch_related = self._prefetch_related
+        for key, value in changes.items():
+            setattr(clone, key, value)
+        return clone
+
+    def _check_field(self, name):
+        """
+        Проверка, что имя относится к полю модели.
+
+        :param name: Имя поля.
+        """
+        if name not in self.model._plan.field_names:
+            raise ValueError(f"Unknown field '{name}' for table '{self.model._plan.table}'")
+
+    def _compile_condition(self, key, value):
+        """
+        Компиляция одного условия вида field__lookup=value.
+
+        :param key: Имя поля с необязательным lookup-суффиксом.
+        :param value: Значение условия.
+        :return: Пара (SQL-условие, список параметров).
+        """
+        field_name, _, lookup = key.partition('__')
+        lookup = lookup or 'exact'
+        self._check_field(field_name)
+        if isinstance(value, Enum):
+            value = value.value
+        # {q} заменяется на имя таблицы при компиляции запроса с JOIN (select_related)
+        column = f"{{q}}{field_name}"
+
+        if lookup == 'isnull':
+            return f"{column} IS {'' if value else 'NOT '}NULL", []
+        if lookup == 'exact' and value is None:
+            return f"{column} IS NULL", []
+        if lookup not in LOOKUPS:
+            raise ValueError(f"Unsupported lookup '{lookup}' in '{key}'")
+        if lookup == 'in':
+            params = [[item.value if isinstance(item, Enum) else item for item in value]]
+        elif lookup == 'range':
+            low, high = value
+            params = [low, high]
+        else:
+            params = [value]
+        return LOOKUPS[lookup].format(column=column), params
+
+    def _add_conditions(self, kwargs, negate=False):
+        """
+        Добавление условий фильтрации, объединённых через AND.
+
+        :param kwargs: Словарь условий.
+        :param negate: Инвертировать объединённое условие (exclude).
+        :return: Новый QuerySet.
+        """
+        if not kwargs:
+            return self._clone()
+        compiled = [self._compile_condition(key, value) for key, value in kwargs.items()]
+        condition = " AND ".join(sql for sql, _ in compiled)
+        if negate:
+            condition = f"NOT ({condition})"
+        params = [param for _, condition_params in compiled for param in condition_params]
+        return self._clone(_where=self._where + ((condition, params),))
+
+    def filter(self, **kwargs):
+        """
+        Добавление условий фильтрации.
+
+        :param kwargs: Условия вида field=value или field__lookup=value.
+        :return: Новый QuerySet.
+        """
+        return self._add_conditions(kwargs)
+
+    def exclude(self, **kwargs):
+        """
+        Исключение записей, удовлетворяющих всем заданным условиям.
+
+        :param kwargs: Условия вида field=value или field__lookup=value.
+        :return: Новый QuerySet.
+        """
+        return self._add_conditions(kwargs, negate=True)
+
+    def order_by(self, *fields):
+        """
+        Сортировка результата. Префикс '-' задаёт обратный порядок.
+
+        :param fields: Имена полей.
+        :return: Новый QuerySet.
+        """
+        order = []
+        for name in fields:
+            descending = name.startswith('-')
+            field_name = name[1:] if descending else name
+            self._check_field(field_name)
+            order.append(f"{{q}}{field_name} DESC" if descending else f"{{q}}{field_name}")
+        return self._clone(_order_by=tuple(order))
+
+    def limit(self, n):
+        """
+        Ограничение количества строк результата.
+
+        :param n: Максимальное количество строк.
+        :return: Новый QuerySet.
+        """
+        if n is not None and n < 0:
+            raise ValueError("limit must be non-negative")
+        return self._clone(_limit=n)
+
+    def offset(self, n):
+        """
+        Пропуск первых n строк результата.
+
+        :param n: Количество пропускаемых строк.
+        :return: Новый QuerySet.
+        """
+        if n is not None and n < 0:
+            raise ValueError("offset must be non-negative")
+        return self._clone(_offset=n)
+
+    def only(self, *fields):
+        """
+        Загрузка только указанных полей; остальные поля объектов будут равны None.
+        Первичный ключ загружается всегда.
+
+        :param fields: Имена полей.
+        :return: Новый QuerySet.
+        """
+        for name in fields:
+            self._check_field(name)
+        selected = set(fields)
+        if self.model._plan.pk:
+            selected.add(self.model._plan.pk)
+        return self._clone(_only=frozenset(selected))
+
+    def select_related(self, *paths):
+        """
+        Загрузка связанных объектов по внешним ключам в том же запросе через LEFT JOIN.
+        Вложенные связи задаются через '__', например 'user__application'.
+
+        :param paths: Пути связей.
+        :return: Новый QuerySet.
+        """
+        self.model._relation_tree(paths)
+        return self._clone(_select_related=self._select_related + tuple(paths))
+
+    def prefetch_related(self, *paths):
+        """
+        Загрузка связанных объектов после основного запроса: один запрос = ANY(%s) на каждую связь.
+
+        :param paths: Пути связей.
+        :return: Новый QuerySet.
+        """
+        self.model._relation_tree(paths)
+        return self._clone(_prefetch_related=self._prefetch_related + tuple(paths))
+
+    def _joins(self):
+        """
+        Список JOIN для select_related в порядке путей.
+
+        :return: Список кортежей (путь, путь родителя, Relation, псевдоним, модель связанной таблицы).
+        """
+        joins = []
+        models = {'': (self.model, self.model._plan.table)}
+        for path in self._select_related:
+            parts = path.split('__')
+            for depth, name in enumerate(parts):
+                sub_path = '__'.join(parts[:depth + 1])
+                if sub_path in models:
+                    continue
+                parent_path = '__'.join(parts[:depth])
+                parent_model, _ = models[parent_path]
+                relation = parent_model._plan.relations[name]
+                alias = f"rel_{len(joins) + 1}"
+                models[sub_path] = (relation.model, alias)
+                joins.append((sub_path, parent_path, relation, alias, relation.model))
+        return joins
+
+    def _where_sql(self, qualifier=""):
+        """
+        Сборка WHERE-части запроса.
+
+        :param qualifier: Префикс столбцов основной таблицы (например, 'users.' в запросе с JOIN).
+        :return: Пара (SQL-строка, список параметров).
+        """
+        if not self._where:
+            return "", []
+        sql = " WHERE " + " AND ".join(f"({condition.format(q=qualifier)})" for condition, _ in self._where)
+        params = [param for _, condition_params in self._where for param in condition_params]
+        return sql, params
+
+    def _tail_sql(self, qualifier=""):
+        """
+        Сборка ORDER BY / LIMIT / OFFSET.
+
+        :param qualifier: Префикс столбцов основной таблицы.
+        :return: SQL-строка.
+        """
+        sql = ""
+        if self._order_by:
+            sql += " ORDER BY " + ", ".join(column.format(q=qualifier) for column in self._order_by)
+        if self._limit is not None:
+            sql += f" LIMIT {int(self._limit)}"
+        if self._offset is not None:
+            sql += f" OFFSET {int(self._offset)}"
+        return sql
+
+    def compile(self):
+        """
+        Компиляция запроса в один SQL-оператор. Столбцы возвращаются в порядке полей модели,
+        поля, не выбранные в only(), заменяются на NULL.
+
+        :return: Пара (SQL-строка, список параметров).
+        """
+        plan = self.model._plan
+        joins = self._joins()
+        qualifier = f"{plan.table}." if joins else ""
+        if self._only is None:
+            columns = [f"{qualifier}{name}" for name in plan.field_names]
+        else:
+            columns = [f"{qualifier}{name}" if name in self._only else f"NULL AS {name}" for name in plan.field_names]
+        from_sql = plan.table
+        for _, parent_path, relation, alias, target in joins:
+            parent_alias = next((j[3] for j in joins if j[0] == parent_path), plan.table)
+            columns.extend(f"{alias}.{name}" for name in target._plan.field_names)
+            from_sql += f" LEFT JOIN {target._plan.table} AS {alias} ON {alias}.{relation.column} = {parent_alias}.{relation.field_name}"
+        where, params = self._where_sql(qualifier)
+        return f"SELECT {', '.join(columns)} FROM {from_sql}{where}{self._tail_sql(qualifier)}", params
+
+    def _tables(self):
+        """
+        Таблицы, из которых читает запрос (для кеша результатов).
+
+        :return: Имя таблицы или кортеж имён при select_related.
+        """
+        joins = self._joins()
+        if not joins:
+            return self.model._plan.table
+        return (self.model._plan.table,) + tuple(dict.fromkeys(target._plan.table for *_, target in joins))
+
+    def _build(self, rows):
+        """
+        Превращение строк результата в объекты модели: гидрация, прикрепление объектов
+        из select_related и пакетная загрузка prefetch_related.
+
+        :param rows: Строки результата запроса compile().
+        :return: Список объектов модели.
+        """
+        model = self.model
+        joins = self._joins()
+        if not joins:
+            objects = list(map(model._hydrate, rows))
+        else:
+            width = len(model._plan.field_names)
+            layout = []
+            for sub_path, parent_path, relation, _, target in joins:
+                target_width = len(target._plan.field_names)
+                key_index = target._plan.field_names.index(relation.column)
+                layout.append((sub_path, parent_path, relation.name, target, target_width, key_index))
+            objects = []
+            for row in rows:
+                obj = model._hydrate(row[:width])
+                loaded = {'': obj}
+                position = width
+                for sub_path, parent_path, name, target, target_width, key_index in layout:
+                    part = row[position:position + target_width]
+                    position += target_width
+                    # LEFT JOIN без совпадения возвращает NULL во всех столбцах связанной таблицы
+                    related = target._hydrate(part) if part[key_index] is not None else None
+                    parent = loaded.get(parent_path)
+                    if parent is not None:
+                        parent._attach(name, related)
+                    loaded[sub_path] = related
+                objects.append(obj)
+        if self._prefetch_related:
+            model.prefetch_related(self.db, objects, *self._prefetch_related)
+        return objects
+
+    def _fetch(self):
+        """
+        Выполнение запроса (через кеш результатов базы данных, если он включён)
+        и кеширование результата в QuerySet.
+
+        :return: Список объектов модели.
+        """
+        if self._result_cache is None:
+            query, params = self.compile()
+            rows = self.db.fetch_all(self._tables(), query, params, prepared=False)
+            self._result_cache = self._build(rows)
+        return self._result_cache
+
+    def __iter__(self):
+        return iter(self._fetch())
+
+    def __len__(self):
+        return len(self._fetch())
+
+    def __repr__(self):
+        query, params = self.compile()
+        return f"<QuerySet {self.model.__name__}: {query} {params}>"
+
+    def all(self):
+        """
+        Выполнение запроса.
+
+        :return: Список объектов модели.
+        """
+        return list(self._fetch())
+
+    def first(self):
+        """
+        Первый объект результата (с LIMIT 1 на стороне базы).
+
+        :return: Объект модели или None.
+        """
+        if self._result_cache is not None:
+            return self._result_cache[0] if self._result_cache else None
+        results = self.limit(1)._fetch()
+        return results[0] if results else None
+
+    def iterator(self, chunk_size=2000):
+        """
+        Потоковое выполнение запроса через серверный курсор без кеширования результата.
+
+        :param chunk_size: Количество строк, получаемых с сервера за раз.
+        :yield: Объекты модели.
+        """
+        query, params = self.compile()
+        convert = self._build if self._select_related or self._prefetch_related else None
+        yield from self.model._iter_query(self.db, query, params, chunk_size, convert)
+
+    def count(self):
+        """
+        Подсчёт записей средствами базы данных (SELECT COUNT(*)).
+
+        :return: Количество записей.
+        """
+        plan = self.model._plan
+        where, params = self._where_sql()
+        if self._limit is None and self._offset is None:
+            query = f"SELECT COUNT(*) FROM {plan.table}{where}"
+        else:
+            query = f"SELECT COUNT(*) FROM (SELECT 1 FROM {plan.table}{where}{self._tail_sql()}) AS subquery"
+        with self.db.get_cursor() as cur:
+            cur.execute(query, params)
+            return cur.fetchone()[0]
+
+    def delete(self, batch_size=None):
+        """
+        Удаление записей, удовлетворяющих запросу, одним оператором DELETE на стороне базы данных
+        без загрузки объектов. С batch_size удаление идёт пакетами по batch_size строк
+        (каждый пакет вне явной транзакции фиксируется сразу), чтобы не удерживать долгие блокировки.
+
+        :param batch_size: Максимальное количество строк, удаляемых одним оператором. По умолчанию без ограничения.
+        :return: Количество удалённых строк.
+        """
+        plan = self.model._plan
+        where, params = self._where_sql()
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        if batch_size is None and self._limit is None and self._offset is None:
+            with self.db.get_cursor() as cur:
+                cur.execute(f"DELETE FROM {plan.table}{where}", params)
+                deleted = cur.rowcount
+            self.db.invalidate(plan.table)
+            self._result_cache = None
+            return deleted
+        if not plan.pk:
+            raise ValueError(f"Table '{plan.table}' has no primary key for limited or batched delete")
+
+        # Строки выбираются подзапросом по первичному ключу: LIMIT в DELETE не поддерживается
+        subquery = f"SELECT {plan.pk} FROM {plan.table}{where}{self._tail_sql()}"
+        if batch_size is None:
+            with self.db.get_cursor() as cur:
+                cur.execute(f"DELETE FROM {plan.table} WHERE {plan.pk} IN ({subquery})", params)
+                deleted = cur.rowcount
+            self.db.invalidate(plan.table)
+            self._result_cache = None
+            return deleted
+
+        deleted = 0
+        remaining = self._limit
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            batch_query = (
+                f"DELETE FROM {plan.table} WHERE {plan.pk} IN "
+                f"(SELECT {plan.pk} FROM ({subquery}) AS selected LIMIT {int(size)})"
+            )
+            with self.db.get_cursor() as cur:
+                cur.execute(batch_query, params)
+                rowcount = cur.rowcount
+            self.db.invalidate(plan.table)
+            deleted += rowcount
+            if remaining is not None:
+                remaining -= rowcount
+            if rowcount < size:
+                break
+        self._result_cache = None
+        return deleted
+
+    def exists(self):
+        """
+        Проверка наличия хотя бы одной записи средствами базы данных.
+
+        :return: True, если запрос возвращает хотя бы одну строку.
+        """
+        plan = self.model._plan
+        where, params = self._where_sql()
+        query = f"SELECT EXISTS(SELECT 1 FROM {plan.table}{where}{self._tail_sql() or ' LIMIT 1'})"
+        with self.db.get_cursor() as cur:
+            cur.execute(query, params)
+            return cur.fetchone()[0]
@@ -0,0 +1,186 @@
+"""
+Модуль выдачи песочниц — одноразовых баз данных, скопированных из шаблона.
+
+Песочница создаётся командой CREATE DATABASE ... TEMPLATE: копирование файлов кластера занимает
+миллисекунды и даёт точную копию шаблона (ключи, ограничения, последовательности, индексы
+и, если шаблон с данными, сами данные). Пул заранее держит несколько готовых копий, поэтому
+получение песочницы не ждёт даже копирования.
+
+Импорты:
+    - Импортируются необходимые модули и библиотеки.
+
+Классы:
+    - SandboxPool: Потокобезопасный пул готовых песочниц, скопированных из шаблона.
+"""
+
+import threading
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+from lib.db import Database
+
+
+class SandboxPool:
+    """
+    Потокобезопасный пул песочниц. Готовые копии шаблона хранятся в очереди; после выдачи
+    песочницы фоновый поток создаёт новую копию, пока в очереди не станет size баз.
+    Возвращённая песочница удаляется — повторно она не выдаётся.
+
+    Атрибуты:
+    - template (str): Имя базы-шаблона (см. Database.create_template).
+    - size (int): Количество готовых песочниц, которые пул держит заранее.
+    - prefix (str): Префикс имён баз данных песочниц.
+    - db_options (dict): Параметры подключения и прочие аргументы Database для выдаваемых песочниц.
+    """
+
+    def __init__(self, template, size=2, prefix=None, **db_options):
+        """
+        Инициализация пула и создание size готовых песочниц.
+
+        :param template: Имя базы-шаблона.
+        :param size: Количество готовых песочниц. По умолчанию 2.
+        :param prefix: Префикс имён песочниц. По умолчанию '<шаблон>_sandbox'.
+        :param db_options: Аргументы Database (user, password, host, port, pooled, ...).
+        """
+        if size < 0:
+            raise ValueError("size must be a non-negative integer")
+        self.template = template
+        self.size = size
+        self.prefix = prefix or f"{template}_sandbox"
+        self.db_options = db_options
+        connection_options = {key: db_options[key] for key in ('user', 'password', 'host', 'port') if key in db_options}
+        self._admin = Database('postgres', **connection_options)
+
+        self._ready = deque()  # имена готовых песочниц
+        self._cond = threading.Condition()
+        self._closed = False
+        self._error = None
+        self._counters = {'warm': 0, 'cold': 0, 'created': 0, 'dropped': 0}
+
+        for _ in range(size):
+            self._ready.append(self._clone())
+        self._worker = threading.Thread(target=self._refill, name=f"{self.prefix}-refill", daemon=True)
+        self._worker.start()
+
+    def _clone(self):
+        """
+        Создание новой копии шаблона.
+
+        :return: Имя созданной базы данных.
+        """
+        name = f"{self.prefix}_{uuid.uuid4().hex[:12]}"
+        self._admin.clone_db(self.template, name)
+        with self._cond:
+            self._counters['created'] += 1
+        return name
+
+    def _refill(self):
+        """
+        Фоновое пополнение очереди готовых песочниц до size.
+        """
+        while True:
+            with self._cond:
+                while not self._closed and (len(self._ready) >= self.size or self._error is not None):
+                    self._cond.wait()
+                if self._closed:
+                    return
+            try:
+                name = self._clone()
+            except Exception as e:
+                # Ошибка копирования (например, к шаблону подключились) — пополнение останавливается,
+                # а acquire создаёт песочницы сам и получает эту ошибку напрямую
+                with self._cond:
+                    self._error = e
+                continue
+            with self._cond:
+                if self._closed:
+                    drop = True
+                else:
+                    self._ready.append(name)
+                    drop = False
+                    self._cond.notify_all()
+            if drop:
+                self._drop(name)
+
+    def _drop(self, name):
+        """
+        Удаление базы данных песочницы.
+
+        :param name: Имя базы данных.
+        """
+        self._admin.drop_db(name)
+        with self._cond:
+            self._counters['dropped'] += 1
+
+    def acquire(self):
+        """
+        Получение песочницы: готовой из очереди или, если очередь пуста, новой копии шаблона.
+
+        :return: Объект Database для песочницы.
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Sandbox pool is closed")
+            if self._ready:
+                name = self._ready.popleft()
+                self._counters['warm'] += 1
+            else:
+                name = None
+                self._counters['cold'] += 1
+            self._error = None
+            self._cond.notify_all()
+        if name is None:
+            name = self._clone()
+        return Database(name, **self.db_options)
+
+    def release(self, db):
+        """
+        Возврат песочницы: её соединения закрываются, а база данных удаляется.
+
+        :param db: Объект Database, полученный из acquire.
+        """
+        db.close()
+        self._drop(db.dbname)
+
+    @contextmanager
+    def sandbox(self):
+        """
+        Контекстный менеджер песочницы, которая удаляется при выходе из блока.
+
+        :yield: Объект Database для песочницы.
+        """
+        db = self.acquire()
+        try:
+            yield db
+        finally:
+            self.release(db)
+
+    def stats(self):
+        """
+        Статистика пула.
+
+        :return: Словарь со счётчиками (warm — выдано готовых, cold — создано по запросу,
+                 created, dropped) и количеством готовых песочниц.
+        """
+        with self._cond:
+            result = dict(self._counters)
+            result['ready'] = len(self._ready)
+        return result
+
+    def close(self):
+        """
+        Остановка пополнения и удаление всех готовых песочниц.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._worker.join()
+        while self._ready:
+            self._drop(self._ready.popleft())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,254 @@
+"""
+Модуль потоковой выгрузки и загрузки таблиц моделей через COPY.
+
+Данные передаются командами COPY ... TO STDOUT / COPY ... FROM STDIN без создания объектов модели.
+CSV и двоичный формат COPY пишутся в файл и читаются из него напрямую порциями драйвера;
+для Parquet и Arrow (IPC) поток CSV из COPY разбирается pyarrow пакетами по схеме, построенной
+из типов полей модели (FieldType), поэтому объём памяти ограничен размером пакета при любом
+размере таблицы.
+
+Импорты:
+    - Импортируются необходимые модули и библиотеки (pyarrow — необязательная зависимость).
+
+Функции:
+    - detect_format: Определение формата файла по расширению.
+    - arrow_schema: Схема Arrow для модели по типам её полей.
+    - export_table: Выгрузка таблицы модели в файл.
+    - import_table: Загрузка таблицы модели из файла.
+"""
+
+import os
+import threading
+
+from psycopg2 import sql
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow — необязательная зависимость форматов Parquet и Arrow
+    pa = None
+
+from lib.orm import FieldType
+
+FORMATS = ('csv', 'binary', 'parquet', 'arrow')
+_EXTENSIONS = {
+    '.csv': 'csv',
+    '.bin': 'binary',
+    '.copy': 'binary',
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+}
+# Параметры COPY для каждого формата; Parquet и Arrow передаются через CSV без заголовка
+_COPY_OPTIONS = {
+    'csv': "FORMAT csv, HEADER true",
+    'binary': "FORMAT binary",
+    'parquet': "FORMAT csv",
+    'arrow': "FORMAT csv",
+}
+
+def detect_format(path, format=None):
+    """
+    Определение формата файла: явно заданный или по расширению.
+
+    :param path: Путь к файлу.
+    :param format: Формат ('csv', 'binary', 'parquet', 'arrow') или None.
+    :return: Имя формата.
+    """
+    if format is None:
+        format = _EXTENSIONS.get(os.path.splitext(str(path))[1].lower())
+        if format is None:
+            raise ValueError(f"Cannot detect format of '{path}', pass format= one of {', '.join(FORMATS)}")
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format '{format}', expected one of {', '.join(FORMATS)}")
+    if format in ('parquet', 'arrow') and pa is None:
+        raise ImportError(f"{format.capitalize()} export requires pyarrow: pip install pyarrow")
+    return format
+
+def _arrow_type(field):
+    """
+    Тип Arrow для поля модели.
+
+    :param field: Объект Field.
+    :return: Тип pyarrow.
+    """
+    types = {
+        FieldType.INT.value: pa.int32(),
+        FieldType.SERIAL.value: pa.int32(),
+        FieldType.VARCHAR.value: pa.string(),
+        FieldType.DATE.value: pa.date32(),
+        FieldType.DATETIME.value: pa.timestamp('us'),
+        FieldType.DECIMAL.value: pa.decimal128(10, 2),
+    }
+    return types[field.type]
+
+def arrow_schema(model):
+    """
+    Схема Arrow для модели по типам её полей (FieldType).
+
+    :param model: Класс модели.
+    :return: Объект pyarrow.Schema.
+    """
+    return pa.schema([(name, _arrow_type(field)) for name, field in model._plan.fields])
+
+def _copy_sql(cursor, model, direction, format):
+    """
+    Запрос COPY для всех полей таблицы модели.
+
+    :param cursor: Курсор (для экранирования идентификаторов).
+    :param model: Класс модели.
+    :param direction: 'TO STDOUT' или 'FROM STDIN'.
+    :param format: Имя формата.
+    :return: Строка SQL-запроса.
+    """
+    return sql.SQL("COPY {} ({}) {} WITH ({})").format(
+        sql.Identifier(model._plan.table),
+        sql.SQL(', ').join(map(sql.Identifier, model._plan.field_names)),
+        sql.SQL(direction),
+        sql.SQL(_COPY_OPTIONS[format]),
+    ).as_string(cursor)
+
+def _export_arrow(cursor, model, path, format, batch_size):
+    """
+    Выгрузка таблицы в Parquet или Arrow IPC: COPY пишет CSV в канал из отдельного потока,
+    а pyarrow читает канал пакетами и сразу записывает их в файл.
+
+    :return: Количество выгруженных строк.
+    """
+    schema = arrow_schema(model)
+    read_end, write_end = os.pipe()
+    errors = []
+
+    def produce():
+        try:
+            with os.fdopen(write_end, 'wb') as pipe:
+                cursor.copy_expert(_copy_sql(cursor, model, 'TO STDOUT', format), pipe)
+        except Exception as e:
+            errors.append(e)
+
+    producer = threading.Thread(target=produce, name=f"copy-{model._plan.table}", daemon=True)
+    producer.start()
+    rows = 0
+    try:
+        with os.fdopen(read_end, 'rb') as pipe:
+            reader = pa_csv.open_csv(
+                pipe,
+                read_options=pa_csv.ReadOptions(column_names=list(schema.names), block_size=max(batch_size * 64, 1 << 16)),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types=schema,
+                    null_values=[''],
+                    strings_can_be_null=True,
+                    quoted_strings_can_be_null=False,  # в CSV COPY пустая строка в кавычках — не NULL
+                ),
+            )
+            writer = pq.ParquetWriter(str(path), schema) if format == 'parquet' else pa_ipc.new_file(str(path), schema)
+            with writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+    finally:
+        producer.join()
+    if errors:
+        raise errors[0]
+    return rows
+
+class _ArrowCsvReader:
+    """
+    Файлоподобный объект для cursor.copy_expert: пакеты Arrow по запросу read(size)
+    превращаются в CSV без заголовка (NULL — пустое поле, пустая строка — "").
+    """
+
+    def __init__(self, batches):
+        self._batches = iter(batches)
+        self._buffer = b''
+        self.rows = 0
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            batch = next(self._batches, None)
+            if batch is None:
+                break
+            sink = pa.BufferOutputStream()
+            pa_csv.write_csv(pa.Table.from_batches([batch]), sink, write_options=pa_csv.WriteOptions(include_header=False))
+            self._buffer += sink.getvalue().to_pybytes()
+            self.rows += batch.num_rows
+        if size < 0:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+def _arrow_batches(model, path, format, batch_size):
+    """
+    Пакеты Arrow из файла Parquet или Arrow IPC, приведённые к схеме модели.
+
+    :yield: Объекты pyarrow.RecordBatch.
+    """
+    schema = arrow_schema(model)
+    if format == 'parquet':
+        batches = pq.ParquetFile(str(path)).iter_batches(batch_size=batch_size, columns=list(schema.names))
+    else:
+        reader = pa_ipc.open_file(str(path))
+        batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+    for batch in batches:
+        yield pa.RecordBatch.from_arrays(
+            [batch.column(batch.schema.get_field_index(name)).cast(schema.field(name).type) for name in schema.names], schema=schema
+        )
+
+def export_table(db, model, path, format=None, batch_size=65536):
+    """
+    Выгрузка таблицы модели в файл через COPY ... TO STDOUT.
+
+    :param db: Объект Database для подключения к базе данных.
+    :param model: Класс модели.
+    :param path: Путь к файлу.
+    :param format: 'csv', 'binary' (двоичный формат COPY), 'parquet' или 'arrow'. По умолчанию по расширению.
+    :param batch_size: Примерное количество строк в пакете Arrow/Parquet.
+    :return: Количество выгруженных строк.
+    """
+    format = detect_format(path, format)
+    with db.get_cursor() as cursor:
+        if format in ('parquet', 'arrow'):
+            return _export_arrow(cursor, model, path, format, batch_size)
+        with open(path, 'wb') as file:
+            cursor.copy_expert(_copy_sql(cursor, model, 'TO STDOUT', format), file)
+        return cursor.rowcount
+
+def import_table(db, model, path, format=None, batch_size=65536):
+    """
+    Загрузка таблицы модели из файла через COPY ... FROM STDIN в одной транзакции.
+    Строки добавляются к существующим; счётчик SERIAL первичного ключа после загрузки
+    переводится на максимальное значение ключа.
+
+    :param db: Объект Database для подключения к базе данных.
+    :param model: Класс модели.
+    :param path: Путь к файлу, созданному export_table.
+    :param format: 'csv', 'binary', 'parquet' или 'arrow'. По умолчанию по расширению.
+    :param batch_size: Количество строк в пакете при чтении Arrow/Parquet.
+    :return: Количество загруженных строк.
+    """
+    format = detect_format(path, format)
+    plan = model._plan
+    with db.transaction():
+        with db.get_cursor() as cursor:
+            query = _copy_sql(cursor, model, 'FROM STDIN', format)
+            if format in ('parquet', 'arrow'):
+                reader = _ArrowCsvReader(_arrow_batches(model, path, format, batch_size))
+                cursor.copy_expert(query, reader)
+                rows = reader.rows
+            else:
+                with open(path, 'rb') as file:
+                    cursor.copy_expert(query, file)
+                rows = cursor.rowcount
+            serial = plan.pk and dict(plan.fields)[plan.pk].type == FieldType.SERIAL.value
+            if serial and rows:
+                cursor.execute(
+                    sql.SQL("SELECT setval(pg_get_serial_sequence(%s, %s), (SELECT MAX({}) FROM {}))").format(
+                        sql.Identifier(plan.pk), sql.Identifier(plan.table)
+                    ),
+                    (plan.table, plan.pk),
+                )
+        db.invalidate(plan.table)
+    return rows
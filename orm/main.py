@@ -6,19 +6,37 @@
 
 Функции:
     - create_source_db_and_tables: Создает базу данных и таблицы.
+    - seed_table: Генерирует и загружает данные одной таблицы пакетами.
+    - seed_database: Заполняет таблицы данными в порядке зависимостей по внешним ключам.
     - generate_and_insert_data: Генерирует и вставляет данные в базу данных.
     - create_dump: Создает дамп базы данных и сохраняет его в файл.
 """
 
+import argparse
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 from lib.db import Database
 from lib.orm import (
-    Application, Users, Modification, Purchase, Checks, HWID, Operation, Subscription, Token, Version
-)
-from lib.data_generator import (
-    generate_application_data, generate_user_data, generate_modification_data, generate_purchase_data, 
-    generate_check_data, generate_hwid_data, generate_operation_data, generate_subscription_data, 
-    generate_token_data, generate_version_data
+    Application, Users, Modification, Purchase, Checks, HWID, Operation, Subscription, Token, Version, Model, ModelMeta
 )
+from lib.columnar_generator import generate_batches
+from lib.data_generator import chunk_seed
+
+# Количество строк каждой таблицы при масштабе 1
+BASE_COUNTS = {
+    Application: 10,
+    Users: 100,
+    Modification: 50,
+    Purchase: 200,
+    Checks: 200,
+    HWID: 100,
+    Operation: 300,
+    Subscription: 150,
+    Token: 100,
+    Version: 50,
+}
 
 def create_source_db_and_tables():
     """
@@ -29,111 +47,136 @@ def create_source_db_and_tables():
     db_name = 'source_db'
     db = Database(db_name)
 
-    # Создание таблиц для всех моделей
-    Application.create_table(db)
-    Modification.create_table(db)
-    Users.create_table(db)
-    Purchase.create_table(db)
-    Checks.create_table(db)
-    HWID.create_table(db)
-    Operation.create_table(db)
-    Subscription.create_table(db)
-    Token.create_table(db)
-    Version.create_table(db)
-
-    # Создание таблиц many-to-many для Users после создания всех таблиц
-    Users.create_many_to_many_tables(db)
+    # Создание таблиц всех моделей (в порядке зависимостей), таблиц many-to-many
+    # и индексов по внешним ключам одной транзакцией
+    Model.create_all(db, index_foreign_keys=True)
     
     print(f"База данных '{db_name}' и таблицы успешно созданы.")
     return db
 
-def generate_and_insert_data(db):
+def seed_table(db, model, count, ids, seed=0, batch_size=10000):
     """
-    Генерация и вставка данных в базу данных.
+    Генерация и загрузка данных одной таблицы: пакеты колоночного генератора сразу
+    загружаются через Model.bulk_load, без промежуточных объектов модели.
 
     :param db: Объект Database для подключения к базе данных.
+    :param model: Класс модели.
+    :param count: Количество строк.
+    :param ids: Словарь {таблица: список первичных ключей} уже загруженных таблиц.
+    :param seed: Seed генерации таблицы.
+    :param batch_size: Количество строк в пакете генерации и загрузки.
+    :return: Список первичных ключей загруженных строк.
     """
-    db.delete_all_data()
-    print("Генерация данных...")
+    # Имена списков идентификаторов генератора совпадают со столбцами, на которые ссылаются
+    # внешние ключи: app_availability -> application(app_id) -> app_ids
+    foreign_ids = {f"{relation.column}s": ids[relation.table] for relation in model._plan.relations.values()}
+    pks = []
+    for batch in generate_batches(model, count, batch_size=batch_size, seed=seed, **foreign_ids):
+        pks.extend(model.bulk_load(db, batch.rows(), batch_size=batch_size))
+    return pks
+
+def seed_database(db, scale=1, workers=4, batch_size=10000, seed=0, counts=None):
+    """
+    Заполнение таблиц данными в порядке зависимостей по внешним ключам (ModelMeta.dependency_graph).
+    Таблица загружается, как только загружены все таблицы, на которые она ссылается, поэтому
+    независимые таблицы (например, operation, hwid и subscription после users) загружаются
+    параллельно. Идентификаторы родительских строк берутся из результата их загрузки (RETURNING)
+    и хранятся только для таблиц, на которые кто-то ссылается.
 
-    # Генерация и вставка данных для модели Application
-    apps = list(generate_application_data(10))
-    for app in apps:
-        app.save(db)
-    app_ids = [app.app_id for app in Application.get_all(db)]
-    print(f"Сгенерировано {len(app_ids)} приложений")
-
-    # Генерация и вставка данных для модели Users
-    users = list(generate_user_data(100, app_ids))
-    for user in users:
-        user.save(db)
-    user_ids = [user.user_id for user in Users.get_all(db)]
-    print(f"Сгенерировано {len(user_ids)} пользователей")
-
-    # Генерация и вставка данных для модели Modification
-    mods = list(generate_modification_data(50, app_ids))
-    for mod in mods:
-        mod.save(db)
-    mod_ids = [mod.mod_id for mod in Modification.get_all(db)]
-    print(f"Сгенерировано {len(mod_ids)} модификаций")
-
-    # Генерация и вставка данных для модели Purchase
-    purchases = list(generate_purchase_data(200, user_ids, mod_ids))
-    for purchase in purchases:
-        purchase.save(db)
-    purchase_ids = [purchase.purchase_id for purchase in Purchase.get_all(db)]
-    print(f"Сгенерировано {len(purchase_ids)} покупок")
-
-    # Генерация и вставка данных для модели Checks
-    checks = list(generate_check_data(200, purchase_ids))
-    for chk in checks:
-        chk.save(db)
-    print(f"Сгенерировано 200 чеков")
-
-    # Генерация и вставка данных для модели HWID
-    hwids = list(generate_hwid_data(100, user_ids))
-    for hw in hwids:
-        hw.save(db)
-    hwid_ids = [hw.hwid_id for hw in HWID.get_all(db)]
-    print(f"Сгенерировано {len(hwid_ids)} HWID записей")
-
-    # Генерация и вставка данных для модели Operation
-    operations = list(generate_operation_data(300, user_ids))
-    for operation in operations:
-        operation.save(db)
-    print(f"Сгенерировано {len(operations)} операций")
-        
-    # Генерация и вставка данных для модели Subscription
-    subscriptions = list(generate_subscription_data(150, user_ids, mod_ids))
-    for subscription in subscriptions:
-        subscription.save(db)
-    print(f"Сгенерировано {len(subscriptions)} подписок")
-    
-    # Генерация и вставка данных для модели Token
-    tokens = list(generate_token_data(100, user_ids, hwid_ids))
-    for token in tokens:
-        token.save(db)
-    print(f"Сгенерировано {len(tokens)} токенов")
+    :param db: Объект Database для подключения к базе данных.
+    :param scale: Масштаб: количество строк таблицы равно BASE_COUNTS * scale.
+    :param workers: Количество таблиц, загружаемых одновременно.
+    :param batch_size: Количество строк в пакете генерации и загрузки.
+    :param seed: Общий seed генерации.
+    :param counts: Словарь {класс модели: количество строк при масштабе 1}. По умолчанию BASE_COUNTS.
+        Должен содержать все таблицы, на которые ссылаются внешние ключи перечисленных таблиц, иначе ValueError.
+    :return: Словарь {таблица: (количество строк, время загрузки в секундах)}.
+    """
+    counts = {model: max(1, round(count * scale)) for model, count in (counts or BASE_COUNTS).items()}
+    # Внешние ключи каждой таблицы должны ссылаться на загружаемые таблицы — проверяется до начала загрузки
+    tables = {model._plan.table for model in counts}
+    for model in counts:
+        missing = sorted({relation.table for relation in model._plan.relations.values()} - tables)
+        if missing:
+            raise ValueError(
+                f"Cannot seed '{model._plan.table}' without its parent tables: {', '.join(missing)}; add them to counts"
+            )
+    pending = ModelMeta.dependency_graph(counts)
+    referenced = {parent for parents in pending.values() for parent in parents}
+    ids = {}
+    loaded = set()
+    stats = {}
+
+    def load(model):
+        table = model._plan.table
+        start_time = time.perf_counter()
+        table_seed = zlib.crc32(chunk_seed(seed, table).encode())
+        pks = seed_table(db, model, counts[model], ids, seed=table_seed, batch_size=batch_size)
+        return pks, time.perf_counter() - start_time
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        while pending or running:
+            for model in [model for model, parents in pending.items() if parents <= loaded]:
+                del pending[model]
+                running[executor.submit(load, model)] = model
+            if not running:
+                raise ValueError(f"Circular foreign keys between {', '.join(model.__name__ for model in pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                model = running.pop(future)
+                pks, elapsed = future.result()
+                if model in referenced:
+                    ids[model._plan.table] = pks
+                loaded.add(model)
+                stats[model._plan.table] = (len(pks), elapsed)
+                print(f"{model._plan.table}: {len(pks)} строк за {elapsed:.2f} с ({len(pks) / elapsed:.0f} строк/с)")
+    return stats
+
+def generate_and_insert_data(db, scale=1, workers=4, batch_size=10000, seed=0):
+    """
+    Генерация и вставка данных в базу данных.
 
-    # Генерация и вставка данных для модели Version
-    versions = list(generate_version_data(50, mod_ids))
-    for version in versions:
-        version.save(db)
-    print(f"Сгенерировано {len(versions)} версий")
+    :param db: Объект Database для подключения к базе данных.
+    :param scale: Масштаб объёма данных (см. seed_database).
+    :param workers: Количество таблиц, загружаемых одновременно.
+    :param batch_size: Количество строк в пакете генерации и загрузки.
+    :param seed: Общий seed генерации.
+    """
+    # Очистка всех таблиц моделей одним TRUNCATE ... RESTART IDENTITY CASCADE
+    Model.truncate_all(db)
+    print("Генерация данных...")
 
-    print("Данные сгенерированы и успешно вставлены.")
+    start_time = time.perf_counter()
+    stats = seed_database(db, scale=scale, workers=workers, batch_size=batch_size, seed=seed)
+    total = sum(rows for rows, _ in stats.values())
+    print(f"Данные сгенерированы и успешно вставлены: {total} строк за {time.perf_counter() - start_time:.2f} с.")
 
-def create_dump(db, output_file):
+def create_dump(db, output_file, jobs=1):
     """
-    Создание дампа базы данных и сохранение его в файл.
+    Создание дампа базы данных и сохранение его в файл (при jobs > 1 — в каталог,
+    с параллельной выгрузкой таблиц).
 
     :param db: Объект Database для подключения к базе данных.
-    :param output_file: Имя файла для сохранения дампа.
+    :param output_file: Имя файла или каталога для сохранения дампа.
+    :param jobs: Количество параллельных процессов pg_dump.
     """
-    db.create_dump(output_file)
-    print(f"Дамп базы данных '{db.dbname}' создан в файле '{output_file}'.")
+    def report(table, seconds, done):
+        print(f"  [{done}] {table}: {seconds:.2f} с")
+
+    start_time = time.perf_counter()
+    db.create_dump(output_file, jobs=jobs, progress=report)
+    print(f"Дамп базы данных '{db.dbname}' создан в '{output_file}' за {time.perf_counter() - start_time:.2f} с.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Создание и заполнение базы данных source_db.")
+    parser.add_argument("--scale", type=float, default=1, help="Масштаб объёма данных (1 — базовый объём).")
+    parser.add_argument("--workers", type=int, default=4, help="Количество таблиц, загружаемых одновременно.")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Количество строк в пакете загрузки.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed генерации данных.")
+    parser.add_argument("--dump-jobs", type=int, default=1, help="Количество параллельных процессов pg_dump (> 1 — формат каталога).")
+    args = parser.parse_args()
+
     db = create_source_db_and_tables()
-    generate_and_insert_data(db)
-    create_dump(db, "source_db_dump.sql")
\ No newline at end of file
+    generate_and_insert_data(db, scale=args.scale, workers=args.workers, batch_size=args.batch_size, seed=args.seed)
+    create_dump(db, "source_db_dump" if args.dump_jobs > 1 else "source_db_dump.sql", jobs=args.dump_jobs)
\ No newline at end of file
@@ -5,6 +5,7 @@
     sys, os: для добавления пути до модулей проекта.
     pytest: для организации тестов и фикстур.
     datetime: для работы с датой и временем.
+    random: для воспроизводимой генерации данных с фиксированным seed.
     Модули и функции проекта: импорт объектов базы данных, генераторов данных и моделей ORM.
     
 Фикстуры:
@@ -27,16 +28,60 @@
     test_filter_method: Проверка метода фильтрации данных для модели Users.
     test_update_method: Проверка метода обновления данных для модели Users.
     test_delete_method: Проверка метода удаления данных для модели Users.
+    test_connection_pool_reuse: Проверка повторного использования соединений пула.
+    test_connection_pool_idle_eviction: Проверка вытеснения простаивающих соединений пула.
+    test_bulk_save: Проверка массовой вставки с заполнением первичных ключей.
+    test_iter_all_streaming: Проверка потокового чтения таблицы через серверный курсор.
+    test_iter_filter_streaming: Проверка потоковой фильтрации и досрочного прекращения итерации.
+    test_iter_all_writes_persist: Проверка сохранения записей, сделанных в теле цикла по iter_all.
+    test_model_plan: Проверка плана модели, собранного метаклассом, и кеша запросов filter.
+    test_save_returns_primary_key: Проверка заполнения первичного ключа и полей после save.
+    test_slots_instances: Проверка компактного представления объектов и позиционного конструктора.
+    test_queryset_lookups: Проверка ленивого QuerySet с условиями, сортировкой и пагинацией.
+    test_queryset_count_exists_only: Проверка count/exists/only на стороне базы данных.
+    test_transaction_commit_and_rollback: Проверка общей транзакции для нескольких вызовов ORM.
+    test_transaction_nested_savepoint: Проверка вложенных транзакций через SAVEPOINT.
+    test_prepared_statements: Проверка выполнения горячих запросов через PREPARE/EXECUTE.
+    test_prewarm_prepared_statements: Проверка заблаговременной подготовки выражений для всех моделей.
+    test_async_crud: Проверка асинхронных методов моделей через AsyncDatabase.
+    test_async_writes_invalidate_shared_cache: Проверка инвалидации общего кеша асинхронными записями.
+    test_update_returning_and_bulk_update: Проверка UPDATE ... RETURNING и массового обновления Model.bulk_update.
+    test_delete_many_and_queryset_delete: Проверка удаления по первичным ключам (= ANY) и по условиям QuerySet.
+    test_query_cache: Проверка кеша результатов чтения, его инвалидации записями и счётчиков.
+    test_query_cache_lru_and_ttl: Проверка вытеснения LRU и истечения TTL записей кеша.
+    test_index_declarations: Проверка объявлений индексов в docstring и их создания в create_table.
+    test_select_related_and_prefetch_related: Проверка загрузки связанных объектов через JOIN и пакетные запросы.
+    test_many_to_many_manager: Проверка менеджера many-to-many с пакетными add/remove/set и загрузкой связей.
+    test_generate_parallel_is_reproducible: Проверка воспроизводимости параллельной генерации при разном числе процессов.
+    test_columnar_generation: Проверка колоночной генерации на NumPy и загрузки её пакетов в базу данных.
+    test_bulk_load_and_dependency_graph: Проверка загрузки готовых строк и графа зависимостей моделей по внешним ключам.
+    test_seed_database: Проверка конвейера заполнения базы данных в порядке зависимостей по внешним ключам.
+    test_create_all_and_drop_all: Проверка создания и удаления схемы в порядке зависимостей и пропуска неизменной схемы.
+    test_sandbox_pool: Проверка выдачи песочниц, скопированных из шаблона со схемой и из шаблона с данными.
+    test_replace_all_data: Проверка атомарной замены данных таблицы через COPY в промежуточную таблицу.
+    test_replace_all_data_swap: Проверка подмены таблицы переименованием промежуточной с переносом индексов и ключей.
+    test_truncate_all: Проверка очистки всех или выбранных таблиц моделей одним TRUNCATE со сбросом счётчиков.
+    test_export_tables: Проверка параллельной выгрузки таблиц через COPY из одного снимка данных.
+    test_parallel_dump_and_restore: Проверка дампа в формате каталога и параллельного восстановления с замером по таблицам.
+    test_export_import_copy_formats: Проверка потоковой выгрузки и загрузки модели в CSV и двоичном формате COPY.
+    test_export_import_arrow_formats: Проверка выгрузки и загрузки модели в Parquet и Arrow по схеме из FieldType.
+    test_benchmark_statistics: Проверка перцентилей и доверительных интервалов квантилей по порядковым статистикам.
+    test_benchmark_repetitions: Проверка прогрева, адаптивного числа повторов и записи результатов замеров в JSON.
 """
 
+
 import sys
 import os
 
 # Добавляем путь к родительской директории для корректного импорта модулей
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import asyncio
+import json
+import random
+import shutil
 import pytest
-from datetime import datetime
+from datetime import date, datetime
 from lib.data_generator import (
     generate_application_data,
     generate_user_data,
@@ -47,9 +92,17 @@ from lib.data_generator import (
     generate_operation_data,
     generate_subscription_data,
     generate_token_data,
-    generate_version_data
+    generate_version_data,
+    generate_parallel,
+    chunk_seed
 )
+from lib.benchmark import benchmark, percentile, quantile_ci, summarize, write_json
+from lib.columnar_generator import generate_batches
+from main import seed_database
+from lib.async_db import AsyncDatabase
+from lib.cache import QueryCache, written_tables
 from lib.db import Database
+from lib.sandbox import SandboxPool
 from lib.orm import (
     Application,
     Users,
@@ -60,7 +113,10 @@ from lib.orm import (
     Operation,
     Subscription,
     Token,
-    Version
+    Version,
+    Index,
+    Model,
+    ModelMeta
 )
 
 # Имя тестовой базы данных
@@ -88,29 +144,13 @@ def setup_and_teardown(db):
 
     :param db: Объект Database для подключения к базе данных.
     """
-    Application.create_table(db)
-    Modification.create_table(db)
-    Users.create_table(db)
-    Purchase.create_table(db)
-    Checks.create_table(db)
-    HWID.create_table(db)
-    Operation.create_table(db)
-    Subscription.create_table(db)
-    Token.create_table(db)
-    Version.create_table(db)
-
-    Users.create_many_to_many_tables(db)
+    # Схема создаётся одной транзакцией и только при первом вызове (далее отпечаток схемы совпадает)
+    Model.create_all(db)
 
     yield
     
-    # Удаление данных из всех таблиц в правильной последовательности
-    tables = [
-        'checks', 'purchase', 'subscription', 'token', 'operation', 
-        'hwid', 'version', 'users_modification', 'modification', 
-        'users', 'application'
-    ]
-    for table in tables:
-        db.delete_all_data(table)
+    # Очистка всех таблиц моделей (включая many-to-many) одним TRUNCATE ... RESTART IDENTITY CASCADE
+    Model.truncate_all(db)
 
 def test_application_insert(db):
     """
@@ -441,11 +481,8 @@ def test_many_to_many_insert(db):
     )
     user.save(db)
     user_id = user.user_id
-    
-    with db.get_cursor() as cursor:
-        cursor.execute(
-            f"INSERT INTO users_modification (user_id, mod_id) VALUES ({user_id}, {mod_id})"
-        )
+
+    Users.m2m('subscriptions').add(db, user, [mod])
     
     with db.get_cursor() as cursor:
         cursor.execute("SELECT * FROM users_modification")
@@ -512,4 +549,974 @@ def test_generate_data(db):
     assert len(HWID.get_all(db)) == 1
     assert len(Operation.get_all(db)) == 1
     assert len(Subscription.get_all(db)) == 1
-    assert len(Token.get_all(db)) == 1
\ No newline at end of file
+    assert len(Token.get_all(db)) == 1
+
+def test_connection_pool_reuse():
+    """
+    Тест повторного использования соединений пула: несколько операций ORM не открывают новых соединений.
+    """
+    pooled_db = Database(DATABASE_NAME, pooled=True, pool_min_size=1, pool_max_size=2)
+    try:
+        for i in range(5):
+            Application(app_name=f"Pooled {i}").save(pooled_db)
+        assert len(Application.get_all(pooled_db)) == 5
+
+        stats = pooled_db.pool_stats()
+        assert stats['created'] == 1
+        assert stats['reused'] == 6
+        assert stats['in_use'] == 0
+        assert stats['idle'] == 1
+
+        # Блок with закрывает только своё соединение, пул продолжает работать
+        with pooled_db:
+            pass
+        Application(app_name="After with").save(pooled_db)
+        assert pooled_db.pool_stats()['created'] == 1
+    finally:
+        pooled_db.close()
+
+def test_connection_pool_idle_eviction():
+    """
+    Тест вытеснения простаивающих соединений сверх минимального размера пула.
+    """
+    pooled_db = Database(DATABASE_NAME, pooled=True, pool_min_size=0, pool_max_size=2, pool_max_idle=0)
+    try:
+        with pooled_db.get_cursor() as cur:
+            cur.execute("SELECT 1")
+        with pooled_db.get_cursor() as cur:
+            cur.execute("SELECT 1")
+
+        stats = pooled_db.pool_stats()
+        assert stats['created'] == 2
+        assert stats['evicted'] == 1
+        assert stats['size'] == 1
+    finally:
+        pooled_db.close()
+
+def test_bulk_save(db):
+    """
+    Тест массовой вставки: первичные ключи возвращаются в объекты в порядке входного списка.
+    """
+    apps = [Application(app_name=f"Bulk {i}") for i in range(7)]
+    Application.bulk_save(db, apps, batch_size=3)
+
+    app_ids = [app.app_id for app in apps]
+    assert all(app_id is not None for app_id in app_ids)
+    assert app_ids == sorted(app_ids)
+
+    stored = {app.app_id: app.app_name for app in Application.get_all(db)}
+    assert stored == {app.app_id: app.app_name for app in apps}
+
+    purchases = Purchase.bulk_save(db, generate_purchase_data(5, [None], [None]))
+    assert len({purchase.purchase_id for purchase in purchases}) == 5
+
+def test_iter_all_streaming(db):
+    """
+    Тест потокового чтения таблицы порциями через серверный курсор.
+    """
+    Application.bulk_save(db, [Application(app_name=f"Stream {i}") for i in range(25)])
+
+    streamed = list(Application.iter_all(db, chunk_size=4))
+    assert len(streamed) == 25
+    assert {app.app_name for app in streamed} == {f"Stream {i}" for i in range(25)}
+
+def test_iter_filter_streaming(db):
+    """
+    Тест потоковой фильтрации и досрочного прекращения итерации.
+    """
+    Application.bulk_save(db, [Application(app_name="Even" if i % 2 == 0 else "Odd") for i in range(10)])
+
+    evens = list(Application.iter_filter(db, chunk_size=2, app_name="Even"))
+    assert len(evens) == 5
+    assert all(app.app_name == "Even" for app in evens)
+
+    stream = Application.iter_filter(db, chunk_size=2, app_name="Odd")
+    first = next(stream)
+    stream.close()
+    assert first.app_name == "Odd"
+    assert len(Application.get_all(db)) == 10
+
+def test_iter_all_writes_persist(db):
+    """
+    Тест записи в теле цикла по iter_all: серверный курсор не открывает транзакцию потока,
+    поэтому досрочный выход из цикла не откатывает сделанные в нём изменения.
+    """
+    Application.bulk_save(db, [Application(app_name=f"Stream {i}") for i in range(5)])
+
+    for app in Application.iter_all(db, chunk_size=2):
+        assert not db.in_transaction
+        Application(app_name="Written during iteration").save(db)
+        break
+    assert len(Application.filter(db, app_name="Written during iteration")) == 1
+
+    # Внутри transaction() курсор работает в транзакции вызывающего, записи фиксируются вместе с ней
+    with db.transaction():
+        for app in Application.iter_all(db, chunk_size=2):
+            Application(app_name="Written in transaction").save(db)
+            break
+    assert len(Application.filter(db, app_name="Written in transaction")) == 1
+
+def test_model_plan():
+    """
+    Тест плана модели: поля, первичный ключ и кеширование запросов filter по набору условий.
+    """
+    plan = Purchase._plan
+    assert plan.table == 'purchase'
+    assert plan.pk == 'purchase_id'
+    assert plan.field_names == ('purchase_id', 'user_id', 'mod_id', 'purchase_date')
+    assert plan.insert_columns == ('user_id', 'mod_id', 'purchase_date')
+
+    query, keys = plan.filter_sql({'mod_id': 1, 'user_id': 2})
+    assert keys == ('user_id', 'mod_id')
+    assert query.endswith("WHERE user_id = %s AND mod_id = %s")
+    assert plan.filter_sql({'user_id': 3, 'mod_id': 4})[0] is query
+
+    with pytest.raises(ValueError):
+        plan.filter_sql({'user_id; DROP TABLE purchase': 1})
+    with pytest.raises(AttributeError):
+        plan.pk = 'user_id'
+
+def test_save_returns_primary_key(db):
+    """
+    Тест заполнения первичного ключа и полей объекта значениями, возвращёнными базой.
+    """
+    app = Application(app_name="Returning")
+    app.save(db)
+    assert app.app_id is not None
+    assert app.app_name == "Returning"
+    assert Application.filter(db, app_id=app.app_id)[0].app_name == "Returning"
+
+def test_slots_instances(db):
+    """
+    Тест компактного представления объектов на __slots__ и позиционного конструктора для строк из базы.
+    """
+    operation = Operation(operation_type="LOGIN")
+    assert not hasattr(operation, '__dict__')
+    assert operation.operation_id is None
+    assert operation.operation_date is None
+
+    with pytest.raises(TypeError):
+        Operation(unknown_field=1)
+
+    hydrated = Operation._hydrate((7, 3, "LOGOUT", None))
+    assert (hydrated.operation_id, hydrated.user_id, hydrated.operation_type) == (7, 3, "LOGOUT")
+
+    Application.bulk_save(db, [Application(app_name="Slots")])
+    app = Application.get_all(db)[0]
+    assert app.app_name == "Slots"
+    assert not hasattr(app, '__dict__')
+
+def test_queryset_lookups(db):
+    """
+    Тест ленивого QuerySet: lookup-условия, сортировка, limit/offset и отложенное выполнение.
+    """
+    apps = Application.bulk_save(db, [Application(app_name=f"App {i:02d}") for i in range(10)])
+    ids = [app.app_id for app in apps]
+
+    queryset = Application.objects(db).filter(app_id__in=ids[:5])
+    assert queryset._result_cache is None
+    assert sorted(app.app_id for app in queryset) == ids[:5]
+
+    assert [app.app_id for app in Application.objects(db).filter(app_id__gt=ids[7]).order_by('app_id')] == ids[8:]
+    assert [app.app_id for app in Application.objects(db).filter(app_id__lt=ids[2]).order_by('-app_id')] == [ids[1], ids[0]]
+    assert len(Application.objects(db).filter(app_id__range=(ids[2], ids[4]))) == 3
+    assert len(Application.objects(db).filter(app_name__like="App 0%")) == 10
+    assert len(Application.objects(db).exclude(app_id__in=ids[:3])) == 7
+
+    page = Application.objects(db).order_by('app_id').limit(3).offset(2)
+    assert [app.app_id for app in page] == ids[2:5]
+    assert Application.objects(db).order_by('-app_id').first().app_id == ids[-1]
+
+    with pytest.raises(ValueError):
+        Application.objects(db).filter(app_id__between=1)
+
+def test_queryset_count_exists_only(db):
+    """
+    Тест count/exists с вычислением на стороне базы данных и загрузки части полей через only.
+    """
+    Application.bulk_save(db, [Application(app_name=f"Count {i}") for i in range(6)])
+
+    assert Application.objects(db).count() == 6
+    assert Application.objects(db).filter(app_name="Count 1").count() == 1
+    assert Application.objects(db).limit(4).count() == 4
+    assert Application.objects(db).exists()
+    assert not Application.objects(db).filter(app_name="Missing").exists()
+
+    query, params = Application.objects(db).only('app_id').filter(app_name="Count 2").compile()
+    assert query == "SELECT app_id, NULL AS app_name FROM application WHERE (app_name = %s)"
+    assert params == ["Count 2"]
+
+    app = Application.objects(db).only('app_id').filter(app_name="Count 2").first()
+    assert app.app_id is not None
+    assert app.app_name is None
+
+def test_transaction_commit_and_rollback(db):
+    """
+    Тест общей транзакции: все вызовы ORM внутри блока используют одно соединение
+    и фиксируются вместе либо откатываются вместе.
+    """
+    with db.transaction() as conn:
+        assert conn is db.conn
+        app = Application(app_name="Tx Application")
+        app.save(db)
+        mod = Modification(mod_name="Tx Mod", mod_desc="", app_id=app.app_id)
+        mod.save(db)
+        Version.bulk_save(db, generate_version_data(3, [mod.mod_id]))
+        assert Version.objects(db).filter(mod_id=mod.mod_id).count() == 3
+    assert len(Version.filter(db, mod_id=mod.mod_id)) == 3
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            Application(app_name="Rolled back").save(db)
+            raise RuntimeError("abort")
+    assert Application.filter(db, app_name="Rolled back") == []
+    assert not db.in_transaction
+
+def test_transaction_nested_savepoint(db):
+    """
+    Тест вложенной транзакции: ошибка во вложенном блоке откатывает только его изменения.
+    """
+    pooled_db = Database(DATABASE_NAME, pooled=True, pool_min_size=1, pool_max_size=1)
+    try:
+        with pooled_db.transaction():
+            Application(app_name="Outer").save(pooled_db)
+            with pytest.raises(ValueError):
+                with pooled_db.transaction():
+                    Application(app_name="Inner").save(pooled_db)
+                    raise ValueError("inner failure")
+            Application(app_name="After inner").save(pooled_db)
+
+        names = sorted(app.app_name for app in Application.get_all(pooled_db))
+        assert names == ["After inner", "Outer"]
+        assert pooled_db.pool_stats()['created'] == 1
+    finally:
+        pooled_db.close()
+
+def test_prepared_statements():
+    """
+    Тест выполнения save/filter/update/delete через подготовленные выражения на соединении пула.
+    """
+    prepared_db = Database(DATABASE_NAME, pooled=True, pool_min_size=1, pool_max_size=1, use_prepared=True)
+    try:
+        app = Application(app_name="Prepared")
+        app.save(prepared_db)
+        assert Application.filter(prepared_db, app_id=app.app_id)[0].app_name == "Prepared"
+        app.update(prepared_db, app_name="Prepared again")
+        assert Application.filter(prepared_db, app_id=app.app_id)[0].app_name == "Prepared again"
+        app.delete(prepared_db)
+        assert Application.filter(prepared_db, app_id=app.app_id) == []
+
+        with prepared_db.get_cursor() as cur:
+            cur.execute("SELECT name FROM pg_prepared_statements")
+            server_side = {row[0] for row in cur.fetchall()}
+            assert server_side == cur.connection.prepared_statements
+        assert len(server_side) == 4  # INSERT, SELECT по ключу, UPDATE, DELETE
+    finally:
+        prepared_db.close()
+
+def test_prewarm_prepared_statements():
+    """
+    Тест заблаговременной подготовки выражений для всех моделей реестра на соединениях пула.
+    """
+    prepared_db = Database(DATABASE_NAME, pooled=True, pool_min_size=2, pool_max_size=2, use_prepared=True)
+    try:
+        Application.prewarm_statements(prepared_db)
+        with prepared_db.get_cursor() as cur:
+            prepared = cur.connection.prepared_statements
+            cur.execute("SELECT count(*) FROM pg_prepared_statements")
+            assert cur.fetchone()[0] == len(prepared) > 0
+
+        app = Application(app_name="Prewarmed")
+        app.save(prepared_db)
+        assert Application.filter(prepared_db, app_id=app.app_id)[0].app_name == "Prewarmed"
+    finally:
+        prepared_db.close()
+
+def test_async_crud():
+    """
+    Тест асинхронных методов моделей: одна схема моделей обслуживает синхронный и асинхронный код.
+    """
+    pytest.importorskip("psycopg")
+
+    async def scenario():
+        async with AsyncDatabase(DATABASE_NAME, pool_min_size=1, pool_max_size=3) as adb:
+            apps = [Application(app_name=f"Async {i}") for i in range(3)]
+            await asyncio.gather(*(app.asave(adb) for app in apps))
+            assert all(app.app_id is not None for app in apps)
+
+            assert len(await Application.aget_all(adb)) == 3
+            found = await Application.afilter(adb, app_id=apps[0].app_id)
+            assert found[0].app_name == "Async 0"
+
+            await apps[1].aupdate(adb, app_name="Async updated")
+            assert apps[1].app_name == "Async updated"
+
+            await apps[2].adelete(adb)
+            rows = await Application.arawsql(adb, "SELECT app_name FROM application ORDER BY app_id", None)
+            assert [row[0] for row in rows] == ["Async 0", "Async updated"]
+            assert adb.pool_stats()['in_use'] == 0
+
+    asyncio.run(scenario())
+
+def test_async_writes_invalidate_shared_cache():
+    """
+    Тест общего кеша синхронного и асинхронного движков: асинхронные записи инвалидируют его.
+    """
+    pytest.importorskip("psycopg")
+    cache = QueryCache(tables=[Application])
+    cached_db = Database(DATABASE_NAME, cache=cache)
+
+    async def scenario():
+        async with AsyncDatabase(DATABASE_NAME, pool_min_size=1, pool_max_size=1, cache=cache) as adb:
+            app = Application(app_name="Shared")
+            await app.asave(adb)
+            assert [a.app_name for a in Application.get_all(cached_db)] == ["Shared"]
+
+            await app.aupdate(adb, app_name="Shared updated")
+            assert [a.app_name for a in Application.get_all(cached_db)] == ["Shared updated"]
+
+            await Application.arawsql(adb, "INSERT INTO application (app_name) VALUES (%s)", ("Raw",))
+            assert len(Application.get_all(cached_db)) == 2
+
+            await app.adelete(adb)
+            assert [a.app_name for a in Application.get_all(cached_db)] == ["Raw"]
+
+    asyncio.run(scenario())
+
+def test_update_returning_and_bulk_update(db):
+    """
+    Тест UPDATE ... RETURNING и массового обновления разными значениями через UPDATE ... FROM (VALUES ...).
+    """
+    app = Application(app_name="Before")
+    app.save(db)
+    app.update(db, app_name="After")
+    assert app.app_name == "After"
+    assert Application.filter(db, app_id=app.app_id)[0].app_name == "After"
+
+    tokens = Token.bulk_save(db, [Token(last_login=datetime(2024, 1, 1)) for _ in range(7)])
+    for i, token in enumerate(tokens):
+        token.last_login = datetime(2024, 2, i + 1, 12, 30)
+    assert Token.bulk_update(db, tokens, ['last_login'], batch_size=3) == 7
+
+    stored = {token.token_id: token.last_login for token in Token.get_all(db)}
+    assert stored == {token.token_id: token.last_login for token in tokens}
+
+    with pytest.raises(ValueError):
+        Token.bulk_update(db, [Token(last_login=datetime(2024, 1, 1))], ['last_login'])
+    with pytest.raises(ValueError):
+        Token.bulk_update(db, tokens, ['unknown_field'])
+
+def test_delete_many_and_queryset_delete(db):
+    """
+    Тест удаления по списку первичных ключей и удаления по условиям без загрузки объектов.
+    """
+    apps = Application.bulk_save(db, [Application(app_name=f"Delete {i}") for i in range(10)])
+    ids = [app.app_id for app in apps]
+
+    assert Application.delete_many(db, ids[:3] + [-1], batch_size=2) == 3
+    assert Application.delete_many(db, []) == 0
+    assert Application.objects(db).count() == 7
+
+    assert Application.objects(db).filter(app_name__in=["Delete 3", "Delete 4"]).delete() == 2
+    assert Application.objects(db).order_by('app_id').limit(1).delete() == 1
+    assert [app.app_id for app in Application.get_all(db)] == sorted(ids[6:])
+
+    assert Application.objects(db).filter(app_id__gte=ids[6]).delete(batch_size=2) == 4
+    assert Application.objects(db).count() == 0
+
+    # Каждый пакет фиксируется сразу: ошибка в следующем пакете не откатывает предыдущие
+    apps = Application.bulk_save(db, [Application(app_name=f"Batch {i}") for i in range(3)])
+    with pytest.raises(Exception):
+        Application.delete_many(db, [apps[0].app_id, apps[1].app_id, "not a number"], batch_size=2)
+    assert [app.app_id for app in Application.get_all(db)] == [apps[2].app_id]
+
+def test_query_cache():
+    """
+    Тест кеша результатов чтения: повторные чтения обслуживаются из кеша, записи через ORM,
+    QuerySet и rawsql инвалидируют записи изменённой таблицы.
+    """
+    cached_db = Database(DATABASE_NAME, pooled=True, pool_max_size=2, cache=QueryCache(tables=[Application]))
+    try:
+        app = Application(app_name="Cached")
+        app.save(cached_db)
+        assert len(Application.get_all(cached_db)) == 1
+        assert len(Application.get_all(cached_db)) == 1
+        assert Application.objects(cached_db).filter(app_name="Cached").first().app_id == app.app_id
+        assert cached_db.cache_stats()['hits'] == 1
+
+        app.update(cached_db, app_name="Renamed")
+        assert Application.get_all(cached_db)[0].app_name == "Renamed"
+
+        Application.rawsql(cached_db, "UPDATE application SET app_name = %s", ("Raw",))
+        assert Application.filter(cached_db, app_id=app.app_id)[0].app_name == "Raw"
+
+        with cached_db.transaction():
+            Application(app_name="In transaction").save(cached_db)
+            assert len(Application.get_all(cached_db)) == 2
+        assert len(Application.get_all(cached_db)) == 2
+
+        Application.objects(cached_db).delete()
+        assert Application.get_all(cached_db) == []
+
+        Token(last_login=datetime(2024, 1, 1)).save(cached_db)
+        Token.get_all(cached_db)
+        stats = cached_db.cache_stats()
+        assert stats['size'] == 1  # Token не входит в кешируемые таблицы
+        assert stats['invalidations'] >= 4
+    finally:
+        cached_db.close()
+
+    assert written_tables("SELECT * FROM application") == set()
+    assert written_tables("DELETE FROM token WHERE token_id = %s") == {'token'}
+    assert written_tables("VACUUM") is None
+
+def test_query_cache_lru_and_ttl(monkeypatch):
+    """
+    Тест вытеснения давно не использованных записей и истечения времени жизни записей кеша.
+    """
+    cache = QueryCache(max_size=2, ttl=10)
+    cache.set('a', 'q1', None, [(1,)])
+    cache.set('a', 'q2', [1, 2], [(2,)])
+    assert cache.get('q1') == (True, [(1,)])
+    cache.set('b', 'q3', None, [(3,)])  # вытесняет q2
+    assert cache.get('q2', [1, 2]) == (False, None)
+    assert cache.stats()['evictions'] == 1
+
+    generation = cache.generation('a')
+    cache.invalidate('a')
+    cache.set('a', 'q1', None, [(1,)], generation)  # прочитано до инвалидации — не сохраняется
+    assert cache.get('q1') == (False, None)
+
+    import lib.cache
+    now = lib.cache.time.monotonic()
+    monkeypatch.setattr(lib.cache.time, 'monotonic', lambda: now + 11)
+    assert cache.get('q3') == (False, None)
+    assert cache.stats()['expirations'] == 1
+
+def test_index_declarations(db):
+    """
+    Тест разбора объявлений индексов в docstring и их идемпотентного создания в create_table.
+    """
+    fields, indexes = ModelMeta.parse_docstring("""
+    item_id: FieldType.SERIAL, primary_key=True
+    code: FieldType.VARCHAR, max_length=20, unique=True
+    owner_id: FieldType.INT, foreign_key='users(user_id)', index=True
+    Index(owner_id, code, where='code IS NOT NULL')
+    Index(owner_id, code, where='code IN (1, 2)', unique=True)
+    """)
+    assert [(name, field.index, field.unique) for name, field in fields] == [
+        ('item_id', False, False), ('code', False, True), ('owner_id', True, False),
+    ]
+    assert indexes == [
+        Index(('owner_id', 'code'), where='code IS NOT NULL'),
+        Index(('owner_id', 'code'), unique=True, where='code IN (1, 2)'),
+    ]
+    name = indexes[0].name('item')
+    assert name.startswith('item_owner_id_code_') and name.endswith('_partial_idx')
+    assert indexes[0].create_sql('item') == (
+        f"CREATE INDEX IF NOT EXISTS {name} ON item (owner_id, code) WHERE code IS NOT NULL"
+    )
+    # Частичные индексы по одним столбцам с разными условиями получают разные имена
+    assert Index(('owner_id', 'code'), where='code IS NULL').name('item') != name
+    for declaration in ("Index(code, where=code)", "Index(code, clustered=True)", "Index(unique=True, code)"):
+        with pytest.raises(ValueError):
+            ModelMeta.parse_docstring(declaration)
+
+    Token.create_table(db, index_foreign_keys=True)
+    Token.create_table(db, index_foreign_keys=True)
+    Operation.create_table(db, index_foreign_keys=True)
+    with db.get_cursor() as cur:
+        cur.execute("SELECT indexname FROM pg_indexes WHERE tablename IN ('token', 'operation')")
+        names = {row[0] for row in cur.fetchall()}
+    assert {'token_user_id_idx', 'token_hwid_id_idx', 'operation_user_id_operation_date_idx'} <= names
+    assert 'operation_user_id_idx' not in names  # покрыт составным индексом
+
+def test_select_related_and_prefetch_related(db):
+    """
+    Тест загрузки связанных объектов по внешним ключам: JOIN в одном запросе (select_related),
+    пакетная загрузка (prefetch_related) и доступ через связи модели.
+    """
+    app = Application(app_name="Related app")
+    app.save(db)
+    users = Users.bulk_save(db, [Users(full_name=f"User {i}", app_availability=app.app_id) for i in range(3)])
+    mod = Modification(mod_name="Mod", app_id=app.app_id)
+    mod.save(db)
+    Purchase.bulk_save(db, [Purchase(user_id=user.user_id, mod_id=mod.mod_id) for user in users] + [Purchase()])
+
+    assert set(Purchase._plan.relations) == {'user', 'mod'}
+    assert Users._plan.relations['application'].field_name == 'app_availability'
+
+    purchases = Purchase.objects(db).select_related('user__application', 'mod').order_by('purchase_id').all()
+    assert [purchase.user.full_name for purchase in purchases[:3]] == ["User 0", "User 1", "User 2"]
+    assert purchases[0].user.application.app_name == "Related app"
+    assert purchases[0].mod.mod_name == "Mod"
+    assert purchases[3].user is None
+
+    filtered = Purchase.objects(db).filter(user_id=users[1].user_id).select_related('user')
+    assert [purchase.user.user_id for purchase in filtered] == [users[1].user_id]
+
+    prefetched = Purchase.objects(db).prefetch_related('user__application').order_by('purchase_id').all()
+    assert prefetched[2].user.full_name == "User 2"
+    assert prefetched[0].user.application is prefetched[1].user.application
+
+    streamed = list(Purchase.objects(db).select_related('mod').iterator(chunk_size=2))
+    assert sum(purchase.mod is not None for purchase in streamed) == 3
+
+    lazy = Purchase.get_all(db)[0]
+    with pytest.raises(AttributeError):
+        lazy.user
+    assert lazy.load_related(db, 'user').full_name.startswith("User")
+
+    with pytest.raises(ValueError):
+        Purchase.objects(db).select_related('unknown')
+
+def test_many_to_many_manager(db):
+    """
+    Тест менеджера many-to-many: пакетные add/remove/set и загрузка связей многих владельцев одним запросом.
+    """
+    app = Application(app_name="M2M")
+    app.save(db)
+    users = Users.bulk_save(db, [Users(full_name=f"M2M user {i}") for i in range(3)])
+    mods = Modification.bulk_save(db, [Modification(mod_name=f"M2M mod {i}", app_id=app.app_id) for i in range(4)])
+    subscriptions = Users.m2m('subscriptions')
+    assert (subscriptions.table, subscriptions.owner_column, subscriptions.target_column) == ('users_modification', 'user_id', 'mod_id')
+
+    assert subscriptions.add(db, users[0], mods[:3]) == 3
+    assert subscriptions.add(db, users[0], mods[:2]) == 0  # ON CONFLICT DO NOTHING
+    assert subscriptions.add_pairs(db, [(users[1], mods[3]), (users[1].user_id, mods[0].mod_id)]) == 2
+
+    assert subscriptions.remove(db, users[0], [mods[1]]) == 1
+    subscriptions.set(db, users[1], [mods[2], mods[3]])
+
+    loaded = subscriptions.load(db, users)
+    assert [mod.mod_name for mod in loaded[users[0].user_id]] == ["M2M mod 0", "M2M mod 2"]
+    assert loaded[users[2].user_id] == []
+    assert len(subscriptions.all(db, users[0])) == 2
+
+    # Списки, прикреплённые load, возвращаются all без запроса и сбрасываются при изменении связей
+    attached = subscriptions.all(db, users[1])
+    assert attached is loaded[users[1].user_id]
+    assert [mod.mod_id for mod in attached] == [mods[2].mod_id, mods[3].mod_id]
+    subscriptions.add(db, users[1], [mods[0]])
+    assert [mod.mod_id for mod in subscriptions.all(db, users[1])] == [mods[0].mod_id, mods[2].mod_id, mods[3].mod_id]
+    assert len(subscriptions.all(db, users[1].user_id)) == 3  # по значению ключа — всегда запрос
+
+    assert subscriptions.remove(db, users[0]) == 2
+    with pytest.raises(ValueError):
+        Users.m2m('full_name')
+
+def test_generate_parallel_is_reproducible():
+    """
+    Тест параллельной генерации: результат зависит только от seed, а не от числа процессов.
+    """
+    now = datetime(2024, 6, 1)
+    values = lambda tokens: [(token.user_id, token.hwid_id, token.last_login) for token in tokens]
+
+    sequential = list(generate_parallel(generate_token_data, 25, [1, 2, 3], [4, 5], seed=7, workers=1, chunk_size=10, now=now))
+    pooled = list(generate_parallel(generate_token_data, 25, [1, 2, 3], [4, 5], seed=7, workers=2, chunk_size=10, now=now))
+    assert len(sequential) == 25
+    assert values(sequential) == values(pooled)
+
+    other_seed = list(generate_parallel(generate_token_data, 25, [1, 2, 3], [4, 5], seed=8, workers=1, chunk_size=10, now=now))
+    assert values(other_seed) != values(sequential)
+
+    apps = list(generate_parallel(generate_application_data, 3, seed=7, workers=1))
+    assert [app.app_name for app in apps] == [app.app_name for app in generate_application_data(3, rng=random.Random(chunk_seed(7, 0)))]
+
+def test_columnar_generation(db):
+    """
+    Тест колоночной генерации: пакеты воспроизводимы по seed, содержат строки в порядке
+    столбцов INSERT с внешними ключами из переданных списков и загружаются массовой вставкой.
+    """
+    now = datetime(2024, 6, 1)
+    app = Application(app_name="Columnar App")
+    app.save(db)
+
+    batches = list(generate_batches(Users, 25, batch_size=10, seed=3, now=now, app_ids=[app.app_id]))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    again = list(generate_batches(Users, 25, batch_size=10, seed=3, now=now, app_ids=[app.app_id]))
+    assert [batch.rows() for batch in batches] == [batch.rows() for batch in again]
+
+    rows = [row for batch in batches for row in batch.rows()]
+    assert all(len(row) == len(Users._plan.insert_columns) for row in rows)
+    user = Users(**dict(zip(batches[0].column_names, rows[0])))
+    assert user.app_availability == app.app_id
+    assert isinstance(user.registration_date, date) and user.registration_date <= now.date()
+    assert '@' in user.email and len(user.password) == 12
+
+    with pytest.raises(ValueError):
+        next(generate_batches(Token, 1, user_ids=[1]))
+
+    users = Users.bulk_save(db, [user for batch in batches for user in batch.to_models()])
+    assert len(Users.get_all(db)) == 25
+    user_ids = [u.user_id for u in users]
+    hwids = HWID.bulk_save(db, next(generate_batches(HWID, 5, user_ids=user_ids)).to_models())
+    tokens = next(generate_batches(Token, 50, now=now, user_ids=user_ids, hwid_ids=[h.hwid_id for h in hwids]))
+    Token.bulk_save(db, tokens.to_models())
+    assert {token.user_id for token in Token.get_all(db)} <= set(user_ids)
+
+def test_bulk_load_and_dependency_graph(db):
+    """
+    Тест загрузки готовых строк через Model.bulk_load и графа зависимостей моделей.
+    """
+    graph = ModelMeta.dependency_graph()
+    assert graph[Application] == set()
+    assert graph[Users] == {Application, Modification}
+    assert graph[Token] == {Users, HWID}
+    assert ModelMeta.dependency_graph([Token, Users]) == {Token: {Users}, Users: set()}
+
+    app_ids = Application.bulk_load(db, [("First",), ("Second",), ("Third",)], batch_size=2)
+    assert len(app_ids) == 3
+    assert [app.app_name for app in Application.objects(db).filter(app_id__in=app_ids).order_by('app_id')] == ["First", "Second", "Third"]
+    assert Application.bulk_load(db, []) == []
+
+def test_seed_database(db):
+    """
+    Тест конвейера заполнения: количество строк задаётся масштабом, а внешние ключи дочерних
+    таблиц ссылаются на строки, загруженные родительскими таблицами.
+    """
+    counts = {Application: 2, Users: 10, Modification: 4, HWID: 6, Operation: 20, Token: 8}
+    stats = seed_database(db, scale=2, workers=3, batch_size=7, seed=1, counts=counts)
+    assert {table: rows for table, (rows, _) in stats.items()} == {
+        'application': 4, 'users': 20, 'modification': 8, 'hwid': 12, 'operation': 40, 'token': 16,
+    }
+    user_ids = {user.user_id for user in Users.get_all(db)}
+    hwid_ids = {hwid.hwid_id for hwid in HWID.get_all(db)}
+    assert {operation.user_id for operation in Operation.get_all(db)} <= user_ids
+    assert all(token.user_id in user_ids and token.hwid_id in hwid_ids for token in Token.get_all(db))
+
+    # Родительская таблица не указана в counts — ошибка называет её до начала загрузки
+    with pytest.raises(ValueError, match="hwid"):
+        seed_database(db, counts={Application: 1, Users: 1, Token: 1})
+    assert len(Users.get_all(db)) == 20
+
+def test_create_all_and_drop_all(db):
+    """
+    Тест создания схемы: модели упорядочены по внешним ключам, промежуточные таблицы
+    many-to-many идут после таблиц, на которые ссылаются, а повторный create_all
+    пропускается по отпечатку схемы, пока таблицы не удалены.
+    """
+    order = ModelMeta.sorted_models()
+    position = {model: index for index, model in enumerate(order)}
+    for model, parents in ModelMeta.dependency_graph().items():
+        assert all(position[parent] < position[model] for parent in parents)
+    tables, _ = Model.schema_sql()
+    assert tables[-1] == 'users_modification'
+
+    assert Model.create_all(db) is False
+
+    other = Database(DATABASE_NAME)
+    Model.drop_all(other)
+    with other.get_cursor() as cur:
+        cur.execute("SELECT count(*) FROM pg_tables WHERE tablename = ANY(%s)", (tables,))
+        assert cur.fetchone()[0] == 0
+    assert Model.create_all(other) is True
+    assert Model.create_all(other) is False
+    with other.get_cursor() as cur:
+        cur.execute("DROP TABLE users_modification")
+    assert Model.create_all(other) is True
+
+def test_sandbox_pool():
+    """
+    Тест песочниц: копия шаблона со схемой сохраняет первичные и внешние ключи и SERIAL,
+    копия шаблона с данными содержит данные исходной базы, а возвращённые песочницы удаляются.
+    """
+    source = Database('sandbox_source_db')
+    Model.create_all(source, [Application, Users, Modification])
+    Application(app_name="Template App").save(source)
+    source.create_template('sandbox_schema_tpl', 'sandbox_source_db', with_data=False)
+    source.create_template('sandbox_data_tpl', 'sandbox_source_db')
+    try:
+        with SandboxPool('sandbox_schema_tpl', size=1) as pool:
+            with pool.sandbox() as sandbox:
+                assert Application.get_all(sandbox) == []
+                app = Application(app_name="Sandbox App")
+                app.save(sandbox)
+                assert app.app_id == 1
+                with pytest.raises(Exception):
+                    Users(full_name="Orphan", app_availability=999).save(sandbox)
+                name = sandbox.dbname
+            second = pool.acquire()
+            assert second.dbname != name
+            pool.release(second)
+            stats = pool.stats()
+            assert stats['warm'] + stats['cold'] == 2 and stats['warm'] >= 1
+
+        with SandboxPool('sandbox_data_tpl', size=0) as pool:
+            with pool.sandbox() as sandbox:
+                assert [app.app_name for app in Application.get_all(sandbox)] == ["Template App"]
+            assert pool.stats()['cold'] == 1
+
+        with source.get_cursor() as cur:
+            cur.execute("SELECT count(*) FROM pg_database WHERE datname LIKE %s", ('sandbox_%_tpl_sandbox_%',))
+            assert cur.fetchone()[0] == 0
+    finally:
+        for name in ('sandbox_schema_tpl', 'sandbox_data_tpl', 'sandbox_source_db'):
+            source.drop_db(name)
+
+def test_replace_all_data(db):
+    """
+    Тест замены данных: строки загружаются через COPY с корректным экранированием,
+    а при ошибке загрузки прежние данные таблицы остаются на месте.
+    """
+    Application.bulk_save(db, [Application(app_name=f"Old {i}") for i in range(3)])
+
+    names = ["Tab\there", "Line\nbreak", "Back\\slash", None]
+    stats = db.replace_all_data('application', ({'app_name': name} for name in names))
+    assert stats['rows'] == 4 and stats['rows_per_sec'] > 0
+    assert sorted(app.app_name for app in Application.get_all(db) if app.app_name) == sorted(names[:3])
+    assert [app.app_name for app in Application.get_all(db)].count(None) == 1
+
+    stats = db.replace_all_data('application', [(100, "Explicit")], columns=['app_id', 'app_name'])
+    assert stats['rows'] == 1
+    assert [(app.app_id, app.app_name) for app in Application.get_all(db)] == [(100, "Explicit")]
+
+    with pytest.raises(Exception):
+        db.replace_all_data('application', [(1, "One"), ("not a number", "Two")], columns=['app_id', 'app_name'])
+    assert [(app.app_id, app.app_name) for app in Application.get_all(db)] == [(100, "Explicit")]
+
+    # Две замены в одной внешней транзакции используют разные промежуточные таблицы
+    with db.transaction():
+        db.replace_all_data('application', [{'app_name': "First"}])
+        db.replace_all_data('application', [{'app_name': "Second"}])
+    assert [app.app_name for app in Application.get_all(db)] == ["Second"]
+
+    # Пустой набор строк просто очищает таблицу
+    stats = db.replace_all_data('application', [])
+    assert (stats['rows'], stats['method']) == (0, 'delete')  # на application ссылаются внешние ключи
+    assert Application.get_all(db) == []
+
+def test_replace_all_data_swap(db):
+    """
+    Тест подмены таблицы, на которую никто не ссылается: промежуточная таблица переименовывается
+    на место прежней с сохранением имён индексов, внешних ключей и счётчика SERIAL;
+    при зависимом представлении используется TRUNCATE.
+    """
+    user = Users(full_name="Owner")
+    user.save(db)
+    indexes_sql = "SELECT indexname FROM pg_indexes WHERE tablename = 'operation' ORDER BY indexname"
+    foreign_keys_sql = "SELECT conname FROM pg_constraint WHERE conrelid = 'operation'::regclass AND contype = 'f'"
+    indexes, foreign_keys = Model.rawsql(db, indexes_sql, ()), Model.rawsql(db, foreign_keys_sql, ())
+    Operation(user_id=user.user_id, operation_type="old").save(db)
+
+    stats = db.replace_all_data('operation', [{'user_id': user.user_id, 'operation_type': f"new {i}"} for i in range(3)])
+    assert (stats['rows'], stats['method']) == (3, 'swap')
+    assert sorted(op.operation_type for op in Operation.get_all(db)) == ["new 0", "new 1", "new 2"]
+    assert Model.rawsql(db, indexes_sql, ()) == indexes
+    assert Model.rawsql(db, foreign_keys_sql, ()) == foreign_keys
+    ids = [op.operation_id for op in Operation.get_all(db)]
+    added = Operation(user_id=user.user_id, operation_type="after swap")
+    added.save(db)
+    assert added.operation_id > max(ids)  # счётчик SERIAL продолжается
+    with pytest.raises(Exception):
+        Operation(user_id=-1, operation_type="dangling").save(db)  # внешний ключ перенесён
+
+    assert db.replace_all_data('operation', [])['method'] == 'swap'
+    assert Operation.get_all(db) == []
+
+    Model.rawsql(db, "CREATE VIEW operation_types AS SELECT operation_type FROM operation", ())
+    try:
+        stats = db.replace_all_data('operation', [(user.user_id, "viewed")], columns=['user_id', 'operation_type'])
+        assert stats['method'] == 'truncate'
+        assert Model.rawsql(db, "SELECT operation_type FROM operation_types", ()) == [("viewed",)]
+    finally:
+        Model.rawsql(db, "DROP VIEW operation_types", ())
+
+def test_truncate_all(db):
+    """
+    Тест очистки таблиц: выбранные модели очищаются вместе с их таблицами many-to-many
+    и ссылающимися таблицами (CASCADE), остальные не затрагиваются, а SERIAL начинается заново.
+    """
+    app = Application(app_name="Kept App")
+    app.save(db)
+    mod = Modification(mod_name="Mod", mod_desc="Desc", app_id=app.app_id)
+    mod.save(db)
+    user = Users(full_name="User", email="user@example.com", password="pwd", app_availability=app.app_id)
+    user.save(db)
+    Users.m2m('subscriptions').add(db, user, [mod])
+    Operation(user_id=user.user_id, operation_type="login", operation_date=datetime.now()).save(db)
+
+    Model.truncate_all(db, [Users])
+    assert Users.get_all(db) == [] and Operation.get_all(db) == []
+    assert Users.m2m('subscriptions').all(db, user) == []
+    assert [a.app_name for a in Application.get_all(db)] == ["Kept App"]
+    assert len(Modification.get_all(db)) == 1
+
+    Model.truncate_all(db)
+    assert Application.get_all(db) == [] and Modification.get_all(db) == []
+    again = Application(app_name="Fresh App")
+    again.save(db)
+    assert again.app_id == 1
+
+def test_export_tables(db, tmp_path):
+    """
+    Тест выгрузки таблиц: каждая таблица выгружается в свой файл в формате COPY,
+    а прогресс сообщается по каждой таблице.
+    """
+    Application.bulk_save(db, [Application(app_name=f"App {i}") for i in range(5)])
+    reported = []
+    timings = db.export_tables(str(tmp_path), tables=['application', 'users'], workers=2,
+                               progress=lambda table, seconds, done: reported.append((table, done)))
+    assert set(timings) == {'application', 'users'}
+    assert sorted(done for _, done in reported) == [1, 2]
+    lines = (tmp_path / 'application.copy').read_text(encoding='utf-8').splitlines()
+    assert sorted(line.split('\t')[1] for line in lines) == [f"App {i}" for i in range(5)]
+    assert (tmp_path / 'users.copy').read_text(encoding='utf-8') == ''
+    with pytest.raises(ValueError):
+        db.export_tables(str(tmp_path), tables=['no_such_table'])
+
+@pytest.mark.skipif(shutil.which('pg_dump') is None, reason="pg_dump is not installed")
+def test_parallel_dump_and_restore(db, tmp_path):
+    """
+    Тест дампа в формате каталога с несколькими процессами и параллельного восстановления
+    в другую базу данных с замером времени по таблицам.
+    """
+    Application.bulk_save(db, [Application(app_name=f"App {i}") for i in range(5)])
+    dump_dir = str(tmp_path / 'dump')
+    timings = db.create_dump(dump_dir, jobs=2)
+    assert 'application' in timings
+
+    restored = Database('test_restore_db')
+    try:
+        timings = restored.restore_dump(dump_dir, jobs=2)
+        assert 'application' in timings
+        assert len(Application.get_all(restored)) == 5
+    finally:
+        restored.drop_db('test_restore_db')
+
+def _export_fixture(db):
+    """
+    Данные для тестов выгрузки: пользователь и операции с NULL, пустой строкой и спецсимволами.
+
+    :return: Список кортежей значений операций, упорядоченный по первичному ключу.
+    """
+    app = Application(app_name="Export App")
+    app.save(db)
+    user = Users(full_name="Exporter", email="export@example.com", password="pwd", app_availability=app.app_id)
+    user.save(db)
+    Operation.bulk_save(db, [
+        Operation(user_id=user.user_id, operation_type="login", operation_date=datetime(2024, 6, 1, 12, 30)),
+        Operation(user_id=user.user_id, operation_type="", operation_date=None),
+        Operation(user_id=user.user_id, operation_type=None, operation_date=datetime(2024, 6, 2)),
+        Operation(user_id=user.user_id, operation_type='quote " comma, tab\t', operation_date=datetime(2024, 6, 3)),
+    ])
+    return [(o.operation_id, o.user_id, o.operation_type, o.operation_date)
+            for o in Operation.objects(db).order_by('operation_id')]
+
+def _roundtrip(db, path, expected, format=None):
+    """
+    Выгрузка операций в файл, очистка таблицы, загрузка обратно и проверка данных и счётчика SERIAL.
+    """
+    assert Operation.export(db, path, format=format) == len(expected)
+    Model.truncate_all(db, [Operation])
+    assert Operation.import_(db, path, format=format) == len(expected)
+    restored = [(o.operation_id, o.user_id, o.operation_type, o.operation_date)
+                for o in Operation.objects(db).order_by('operation_id')]
+    assert restored == expected
+    user_id = expected[0][1]
+    new = Operation(user_id=user_id, operation_type="after import", operation_date=None)
+    new.save(db)
+    assert new.operation_id == max(row[0] for row in expected) + 1
+    new.delete(db)
+
+def test_export_import_copy_formats(db, tmp_path):
+    """
+    Тест выгрузки и загрузки в CSV (с заголовком) и двоичном формате COPY: NULL и пустые
+    строки различаются, первичные ключи сохраняются.
+    """
+    expected = _export_fixture(db)
+    _roundtrip(db, str(tmp_path / 'operation.csv'), expected)
+    header = (tmp_path / 'operation.csv').read_text(encoding='utf-8').splitlines()[0]
+    assert header == ",".join(Operation._plan.field_names)
+    _roundtrip(db, str(tmp_path / 'operation.data'), expected, format='binary')
+    with pytest.raises(ValueError):
+        Operation.export(db, str(tmp_path / 'operation.unknown'))
+
+def test_export_import_arrow_formats(db, tmp_path):
+    """
+    Тест выгрузки и загрузки в Parquet и Arrow IPC: типы столбцов берутся из FieldType модели.
+    """
+    pa = pytest.importorskip('pyarrow')
+    from lib.table_io import arrow_schema
+    assert arrow_schema(Checks).field('amount').type == pa.decimal128(10, 2)
+    assert arrow_schema(Operation).field('operation_date').type == pa.timestamp('us')
+
+    expected = _export_fixture(db)
+    _roundtrip(db, str(tmp_path / 'operation.parquet'), expected)
+    _roundtrip(db, str(tmp_path / 'operation.arrow'), expected)
+
+
+def test_benchmark_statistics():
+    """
+    Тест перцентилей с интерполяцией и непараметрических доверительных интервалов квантилей.
+    """
+    ordered = [float(value) for value in range(1, 101)]
+    assert percentile(ordered, 0.5) == pytest.approx(50.5)
+    assert percentile(ordered, 0.99) == pytest.approx(99.01)
+    assert percentile([7.0], 0.95) == 7.0
+    with pytest.raises(ValueError):
+        percentile([], 0.5)
+
+    # Для n=100 и 95%: номера порядковых статистик 50 -/+ 1.96*5, то есть 40-я и 60-я
+    assert quantile_ci(ordered, 0.5) == (40.0, 60.0)
+    lower, upper = quantile_ci(ordered, 0.99)
+    assert lower <= percentile(ordered, 0.99) <= upper == 100.0
+    with pytest.raises(ValueError):
+        quantile_ci(ordered, 0.5, confidence=0.5)
+
+    stats = summarize(list(reversed(ordered)))
+    assert (stats['n'], stats['min'], stats['max']) == (100, 1.0, 100.0)
+    assert stats['mean'] == pytest.approx(50.5)
+    assert stats['median_ci'] == [40.0, 60.0]
+    assert stats['median_ci'][0] <= stats['median'] <= stats['median_ci'][1]
+    assert stats['p95'] <= stats['p99'] <= stats['max']
+
+def test_benchmark_repetitions(tmp_path):
+    """
+    Тест прогревочных запусков, подготовки вне замера, остановки по точности и по лимитам повторов.
+    """
+    clock = [0.0]
+    calls = []
+
+    def operation(argument=None):
+        calls.append(argument)
+        clock[0] += 0.001
+
+    def timer():
+        return clock[0]
+
+    # Одинаковые времена: интервал медианы нулевой ширины, замер останавливается на min_reps
+    stats = benchmark(operation, warmup=2, min_reps=5, timer=timer)
+    assert len(calls) == 2 + 5
+    assert (stats['reps'], stats['warmup'], stats['converged']) == (5, 2, True)
+    assert stats['median'] == pytest.approx(0.001)
+    assert stats['p99_ci'][1] == pytest.approx(0.001)
+
+    # Подготовка вызывается перед каждым запуском, её время не учитывается
+    def setup():
+        clock[0] += 1.0
+        return 'row'
+
+    calls.clear()
+    stats = benchmark(operation, setup=setup, warmup=1, min_reps=3, timer=timer)
+    assert calls == ['row'] * 4
+    assert stats['max'] == pytest.approx(0.001)
+
+    # Разброс времён не позволяет достичь точности: замер ограничен max_reps
+    durations = iter([0.001, 0.01] * 50)
+
+    def noisy():
+        clock[0] += next(durations)
+
+    stats = benchmark(noisy, warmup=0, min_reps=4, max_reps=20, max_time=60, timer=timer)
+    assert stats['reps'] == 20
+    assert not stats['converged']
+    with pytest.raises(ValueError):
+        benchmark(operation, min_reps=1)
+
+    path = tmp_path / 'results.json'
+    write_json([{'model': 'Operation', 'operation': 'count', 'rows': 100, **stats}], str(path), server_version='16')
+    document = json.loads(path.read_text(encoding='utf-8'))
+    assert document['meta']['unit'] == 'seconds'
+    assert document['meta']['server_version'] == '16'
+    assert document['results'][0]['reps'] == 20